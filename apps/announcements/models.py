@@ -1,15 +1,17 @@
 from django.db import models
 from django.utils import timezone
-from apps.core.models import AuditModel
+from apps.core.models import AuditModel, SearchIndexedModel
 from apps.core.enums import AnnouncementType
 
-class Announcement(AuditModel):
+class Announcement(SearchIndexedModel, AuditModel):
     """
     公告
     - 由教研发布，面向全体教师（当前版本）
     - 生效时间窗口 [start_at, end_at]，end_at 为空视为仍有效
     - 高频筛选字段建立索引：type、publisher、窗口
     """
+    search_index_fields = ('content',)
+
     publisher = models.ForeignKey(
         'persons.Person',
         on_delete=models.PROTECT,
@@ -1,20 +1,20 @@
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from django.utils import timezone
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Q
 
+from apps.core.search import KeywordSearchFilter
 from .models import Announcement
 from .serializers import AnnouncementSerializer
 
 class AnnouncementViewSet(viewsets.ModelViewSet):
     queryset = Announcement.objects.all().order_by('-created_at')
     serializer_class = AnnouncementSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, KeywordSearchFilter]
     filterset_fields = ['type', 'publisher']
-    search_fields = ['content']
     ordering_fields = ['created_at', 'start_at', 'end_at']
 
     def get_queryset(self):
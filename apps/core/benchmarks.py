@@ -0,0 +1,206 @@
+"""
+热点 API 基准：SQL 语句数、p50/p95 延迟、响应字节数，并与仓库内的预算（api_budgets.json）比对
+
+面向已有数据的库运行（如 generate_dataset 生成的数据集），以最热门的教师身份（优先演示账号）
+用 Token 鉴权逐个请求，每个端点先预热一次再计时 repeat 次：
+- 语句数取各次最大值，与数据规模无关，超出预算即视为回归；
+- 延迟与机器相关，比对时可用 latency_factor 整体放宽；
+- 写端点（提交点评、批量已读）每次使用单独准备的任务 / 提醒，调用方负责在事务内回滚。
+"""
+import json
+import math
+import os
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_budgets.json')
+DEMO_TEACHER_USERNAME = '李老师_teacher'
+# 批量已读每次请求的提醒数 / 提交点评每次附带的曲目数
+READ_BULK_SIZE = 20
+SUBMIT_PIECE_COUNT = 3
+# 生成预算时在实测值上预留的余量
+LATENCY_HEADROOM = 2.0
+BYTES_HEADROOM = 1.5
+
+
+class BenchmarkError(RuntimeError):
+    """
+    数据库缺少运行基准所需的数据
+    """
+
+
+def percentile(values, pct):
+    """
+    最近秩百分位数
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def build_context(repeat):
+    """
+    选取身份与目标对象，并为写端点准备 repeat + 1 份输入（含预热）
+
+    Returns:
+        dict: client、person_id、student_id，以及写端点的输入队列
+    """
+    from apps.core.enums import ReminderCategory, TaskSource, TaskStatus, UrgencyLevel
+    from apps.courses.models import Piece
+    from apps.evaluations.models import EvaluationTask, FeedbackRecord
+    from apps.persons.models import Person
+    from apps.reminders.models import Reminder, ReminderRecipient
+
+    teacher = Person.objects.filter(user__username=DEMO_TEACHER_USERNAME).select_related('user').first()
+    if teacher is None:
+        teacher = (
+            Person.objects.filter(user__isnull=False, assigned_tasks__isnull=False)
+            .annotate(n=Count('assigned_tasks')).order_by('-n').select_related('user').first()
+        )
+    student_id = (
+        FeedbackRecord.objects.filter(deleted_at__isnull=True)
+        .values('student_id').annotate(n=Count('id')).order_by('-n').values_list('student_id', flat=True).first()
+    )
+    piece_ids = list(Piece.objects.filter(deleted_at__isnull=True).order_by('id').values_list('id', flat=True)[:SUBMIT_PIECE_COUNT])
+    if teacher is None or student_id is None or not piece_ids:
+        raise BenchmarkError('数据库中缺少教师、点评记录或曲目，请先运行 generate_dataset')
+
+    runs = repeat + 1
+    tasks = EvaluationTask.objects.bulk_create([
+        EvaluationTask(student_id=student_id, assignee=teacher, status=TaskStatus.PENDING, source=TaskSource.TEACHER,
+                       note='bench', created_by=teacher, updated_by=teacher)
+        for _ in range(runs)
+    ])
+    probe = Reminder(sender=teacher, receiver=teacher)
+    e2e_type = probe.compute_e2e_type()
+    now = timezone.now()
+    reminders = Reminder.objects.bulk_create([
+        Reminder(sender=teacher, e2e_type=e2e_type, urgency=UrgencyLevel.NORMAL, category=ReminderCategory.OTHER,
+                 start_at=now, content='bench', created_by=teacher, updated_by=teacher)
+        for _ in range(runs * READ_BULK_SIZE)
+    ])
+    ReminderRecipient.objects.bulk_create([
+        ReminderRecipient(reminder=reminder, person=teacher, created_by=teacher, updated_by=teacher)
+        for reminder in reminders
+    ])
+
+    # 不经过测试运行器时 ALLOWED_HOSTS 不含 testserver：取配置中的第一个具体主机，未配置时用 localhost（DEBUG 下允许）
+    hosts = [host for host in settings.ALLOWED_HOSTS if host not in ('*',) and not host.startswith('.')]
+    client = APIClient(SERVER_NAME=hosts[0] if hosts else 'localhost')
+    token, _ = Token.objects.get_or_create(user=teacher.user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return {
+        'client': client,
+        'person_id': str(teacher.id),
+        'student_id': str(student_id),
+        'piece_ids': [str(pk) for pk in piece_ids],
+        'submit_task_ids': [str(task.id) for task in tasks],
+        'read_batches': [
+            [str(r.id) for r in reminders[i:i + READ_BULK_SIZE]] for i in range(0, len(reminders), READ_BULK_SIZE)
+        ],
+    }
+
+
+def _submit(ctx, i):
+    return ctx['client'].post(
+        f"/api/v1/tasks/{ctx['submit_task_ids'][i]}/submit/",
+        {'teacher_content': '基准测试点评内容，节奏稳定。', 'piece_ids': ctx['piece_ids']}, format='json',
+    )
+
+
+def _read_bulk(ctx, i):
+    return ctx['client'].post('/api/v1/reminders/read-bulk/', {'ids': ctx['read_batches'][i]}, format='json')
+
+
+# 名称 → 发起一次请求的函数 (ctx, 第几次) -> Response
+ENDPOINTS = {
+    'tasks': lambda ctx, i: ctx['client'].get('/api/v1/tasks/', {'assignee_me': 1}),
+    'feedbacks': lambda ctx, i: ctx['client'].get('/api/v1/feedbacks/'),
+    'reminders_inbox': lambda ctx, i: ctx['client'].get('/api/v1/reminders/', {'recipient_me': 1}),
+    'pieces': lambda ctx, i: ctx['client'].get('/api/courses/pieces/'),
+    'recent_feedbacks': lambda ctx, i: ctx['client'].get(f"/api/v1/students/{ctx['student_id']}/recent_feedbacks/"),
+    'task_submit': _submit,
+    'reminders_read_bulk': _read_bulk,
+}
+
+
+def run_suite(repeat=20, names=None):
+    """
+    依次测量各端点
+
+    Returns:
+        dict: 端点名 → {status, queries, p50_ms, p95_ms, bytes}
+    """
+    ctx = build_context(repeat)
+    results = {}
+    for name in names or ENDPOINTS:
+        request = ENDPOINTS[name]
+        request(ctx, 0)  # 预热：鉴权缓存、课程树缓存等
+        timings, queries, size, status_code = [], 0, 0, None
+        for i in range(1, repeat + 1):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = request(ctx, i)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, len(captured.captured_queries))
+            size = max(size, len(response.content))
+            if status_code is None or response.status_code >= 400:
+                status_code = response.status_code
+        results[name] = {
+            'status': status_code,
+            'queries': queries,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'bytes': size,
+        }
+    return results
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def budgets_from_results(results):
+    """
+    按实测值生成预算：语句数不留余量，延迟与字节数按 LATENCY_HEADROOM / BYTES_HEADROOM 放宽
+    """
+    return {
+        name: {
+            'max_queries': row['queries'],
+            'p95_ms': math.ceil(row['p95_ms'] * LATENCY_HEADROOM),
+            'max_bytes': math.ceil(row['bytes'] * BYTES_HEADROOM),
+        }
+        for name, row in results.items()
+    }
+
+
+def check_budgets(results, budgets, latency_factor=1.0, check_latency=True, check_bytes=True):
+    """
+    Returns:
+        list[str]: 超出预算的描述；为空表示全部通过
+    """
+    violations = []
+    for name, row in results.items():
+        budget = budgets.get(name)
+        if budget is None:
+            violations.append(f'{name}: 没有预算')
+            continue
+        if row['status'] >= 400:
+            violations.append(f"{name}: HTTP {row['status']}")
+        if row['queries'] > budget['max_queries']:
+            violations.append(f"{name}: SQL 语句数 {row['queries']} > {budget['max_queries']}")
+        if check_latency and row['p95_ms'] > budget['p95_ms'] * latency_factor:
+            violations.append(f"{name}: p95 {row['p95_ms']}ms > {budget['p95_ms'] * latency_factor:g}ms")
+        if check_bytes and row['bytes'] > budget['max_bytes']:
+            violations.append(f"{name}: 响应 {row['bytes']}B > {budget['max_bytes']}B")
+    return violations
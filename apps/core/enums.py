@@ -163,4 +163,21 @@ class LinkType(models.TextChoices):
     REMINDER = 'reminder', _('提醒事项')
     ANNOUNCEMENT = 'announcement', _('公告')
     FOLLOW_UP = 'follow_up', _('回访记录')
-    STUDENT = 'student', _('学员')
\ No newline at end of file
+    STUDENT = 'student', _('学员')
+
+class ExportJobStatus(models.TextChoices):
+    """
+    后台导出任务状态
+    """
+    PENDING = 'pending', _('排队中')
+    RUNNING = 'running', _('生成中')
+    SUCCEEDED = 'succeeded', _('已完成')
+    FAILED = 'failed', _('失败')
+
+class ImportBatchStatus(models.TextChoices):
+    """
+    学员导入批次状态
+    """
+    PREVIEWED = 'previewed', _('已预览')
+    COMMITTED = 'committed', _('已导入')
+    FAILED = 'failed', _('失败')
@@ -0,0 +1,67 @@
+"""
+热点 API 基准测试：测量 SQL 语句数、p50/p95 延迟与响应字节数，并与 apps/core/api_budgets.json 比对，
+超出预算时以非零状态退出。所有写入（准备数据、提交点评、批量已读）在事务内，结束后回滚。
+
+用法：
+  python manage.py generate_dataset --scale 1 --clear
+  python manage.py bench_api [--repeat 20] [--only tasks pieces] [--latency-factor 2] [--no-latency]
+  python manage.py bench_api --write-budgets      # 以本次实测值重写预算文件
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core.benchmarks import (
+    BUDGETS_FILE, ENDPOINTS, BenchmarkError, budgets_from_results, check_budgets, load_budgets, run_suite,
+)
+
+
+class Command(BaseCommand):
+    help = '测量热点 API 的语句数 / 延迟 / 响应大小并与预算比对（数据在事务内回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='每个端点计时的请求次数')
+        parser.add_argument('--only', nargs='+', choices=list(ENDPOINTS), help='只测指定端点')
+        parser.add_argument('--budgets', default=BUDGETS_FILE, help='预算文件路径')
+        parser.add_argument('--latency-factor', type=float, default=1.0, help='延迟预算放宽倍数（较慢的机器）')
+        parser.add_argument('--no-latency', action='store_true', help='不比对延迟，只比对语句数与响应大小')
+        parser.add_argument('--output', help='把结果写入 JSON 文件')
+        parser.add_argument('--write-budgets', action='store_true', help='按本次实测值重写预算文件')
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        with transaction.atomic():
+            try:
+                results = run_suite(repeat=repeat, names=options['only'])
+            except BenchmarkError as exc:
+                raise CommandError(str(exc))
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'endpoint':<20} {'status':>6} {'queries':>8} {'p50_ms':>8} {'p95_ms':>8} {'bytes':>9}")
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<20} {row['status']:>6} {row['queries']:>8} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+                f"{row['bytes']:>9}"
+            )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, ensure_ascii=False, indent=2)
+
+        if options['write_budgets']:
+            budgets = budgets_from_results(results)
+            if options['only']:
+                budgets = dict(load_budgets(options['budgets']), **budgets)
+            with open(options['budgets'], 'w', encoding='utf-8') as fh:
+                json.dump(budgets, fh, ensure_ascii=False, indent=2)
+                fh.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"已写入预算：{options['budgets']}"))
+            return
+
+        violations = check_budgets(
+            results, load_budgets(options['budgets']),
+            latency_factor=options['latency_factor'], check_latency=not options['no_latency'],
+        )
+        if violations:
+            raise CommandError('超出预算：\n  ' + '\n  '.join(violations))
+        self.stdout.write(self.style.SUCCESS('全部端点在预算内'))
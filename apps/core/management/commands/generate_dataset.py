@@ -0,0 +1,680 @@
+"""
+生成压测用的合成数据集（可复现、带生产式倾斜分布）
+
+规模（--scale 1 时，约数）：学员 1,000、点评任务 11,000、点评记录 10,000、曲目明细 20,000、
+提醒 10,000（接收人约 20,000）、通知 5,000、回访 2,000；--scale 100 即约 10 万学员、200 万曲目明细、100 万提醒。
+教职人员按 sqrt(scale) 增长。
+
+分布：
+- 教师负载服从 Zipf：少数“热门教师”承担大部分点评任务与提醒；
+- 学员活跃度服从 Pareto：少数学员拥有大量点评记录；
+- 创建时间按指数分布集中在近期（最长一年前），旧任务多已完成、旧提醒多已读，
+  热门人员积压长尾未读；约 1% 的提醒为大范围群发（50~500 名接收人）。
+
+实现：
+- 所有随机性来自由 --seed 派生的 random.Random（每个阶段一条随机流），主键 UUID 也由它生成，同一种子同一天生成的数据一致；
+- 按 --batch-size 分批 bulk_create，PostgreSQL 下可用 --copy 走 COPY FROM STDIN；
+- 批量写入不触发信号，最后显式重建派生数据：学员曲目状态、课程进度、未读计数。
+
+用法：
+  python manage.py generate_dataset --scale 1
+  python manage.py generate_dataset --scale 100 --copy --clear --seed 7
+"""
+import csv
+import io
+import json
+import math
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from random import Random
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.announcements.models import Announcement
+from apps.core.enums import (
+    AnnouncementType, CourseLearnStatus, EnableStatus, FollowUpPurpose, FollowUpStatus, FollowUpUrgency,
+    LessonCategory, LessonFocus, NotificationType, RecordStatus, ReminderCategory, RoleType, TaskSource,
+    TaskStatus, UrgencyLevel,
+)
+from apps.core.models import SearchIndexedModel
+from apps.courses.models import Course, CourseVersion, Lesson, LessonVersion, Piece, PieceVersion
+from apps.evaluations.models import (
+    EvaluationTask, FeedbackPieceDetail, FeedbackRecord, PieceStatusJob, StudentCourseProgress, StudentPieceStatus,
+)
+from apps.followups.models import FollowUpRecord
+from apps.notifications.models import Notification, UnreadCounter
+from apps.persons.models import Person, PersonRole
+from apps.reminders.models import Reminder, ReminderRecipient
+from apps.students.models import CourseRecord, Student, StudentTag
+
+# --scale 1 时各实体的基数
+BASE_COUNTS = {
+    'students': 1000,
+    'tasks': 11000,
+    'reminders': 10000,
+    'notifications': 5000,
+    'followups': 2000,
+    'teachers': 40,
+    'researchers': 5,
+    'operators': 10,
+}
+ANNOUNCEMENT_COUNT = 30
+DEMO_PASSWORD = '123456'
+# README 中列出的演示账号，作为排名最靠前（最“热”）的人员
+DEMO_STAFF = (
+    ('李老师', '李老师_teacher', RoleType.TEACHER),
+    ('黄老师', '黄老师_teacher', RoleType.TEACHER),
+    ('王老师', '王老师_teacher', RoleType.TEACHER),
+    ('钟老师', '钟老师_teacher', RoleType.TEACHER),
+    ('王老师', '王老师_researcher', RoleType.RESEARCHER),
+    ('杜老师', '杜老师_operator', RoleType.OPERATOR),
+)
+CATALOG_FILE = os.path.join('data', 'django_course_data.json')
+
+ZIPF_EXPONENT = 1.1
+PARETO_ALPHA = 1.2
+# 创建时间：平均距今天数 / 最长天数
+MEAN_AGE_DAYS = 45
+MAX_AGE_DAYS = 365
+
+SURNAMES = '张王李赵刘陈杨黄周吴徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘蒋蔡余杜叶程苏魏吕丁任沈姚卢'
+GIVEN_CHARS = '雅明华美丽志强晓敏文博娜建国芳海燕东军静玲红勇琴亮萍文涛磊婷欣怡子轩浩然梓涵宇航'
+TAGS = (
+    ('优秀学员', '学习态度积极，进步明显'), ('需要关注', '学习进度较慢，需要额外关注'),
+    ('有天赋', '音乐天赋较好，可重点培养'), ('基础薄弱', '音乐基础较差，需要加强基础训练'),
+    ('练习积极', '课后练习很认真'), ('缺乏练习', '课后练习不够'),
+    ('家长配合', '家长很配合教学'), ('沟通困难', '与家长沟通存在困难'),
+)
+TASK_NOTES = (
+    '基础手型练习点评 - 重点关注手指独立性和手腕放松程度',
+    '《小星星》演奏点评 - 请注意节奏的准确性和音色的控制',
+    '和弦连接练习点评 - 重点评价和弦转换的流畅性',
+    '《致爱丽丝》片段点评 - 关注旋律线条的表现和踏板的使用',
+    '音阶技巧练习点评 - 重点关注指法的正确性和速度的均匀性',
+    '视奏能力测试点评 - 评价读谱准确性和演奏流畅度',
+)
+TEACHER_COMMENTS = (
+    '手型保持得很好，手指独立性有明显提高，继续保持这种练习状态。',
+    '节奏把握准确，音色控制有进步，可以尝试更多的表情变化。',
+    '和弦转换比上次流畅了很多，左右手配合也更加协调了。',
+    '手腕还需要更加放松，注意手指的独立性练习，可以多做一些手指操。',
+    '节奏稍有不稳，建议使用节拍器练习，注意强弱拍的区别。',
+    '踏板使用时机需要调整，注意清洁踏板的概念，避免声音混浊。',
+)
+RESEARCHER_FEEDBACK = (
+    '教学方法得当，学员进步明显，建议继续加强基础练习。',
+    '点评详细到位，对学员的问题分析准确，教学效果良好。',
+    '教学重点突出，对学员的鼓励和建议都很中肯。',
+)
+IMPRESSIONS = ('学习态度认真，进步稳定', '音乐理解力较好，有一定天赋', '需要加强练习时间，巩固基本功')
+REMINDER_CONTENTS = (
+    '请关注该学员的练习进度，最近几次课程表现有所下滑，建议加强基础练习指导。',
+    '学员反馈工作较忙，希望调整上课时间，请协调安排合适的时间段。',
+    '学员手型问题需要重点关注，建议增加手型纠正的专项练习时间。',
+    '学员进步很快，可以考虑适当提高教学难度。',
+    '学员左手腕有旧伤，练习时请控制时长与力度。',
+)
+NOTIFICATION_TEMPLATES = (
+    ('新的点评任务分配', '您有一个新的学员点评任务需要处理，请及时查看并完成点评。'),
+    ('学员课程进度提醒', '学员的课程学习进度需要关注，建议加强练习指导。'),
+    ('教学研讨会通知', '本月教学研讨会即将举行，请准时参加并准备相关材料。'),
+)
+FOLLOW_UP_CONTENTS = (
+    '学员反馈最近工作较忙，练习时间有限，建议调整练习计划，重点练习基础技巧。',
+    '学员对目前的学习进度很满意，希望学习更多经典流行歌曲的钢琴版本。',
+    '学员询问是否可以参加钢琴考级，建议加强音阶和练习曲的训练。',
+)
+ANNOUNCEMENT_CONTENTS = (
+    '【教学提醒】本周起点评需在 48 小时内完成，请各位老师及时处理待办任务。',
+    '【学员伤病】有学员反馈手腕不适，相关老师请在点评中提醒控制练习时长。',
+)
+
+ROLE_LETTER = {RoleType.TEACHER: 'T', RoleType.RESEARCHER: 'R', RoleType.OPERATOR: 'O'}
+
+# 生成数据涉及的全部模型（--clear 按此顺序删除，依赖在前）
+CLEAR_ORDER = (
+    UnreadCounter, Notification, ReminderRecipient, Reminder, FollowUpRecord, Announcement,
+    StudentCourseProgress, StudentPieceStatus, PieceStatusJob, FeedbackPieceDetail, FeedbackRecord,
+    EvaluationTask, CourseRecord, Student.tags.through, Student, StudentTag, PersonRole, Person,
+)
+TIMESTAMPED_MODELS = (
+    Person, PersonRole, StudentTag, Student, CourseRecord, EvaluationTask, FeedbackRecord, FeedbackPieceDetail,
+    Reminder, ReminderRecipient, Notification, FollowUpRecord, Announcement,
+    CourseVersion, LessonVersion, PieceVersion,
+)
+
+
+@contextmanager
+def explicit_timestamps(models):
+    """
+    暂时关闭 auto_now / auto_now_add，使批量写入保留生成的 created_at / updated_at
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _copy_value(value):
+    if value is None:
+        return r'\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class Command(BaseCommand):
+    help = '按 --scale 生成带倾斜分布、可复现的压测数据集（批量写入，可选 COPY）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='规模系数（1 ≈ 1000 学员 / 2 万曲目明细 / 1 万提醒）')
+        parser.add_argument('--seed', type=int, default=42, help='随机种子')
+        parser.add_argument('--batch-size', type=int, default=5000, help='每批写入的行数')
+        parser.add_argument('--copy', action='store_true', help='PostgreSQL 下使用 COPY FROM STDIN 写入')
+        parser.add_argument('--clear', action='store_true', help='先删除现有业务数据（课程目录保留）')
+        parser.add_argument('--skip-derived', action='store_true', help='不重建学员曲目状态、课程进度与未读计数')
+
+    def handle(self, *args, **options):
+        self.seed = options['seed']
+        self.scale = options['scale']
+        self.batch_size = max(100, options['batch_size'])
+        self.use_copy = options['copy'] and connection.vendor == 'postgresql'
+        if options['copy'] and not self.use_copy:
+            self.stderr.write(self.style.WARNING('当前数据库不是 PostgreSQL，--copy 已忽略，改用 bulk_create'))
+        # 以当天零点为基准，保证同一种子在同一天内生成完全相同的数据
+        self.anchor = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.started = time.monotonic()
+
+        if options['clear']:
+            self._clear()
+        first_xiaoetong_id = self._xiaoetong_id(0)
+        if Student.objects.filter(xiaoetong_id=first_xiaoetong_id).exists():
+            raise CommandError('该种子的数据集已存在，请加 --clear 重新生成或更换 --seed（教职账号会复用，学员等数据按种子区分）')
+
+        with explicit_timestamps(TIMESTAMPED_MODELS):
+            for phase in (self._ensure_catalog, self._generate_staff, self._generate_students,
+                          self._generate_tasks_and_feedbacks, self._generate_reminders, self._generate_notifications,
+                          self._generate_followups, self._generate_announcements):
+                # 每个阶段使用独立的随机流：前一阶段消耗的随机数（如是否需要补建课程版本）不影响后续数据
+                self.rng = Random(f'{self.seed}:{phase.__name__}')
+                phase()
+        if not options['skip_derived']:
+            self._rebuild_derived()
+        self.stdout.write(self.style.SUCCESS(f'数据集生成完成，用时 {time.monotonic() - self.started:.1f}s'))
+
+    # ---- 基础工具 ----
+
+    def _count(self, key):
+        if key in ('teachers', 'researchers', 'operators'):
+            return max(1, round(BASE_COUNTS[key] * math.sqrt(self.scale)))
+        return max(1, round(BASE_COUNTS[key] * self.scale))
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _xiaoetong_id(self, index):
+        return f'ld{self.seed}_{index:07d}'
+
+    def _age(self):
+        """
+        距基准时间的天数：指数分布集中在近期
+        """
+        return min(MAX_AGE_DAYS, self.rng.expovariate(1 / MEAN_AGE_DAYS))
+
+    def _at(self, age_days):
+        return self.anchor - timedelta(days=age_days)
+
+    def _stamp(self, obj, at, by=None):
+        obj.created_at = obj.updated_at = at
+        if by is not None and hasattr(obj, 'created_by_id'):
+            obj.created_by_id = obj.updated_by_id = by
+        return obj
+
+    def _zipf_weights(self, n):
+        return [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(n)]
+
+    def _cumulative(self, weights):
+        total, cum = 0.0, []
+        for weight in weights:
+            total += weight
+            cum.append(total)
+        return cum
+
+    def _pick(self, population, cum_weights, k=1):
+        return self.rng.choices(population, cum_weights=cum_weights, k=k)
+
+    def _log(self, label, count):
+        self.stdout.write(f'[{time.monotonic() - self.started:7.1f}s] {label}: {count}')
+
+    def _write(self, model, objs):
+        if not objs:
+            return
+        if issubclass(model, SearchIndexedModel):
+            for obj in objs:
+                obj.refresh_search_tokens()
+        if self.use_copy:
+            self._copy(model, objs)
+        else:
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def _copy(self, model, objs):
+        """
+        COPY FROM STDIN（CSV）：跳过 ORM 的逐行参数绑定，适合百万级写入
+        """
+        fields = [field for field in model._meta.concrete_fields]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objs:
+            writer.writerow([_copy_value(getattr(obj, field.attname)) for field in fields])
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        sql = (
+            f"COPY {quote(model._meta.db_table)} ({', '.join(quote(f.column) for f in fields)}) "
+            r"FROM STDIN WITH (FORMAT csv, NULL '\N')"
+        )
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):  # psycopg2
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    # ---- 各阶段 ----
+
+    def _clear(self):
+        with transaction.atomic():
+            for model in CLEAR_ORDER:
+                model.objects.all().delete()
+            User.objects.filter(is_superuser=False, is_staff=False).delete()
+        self.stdout.write('已清除现有业务数据')
+
+    def _ensure_catalog(self):
+        """
+        课程目录不存在时按 data/django_course_data.json 导入，并为没有版本的课程生成已发布版本
+        """
+        if not Course.objects.filter(deleted_at__isnull=True).exists():
+            from apps.courses.catalog import apply_catalog, load_catalog, plan_catalog
+            apply_catalog(plan_catalog(load_catalog(os.path.join(str(settings.BASE_DIR), CATALOG_FILE))))
+
+        for course in Course.objects.filter(deleted_at__isnull=True).exclude(versions__isnull=False):
+            version = self._stamp(CourseVersion(
+                id=self._uuid(), course=course, version_label='2024版', status=EnableStatus.ENABLED,
+            ), self._at(MAX_AGE_DAYS))
+            version.save()
+            lesson_versions, piece_versions = [], []
+            for lesson in course.lessons.filter(deleted_at__isnull=True):
+                lesson_version = self._stamp(LessonVersion(
+                    id=self._uuid(), lesson=lesson, course_version=version, sort_order=lesson.sort_order,
+                    category=self.rng.choice(LessonCategory.values), focus=self.rng.choice(LessonFocus.values),
+                ), version.created_at)
+                lesson_versions.append(lesson_version)
+                for piece in lesson.pieces.filter(deleted_at__isnull=True):
+                    piece_versions.append(self._stamp(PieceVersion(
+                        id=self._uuid(), piece=piece, lesson_version=lesson_version,
+                        attribute=piece.attribute, is_required=piece.is_required,
+                    ), version.created_at))
+            LessonVersion.objects.bulk_create(lesson_versions)
+            PieceVersion.objects.bulk_create(piece_versions)
+            version.release()
+
+        # 课程 → [(piece_id, lesson_version_id)]，供点评明细引用
+        self.courses = []
+        for course in Course.objects.filter(deleted_at__isnull=True).order_by('name'):
+            version = course.versions.filter(deleted_at__isnull=True).order_by('created_at').first()
+            lesson_versions = dict(
+                LessonVersion.objects.filter(course_version=version).values_list('lesson_id', 'id')
+            )
+            pieces = [
+                (piece_id, lesson_versions.get(lesson_id))
+                for piece_id, lesson_id in Piece.objects.filter(course=course, deleted_at__isnull=True)
+                .order_by('lesson__sort_order', 'name').values_list('id', 'lesson_id')
+            ]
+            if pieces:
+                self.courses.append({'id': course.id, 'version_id': version.id, 'pieces': pieces})
+        if not self.courses:
+            raise CommandError('没有可用的课程曲目，无法生成点评数据')
+        self._log('课程', len(self.courses))
+
+    def _generate_staff(self):
+        """
+        演示账号 + 按规模生成的教职人员；生成的用户名带种子，不同种子可共存于同一库。
+        账号已存在时（README 演示账号、同种子此前生成的人员）复用已有账号与人员，只补缺少的角色
+        """
+        password = make_password(DEMO_PASSWORD)
+        plan = list(DEMO_STAFF)
+        counts = {RoleType.TEACHER: self._count('teachers'), RoleType.RESEARCHER: self._count('researchers'),
+                  RoleType.OPERATOR: self._count('operators')}
+        for role, total in counts.items():
+            existing = sum(1 for _, _, r in DEMO_STAFF if r == role)
+            for n in range(existing, total):
+                name = self.rng.choice(SURNAMES) + '老师'
+                plan.append((name, f'{role}_s{self.seed}_{n:04d}', role))
+
+        usernames = [username for _, username, _ in plan]
+        existing_users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        existing_persons = dict(
+            Person.objects.filter(user__username__in=usernames).values_list('user__username', 'id')
+        )
+        existing_roles = set(
+            PersonRole.objects.filter(person_id__in=existing_persons.values()).values_list('person_id', 'role')
+        )
+
+        users, persons, roles, linked = [], [], [], []
+        self.staff = {RoleType.TEACHER: [], RoleType.RESEARCHER: [], RoleType.OPERATOR: []}
+        self.letters = {}
+        for name, username, role in plan:
+            # 无论是否复用都消耗同样的随机数，保证同一种子生成的其余数据不变
+            person = self._stamp(Person(
+                id=self._uuid(), name=name, status=EnableStatus.ENABLED, email=f'{username}@piano-school.com',
+                phone=f'13{self.rng.randint(100000000, 999999999)}',
+            ), self._at(MAX_AGE_DAYS))
+            role_id = self._uuid()
+            person_id = existing_persons.get(username)
+            if person_id is None:
+                person_id = person.id
+                persons.append(person)
+                if username in existing_users:
+                    person.user_id = existing_users[username]
+                else:
+                    users.append(User(username=username, password=password, email=person.email))
+                    linked.append(person)
+            if (person_id, role) not in existing_roles:
+                existing_roles.add((person_id, role))
+                roles.append(self._stamp(PersonRole(id=role_id, person_id=person_id, role=role), person.created_at))
+            self.staff[role].append(person_id)
+            self.letters[person_id] = ROLE_LETTER[role]
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        user_ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+        for user, person in zip(users, linked):
+            person.user_id = user_ids[user.username]
+        self._write(Person, persons)
+        self._write(PersonRole, roles)
+
+        # 热度：各角色内按 Zipf 排名（演示账号排在最前）
+        self.teacher_cum = self._cumulative(self._zipf_weights(len(self.staff[RoleType.TEACHER])))
+        self.all_staff = [pid for ids in self.staff.values() for pid in ids]
+        self.staff_cum = self._cumulative(self._zipf_weights(len(self.all_staff)))
+        self.hot_staff = set(self.all_staff[:max(3, len(self.all_staff) // 20)])
+        self._log('人员', len(plan))
+
+    def _generate_students(self):
+        tags = [self._stamp(StudentTag(id=self._uuid(), name=name, description=desc), self._at(MAX_AGE_DAYS))
+                for name, desc in TAGS if not StudentTag.objects.filter(name=name).exists()]
+        StudentTag.objects.bulk_create(tags)
+        tag_name_by_id = dict(StudentTag.objects.order_by('name').values_list('id', 'name'))
+        tag_ids = list(tag_name_by_id)
+        operators = self.staff[RoleType.OPERATOR]
+        course_cum = self._cumulative([0.7 if i == 0 else 0.3 / max(1, len(self.courses) - 1)
+                                       for i in range(len(self.courses))])
+
+        total = self._count('students')
+        self.student_ids = []
+        self.student_courses = []
+        weights = []
+        students, links, records = [], [], []
+        for index in range(total):
+            at = self._at(self._age() * 3)
+            nickname = self.rng.choice(SURNAMES) + ''.join(self.rng.choices(GIVEN_CHARS, k=self.rng.randint(1, 2)))
+            student = self._stamp(Student(
+                id=self._uuid(), xiaoetong_id=self._xiaoetong_id(index), nickname=nickname,
+                remark_name=nickname if self.rng.random() < 0.2 else None, status=EnableStatus.ENABLED,
+                op_note=self.rng.choice(FOLLOW_UP_CONTENTS) if self.rng.random() < 0.3 else None,
+            ), at, by=self.rng.choice(operators))
+            students.append(student)
+            self.student_ids.append(student.id)
+            weights.append(self.rng.paretovariate(PARETO_ALPHA))
+            student_tag_ids = self.rng.sample(tag_ids, self.rng.choice((0, 0, 1, 1, 2)))
+            for tag_id in student_tag_ids:
+                links.append(Student.tags.through(student_id=student.id, studenttag_id=tag_id))
+            # 直接写中间表不触发 m2m_changed，冗余标签名在此填好
+            student.tag_names = sorted(tag_name_by_id[tag_id] for tag_id in student_tag_ids)
+
+            enrolled = {self._pick(range(len(self.courses)), course_cum)[0]}
+            if self.rng.random() < 0.2:
+                enrolled.add(self.rng.randrange(len(self.courses)))
+            self.student_courses.append(sorted(enrolled))
+            for course_index in sorted(enrolled):
+                course = self.courses[course_index]
+                records.append(self._stamp(CourseRecord(
+                    id=self._uuid(), student_id=student.id, course_id=course['id'],
+                    course_version_id=course['version_id'],
+                    course_status=self.rng.choice(CourseLearnStatus.values), record_status=RecordStatus.ACTIVE,
+                    start_at=at,
+                ), at, by=student.created_by_id))
+
+            if len(students) >= self.batch_size:
+                self._flush_students(students, links, records)
+        self._flush_students(students, links, records)
+        self.student_cum = self._cumulative(weights)
+        self._log('学员', total)
+
+    def _flush_students(self, students, links, records):
+        self._write(Student, students)
+        Student.tags.through.objects.bulk_create(links, batch_size=self.batch_size)
+        self._write(CourseRecord, records)
+        students.clear()
+        links.clear()
+        records.clear()
+
+    def _generate_tasks_and_feedbacks(self):
+        teachers = self.staff[RoleType.TEACHER]
+        researchers = self.staff[RoleType.RESEARCHER]
+        student_indexes = range(len(self.student_ids))
+        total = self._count('tasks')
+        # 供提醒关联点评记录的蓄水池样本
+        self.feedback_sample = []
+        tasks, feedbacks, details = [], [], []
+        counts = {'feedbacks': 0, 'details': 0}
+
+        for seen in range(total):
+            age = self._age()
+            at = self._at(age)
+            student_index = self._pick(student_indexes, self.student_cum)[0]
+            teacher = self._pick(teachers, self.teacher_cum)[0]
+            completed = self.rng.random() < (0.95 if age > 7 else 0.4)
+            task = self._stamp(EvaluationTask(
+                id=self._uuid(), student_id=self.student_ids[student_index], assignee_id=teacher,
+                status=TaskStatus.COMPLETED if completed else TaskStatus.PENDING,
+                source=self.rng.choice(TaskSource.values), note=self.rng.choice(TASK_NOTES),
+            ), at, by=self.rng.choice(researchers + [teacher]))
+            tasks.append(task)
+
+            if completed:
+                done_at = at + timedelta(hours=self.rng.uniform(1, 72))
+                feedback = self._stamp(FeedbackRecord(
+                    id=self._uuid(), task_id=task.id, student_id=task.student_id, teacher_id=teacher,
+                    teacher_content=' '.join(self.rng.sample(TEACHER_COMMENTS, 2)),
+                    researcher_feedback=self.rng.choice(RESEARCHER_FEEDBACK) if self.rng.random() < 0.4 else None,
+                    produce_impression=self.rng.random() < 0.3,
+                    impression_text=self.rng.choice(IMPRESSIONS) if self.rng.random() < 0.3 else None,
+                ), min(done_at, self.anchor), by=teacher)
+                feedbacks.append(feedback)
+                counts['feedbacks'] += 1
+                course = self.courses[self.rng.choice(self.student_courses[student_index])]
+                size = min(len(course['pieces']), self._pick((1, 2, 3, 4), (35, 70, 90, 100))[0])
+                for piece_id, lesson_version_id in self.rng.sample(course['pieces'], size):
+                    details.append(self._stamp(FeedbackPieceDetail(
+                        id=self._uuid(), feedback_id=feedback.id, piece_id=piece_id,
+                        course_version_id=course['version_id'], lesson_version_id=lesson_version_id,
+                    ), feedback.created_at, by=teacher))
+                counts['details'] += size
+                if len(self.feedback_sample) < 10000:
+                    self.feedback_sample.append(feedback.id)
+                else:
+                    slot = self.rng.randrange(counts['feedbacks'])
+                    if slot < 10000:
+                        self.feedback_sample[slot] = feedback.id
+
+            if len(details) >= self.batch_size or len(tasks) >= self.batch_size:
+                self._flush_tasks(tasks, feedbacks, details)
+        self._flush_tasks(tasks, feedbacks, details)
+        self._log('点评任务', total)
+        self._log('点评记录', counts['feedbacks'])
+        self._log('曲目明细', counts['details'])
+
+    def _flush_tasks(self, tasks, feedbacks, details):
+        self._write(EvaluationTask, tasks)
+        self._write(FeedbackRecord, feedbacks)
+        self._write(FeedbackPieceDetail, details)
+        tasks.clear()
+        feedbacks.clear()
+        details.clear()
+
+    def _recipient_count(self):
+        roll = self.rng.random()
+        if roll < 0.85:
+            count = 1
+        elif roll < 0.95:
+            count = self.rng.randint(2, 3)
+        elif roll < 0.99:
+            count = self.rng.randint(5, 20)
+        else:
+            count = self.rng.randint(50, 500)  # 群发长尾
+        return min(count, len(self.all_staff))
+
+    def _read_state(self, person_id, at, age):
+        """
+        越旧越可能已读；热门人员已读率减半，形成长尾未读积压
+        """
+        chance = min(0.97, 0.3 + age / 30)
+        if person_id in self.hot_staff:
+            chance /= 2
+        if self.rng.random() < chance:
+            return True, min(self.anchor, at + timedelta(hours=self.rng.expovariate(1 / 12)))
+        return False, None
+
+    def _generate_reminders(self):
+        total = self._count('reminders')
+        student_indexes = range(len(self.student_ids))
+        reminders, recipients = [], []
+        recipient_total = 0
+        for _ in range(total):
+            age = self._age()
+            at = self._at(age)
+            sender = self._pick(self.all_staff, self.staff_cum)[0]
+            count = self._recipient_count()
+            if count == 1:
+                chosen = [self._pick(self.all_staff, self.staff_cum)[0]]
+            else:
+                chosen = self.rng.sample(self.all_staff, count)
+            reminder = self._stamp(Reminder(
+                id=self._uuid(), sender_id=sender, receiver_id=chosen[0] if count == 1 else None,
+                urgency=self.rng.choice(UrgencyLevel.values), category=self.rng.choice(ReminderCategory.values),
+                student_id=(self.student_ids[self._pick(student_indexes, self.student_cum)[0]]
+                            if self.rng.random() < 0.7 else None),
+                feedback_id=self.rng.choice(self.feedback_sample) if self.feedback_sample and self.rng.random() < 0.3 else None,
+                start_at=at, end_at=at + timedelta(days=7), content=self.rng.choice(REMINDER_CONTENTS),
+            ), at, by=sender)
+            reminder.e2e_type = reminder.compute_e2e_type(
+                recipient_id=chosen[0], role_map={str(pid): letter for pid, letter in
+                                                  ((sender, self.letters[sender]), (chosen[0], self.letters[chosen[0]]))},
+            )
+            reminders.append(reminder)
+            for person_id in chosen:
+                is_read, read_at = self._read_state(person_id, at, age)
+                recipients.append(self._stamp(ReminderRecipient(
+                    id=self._uuid(), reminder_id=reminder.id, person_id=person_id, is_read=is_read, read_at=read_at,
+                ), at, by=sender))
+            recipient_total += len(chosen)
+            if len(recipients) >= self.batch_size:
+                self._write(Reminder, reminders)
+                self._write(ReminderRecipient, recipients)
+                reminders.clear()
+                recipients.clear()
+        self._write(Reminder, reminders)
+        self._write(ReminderRecipient, recipients)
+        self._log('提醒', total)
+        self._log('提醒接收人', recipient_total)
+
+    def _generate_notifications(self):
+        total = self._count('notifications')
+        batch = []
+        for _ in range(total):
+            age = self._age()
+            at = self._at(age)
+            recipient = self._pick(self.all_staff, self.staff_cum)[0]
+            is_read, read_at = self._read_state(recipient, at, age)
+            title, message = self.rng.choice(NOTIFICATION_TEMPLATES)
+            batch.append(self._stamp(Notification(
+                id=self._uuid(), type=self.rng.choice(NotificationType.values), title=title, message=message,
+                recipient_id=recipient, sender_id=self.rng.choice(self.all_staff), is_read=is_read, read_at=read_at,
+            ), at))
+            if len(batch) >= self.batch_size:
+                self._write(Notification, batch)
+                batch.clear()
+        self._write(Notification, batch)
+        self._log('通知', total)
+
+    def _generate_followups(self):
+        total = self._count('followups')
+        operators = self.staff[RoleType.OPERATOR]
+        student_indexes = range(len(self.student_ids))
+        seq = {}
+        batch = []
+        for _ in range(total):
+            at = self._at(self._age())
+            student_id = self.student_ids[self._pick(student_indexes, self.student_cum)[0]]
+            seq[student_id] = seq.get(student_id, 0) + 1
+            operator = self.rng.choice(operators)
+            batch.append(self._stamp(FollowUpRecord(
+                id=self._uuid(), student_id=student_id, operator_id=operator, seq_no=seq[student_id],
+                status=self.rng.choice(FollowUpStatus.values), purpose=self.rng.choice(FollowUpPurpose.values),
+                urgency=self.rng.choice(FollowUpUrgency.values), content=self.rng.choice(FOLLOW_UP_CONTENTS),
+                need_follow_up=self.rng.random() < 0.3,
+            ), at, by=operator))
+            if len(batch) >= self.batch_size:
+                self._write(FollowUpRecord, batch)
+                batch.clear()
+        self._write(FollowUpRecord, batch)
+        self._log('回访', total)
+
+    def _generate_announcements(self):
+        batch = []
+        for _ in range(ANNOUNCEMENT_COUNT):
+            at = self._at(self._age())
+            publisher = self.rng.choice(self.all_staff)
+            batch.append(self._stamp(Announcement(
+                id=self._uuid(), publisher_id=publisher, type=self.rng.choice(AnnouncementType.values),
+                content=self.rng.choice(ANNOUNCEMENT_CONTENTS), start_at=at,
+                end_at=at + timedelta(days=30) if self.rng.random() < 0.7 else None,
+            ), at, by=publisher))
+        self._write(Announcement, batch)
+        self._log('公告', ANNOUNCEMENT_COUNT)
+
+    def _rebuild_derived(self):
+        """
+        批量写入绕过了维护派生数据的写路径，这里用现有的集合化入口重建
+        """
+        processed = 0
+        chunk = []
+        for feedback_id in FeedbackRecord.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=2000):
+            chunk.append(feedback_id)
+            if len(chunk) >= 2000:
+                processed += StudentPieceStatus.update_by_feedbacks(chunk)
+                chunk = []
+        processed += StudentPieceStatus.update_by_feedbacks(chunk)
+        self._log('学员曲目状态（明细）', processed)
+        call_command('refresh_student_progress', stdout=self.stdout)
+        call_command('reconcile_unread_counters', stdout=self.stdout)
@@ -0,0 +1,65 @@
+"""
+重建关键字搜索分词列 search_tokens（迁移新增该列后回填存量数据，或批量写入绕过 save() 后修复）
+
+用法：
+  python manage.py rebuild_search_index
+  python manage.py rebuild_search_index --model students.Student --batch-size 2000
+  python manage.py rebuild_search_index --only-empty
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core.models import SearchIndexedModel
+
+
+def indexed_models():
+    return [model for model in apps.get_models() if issubclass(model, SearchIndexedModel)]
+
+
+class Command(BaseCommand):
+    help = '重建关键字搜索分词列（search_tokens）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', help='仅重建指定模型（app_label.Model，可重复）')
+        parser.add_argument('--batch-size', type=int, default=1000, help='每批读取并回写的行数')
+        parser.add_argument('--only-empty', action='store_true', help='只处理 search_tokens 为空的行')
+
+    def handle(self, *args, **options):
+        targets = indexed_models()
+        if options['models']:
+            labels = {model._meta.label_lower: model for model in targets}
+            try:
+                targets = [labels[label.lower()] for label in options['models']]
+            except KeyError as exc:
+                raise CommandError(f'未知或未建立搜索索引的模型：{exc.args[0]}')
+        for model in targets:
+            updated = self.rebuild(model, options['batch_size'], options['only_empty'])
+            self.stdout.write(f'{model._meta.label}: {updated}')
+        self.stdout.write(self.style.SUCCESS('搜索分词重建完成'))
+
+    def rebuild(self, model, batch_size, only_empty):
+        """
+        按主键顺序分批处理，每批一个事务，只回写分词有变化的行
+        """
+        fields = ['pk', 'search_tokens', *model.search_index_fields]
+        qs = model._base_manager.order_by('pk').only(*fields[1:])
+        if only_empty:
+            qs = qs.filter(search_tokens='')
+        updated, last_pk = 0, None
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            batch = list(batch_qs[:batch_size])
+            if not batch:
+                return updated
+            last_pk = batch[-1].pk
+            changed = []
+            for obj in batch:
+                before = obj.search_tokens
+                obj.refresh_search_tokens()
+                if obj.search_tokens != before:
+                    changed.append(obj)
+            if changed:
+                with transaction.atomic():
+                    model._base_manager.bulk_update(changed, ['search_tokens'], batch_size=batch_size)
+                updated += len(changed)
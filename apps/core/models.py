@@ -114,4 +114,41 @@ class AuditModel(SoftDeleteModel):
     )
     
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+class SearchIndexedModel(models.Model):
+    """
+    关键字搜索索引字段（见 apps.core.search）
+    子类声明 search_index_fields，save() 时按这些字段重建 search_tokens；
+    指定 update_fields 且包含任一被索引字段时，自动把 search_tokens 加入 update_fields；
+    search_ngram_fields（需同时在 search_index_fields 中）额外写入 n-gram，支持按 ID 片段查找
+    """
+    search_index_fields = ()
+    search_ngram_fields = ()
+
+    search_tokens = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='搜索分词',
+        help_text='由 search_index_fields 生成的分词，供关键字搜索使用'
+    )
+
+    class Meta:
+        abstract = True
+
+    def refresh_search_tokens(self):
+        from apps.core.search import build_search_tokens
+        self.search_tokens = build_search_tokens(
+            *(getattr(self, name) for name in self.search_index_fields),
+            ngram_values=[getattr(self, name) for name in self.search_ngram_fields],
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.refresh_search_tokens()
+        elif set(update_fields) & set(self.search_index_fields):
+            self.refresh_search_tokens()
+            kwargs['update_fields'] = {*update_fields, 'search_tokens'}
+        super().save(*args, **kwargs)
@@ -1,6 +1,239 @@
+"""
+分页
+
+默认按页码分页（PageNumberPagination，每页一次 COUNT(*) + OFFSET）。
+请求带 ?cursor= 时切换为键集分页（KeysetPaginationMixin）：
+- 按 (created_at, id) 倒序，即现有列表的 -created_at 排序；游标记录上一页最后一行的 (created_at, id)，
+  下一页用 WHERE (created_at, id) < 游标 取 size + 1 行判断是否还有下一页，不做 OFFSET，深页与首页代价相同；
+- ?cursor= 为空表示第一页，后续页使用响应中的 next_cursor；键集模式下忽略 ?ordering=；
+- 响应统一为 items / page / size / total 信封（另含 next_cursor、next）；page 原样回显请求中的页码，
+  total 默认为 null，?total=1 时按下述计数策略返回。
+
+计数策略（count_queryset，页码分页的 count / total 与键集分页的 ?total=1 共用）：
+1) 相同过滤条件（按 SQL 与参数取摘要）在 PAGINATION_COUNT_CACHE_TTL 秒内有缓存时直接返回缓存值；
+2) PostgreSQL 下先取规划器估算：无过滤条件时读 pg_class.reltuples，否则 EXPLAIN 的 Plan Rows；
+   估算不低于 PAGINATION_COUNT_THRESHOLD 时直接返回估算值，不执行 COUNT(*)；
+3) 否则执行精确 COUNT(*)，结果达到阈值时写入缓存。
+1)、2) 得到的是近似值，响应中以 count_approximate / total_approximate 标明；
+近似计数时不再按总页数拒绝超出的页码（估算偏小时仍可继续翻页）。
+"""
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+TRUE_VALUES = ('1', 'true', 'True')
+COUNT_CACHE_PREFIX = 'pagination:count:'
+
+
+def _count_threshold():
+    return getattr(settings, 'PAGINATION_COUNT_THRESHOLD', 10000)
+
+
+def _count_cache_ttl():
+    return getattr(settings, 'PAGINATION_COUNT_CACHE_TTL', 30)
+
+
+def planner_estimate(queryset):
+    """
+    PostgreSQL 规划器的行数估算；其他数据库或尚无统计信息时返回 None
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.order_by().query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and not query.combinator:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+            # 从未 ANALYZE 的表 reltuples 为 -1
+            return row[0] if row and row[0] >= 0 else None
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            # 恒不匹配的条件（如 .none()）不生成 SQL
+            return 0
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_queryset(queryset):
+    """
+    按模块说明的策略计数
+
+    Returns:
+        tuple(int, bool): (行数, 是否为近似值)
+    """
+    queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        # 恒不匹配的查询集（如 .none()、无有效字符的检索词）
+        return 0, False
+    key = COUNT_CACHE_PREFIX + hashlib.sha1(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
+
+    threshold = _count_threshold()
+    estimate = planner_estimate(queryset)
+    if estimate is not None and estimate >= threshold:
+        return estimate, True
+
+    exact = queryset.count()
+    if exact >= threshold:
+        cache.set(key, exact, _count_cache_ttl())
+    return exact, False
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    count 走 count_queryset；近似计数时 count_is_approximate 为 True，页码只校验下界、切片不按 count 截断
+    """
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        total, self.count_is_approximate = count_queryset(self.object_list)
+        return total
+
+    def validate_number(self, number):
+        self.count  # noqa: B018 先计数，确定是否为近似值
+        if not self.count_is_approximate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_approximate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+def encode_cursor(obj):
+    raw = f'{obj.created_at.isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """
+    Returns:
+        tuple(datetime, UUID)|None: 空游标返回 None（第一页）
+
+    Raises:
+        NotFound: 游标无法解析
+    """
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        created_at, pk = raw.split('|', 1)
+        position = parse_datetime(created_at), uuid.UUID(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise NotFound('Invalid cursor.')
+    if position[0] is None:
+        raise NotFound('Invalid cursor.')
+    return position
+
+
+class KeysetPaginationMixin:
+    """
+    为页码分页类增加按请求开启的键集分页（见模块说明）
+    """
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+
+    def _use_keyset(self, queryset, request):
+        if self.cursor_query_param not in request.query_params or not isinstance(queryset, QuerySet):
+            return False
+        field_names = {field.name for field in queryset.model._meta.concrete_fields}
+        return 'created_at' in field_names and queryset.model._meta.pk.name == 'id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self._use_keyset(queryset, request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.keyset_size = self.get_page_size(request)
+        position = decode_cursor(request.query_params.get(self.cursor_query_param))
+        self.total, self.total_approximate = None, False
+        if request.query_params.get(self.total_query_param) in TRUE_VALUES:
+            self.total, self.total_approximate = count_queryset(queryset)
+        qs = queryset.order_by('-created_at', '-id')
+        if position is not None:
+            created_at, pk = position
+            # created_at__lte 让索引从游标处开始范围扫描，OR 部分处理同一时间戳的并列行
+            qs = qs.filter(created_at__lte=created_at).filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        rows = list(qs[:self.keyset_size + 1])
+        self.next_cursor = encode_cursor(rows[self.keyset_size - 1]) if len(rows) > self.keyset_size else None
+        return rows[:self.keyset_size]
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'keyset', False):
+            return super().get_paginated_response(data)
+        try:
+            page = int(self.request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            page = 1
+        next_url = None
+        if self.next_cursor:
+            next_url = replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+            next_url = replace_query_param(next_url, self.page_query_param, page + 1)
+        return Response({
+            'items': data,
+            'page': page,
+            'size': self.keyset_size,
+            'total': self.total,
+            'total_approximate': self.total_approximate,
+            'next_cursor': self.next_cursor,
+            'next': next_url,
+        })
+
+
+class ApproximateCountMixin:
+    """
+    页码分页使用 ApproximateCountPaginator，DRF 默认信封中附加 count_approximate
+    """
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if 'count' in response.data:
+            response.data['count_approximate'] = self.page.paginator.count_is_approximate
+        return response
+
 
-class StandardResultsSetPagination(PageNumberPagination):
+class StandardResultsSetPagination(KeysetPaginationMixin, ApproximateCountMixin, PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
@@ -0,0 +1,184 @@
+"""
+请求级 SQL 画像：语句数、数据库耗时、重复语句指纹（N+1 检测）、最慢语句
+
+- QueryProfileMiddleware 按 PERF_SAMPLE_RATE 抽样请求，抽中时对所有数据库连接挂 connection.execute_wrapper，
+  响应头写入 Server-Timing（db / app 两项），并按解析出的 URL 名（方法 + view_name）汇总到进程内滚动聚合；
+- 未抽中的请求只多一次随机数判断；抽中的请求每条语句多一次计时和一次指纹归一化（正则替换）；
+- 聚合只保存在当前进程内（多进程部署各进程各自统计），通过 /api/_perf/ 查看（仅管理员）；
+- 流式响应在视图返回之后才迭代，期间的查询不计入。
+"""
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+# 排除在统计之外的 URL 名（画像端点本身）
+EXCLUDED_VIEWS = {'perf-profiles'}
+# 每个端点保留的重复指纹种类数上限（超出时丢弃出现次数最少的）
+MAX_FINGERPRINTS = 20
+# 快照中最慢语句保留的 SQL 长度
+SQL_PREVIEW_CHARS = 500
+
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def _sample_rate():
+    return getattr(settings, 'PERF_SAMPLE_RATE', 0.0)
+
+
+def _window_size():
+    return getattr(settings, 'PERF_WINDOW_SIZE', 200)
+
+
+def fingerprint(sql):
+    """
+    归一化 SQL：字面量与 IN 列表长度不同的语句视为同一指纹
+    """
+    sql = _STRING_LITERAL.sub("'?'", sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    return _PLACEHOLDER_LIST.sub('(%s, ...)', sql)
+
+
+class QueryRecorder:
+    """
+    execute_wrapper 钩子：累计单个请求内的语句数、耗时与指纹
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.slowest = (0.0, '')
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            if elapsed > self.slowest[0]:
+                self.slowest = (elapsed, sql)
+
+    def duplicates(self):
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+
+class ProfileStore:
+    """
+    进程内滚动聚合：每个端点保留最近 PERF_WINDOW_SIZE 次抽样，另记累计次数、重复指纹与历史最慢语句
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, recorder, total_seconds):
+        duplicates = recorder.duplicates()
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = {
+                    'samples': 0,
+                    'recent': deque(maxlen=_window_size()),
+                    'duplicates': Counter(),
+                    'slowest': (0.0, ''),
+                }
+            entry['samples'] += 1
+            entry['recent'].append((recorder.count, recorder.duration, total_seconds, sum(duplicates.values())))
+            if duplicates:
+                entry['duplicates'].update(duplicates)
+                if len(entry['duplicates']) > MAX_FINGERPRINTS:
+                    entry['duplicates'] = Counter(dict(entry['duplicates'].most_common(MAX_FINGERPRINTS)))
+            if recorder.slowest[0] > entry['slowest'][0]:
+                entry['slowest'] = recorder.slowest
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self):
+        """
+        Returns:
+            list[dict]: 各端点统计，按窗口内平均数据库耗时降序
+        """
+        with self._lock:
+            items = [
+                (endpoint, entry['samples'], list(entry['recent']), entry['duplicates'].most_common(5), entry['slowest'])
+                for endpoint, entry in self._endpoints.items()
+            ]
+        rows = []
+        for endpoint, samples, recent, duplicates, slowest in items:
+            queries = sorted(r[0] for r in recent)
+            db_ms = sorted(r[1] * 1000 for r in recent)
+            total_ms = sorted(r[2] * 1000 for r in recent)
+            size = len(recent)
+            rows.append({
+                'endpoint': endpoint,
+                'samples': samples,
+                'window': size,
+                'queries_avg': round(sum(queries) / size, 1),
+                'queries_max': queries[-1],
+                'db_ms_avg': round(sum(db_ms) / size, 2),
+                'db_ms_p95': round(db_ms[min(size - 1, int(size * 0.95))], 2),
+                'total_ms_p95': round(total_ms[min(size - 1, int(size * 0.95))], 2),
+                'duplicate_queries_avg': round(sum(r[3] for r in recent) / size, 1),
+                'top_duplicates': [{'fingerprint': fp, 'count': n} for fp, n in duplicates],
+                'slowest': {'ms': round(slowest[0] * 1000, 2), 'sql': slowest[1][:SQL_PREVIEW_CHARS]},
+            })
+        rows.sort(key=lambda row: row['db_ms_avg'], reverse=True)
+        return rows
+
+
+profile_store = ProfileStore()
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    name = match.view_name or match.route
+    if name in EXCLUDED_VIEWS:
+        return None
+    return f'{request.method} {name}'
+
+
+class QueryProfileMiddleware:
+    """
+    抽样请求的 SQL 画像中间件（放在 MIDDLEWARE 靠前位置，使 app 耗时覆盖其余中间件）
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = _sample_rate()
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        duplicated = sum(recorder.duplicates().values())
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries, {duplicated} duplicated", '
+            f'app;dur={total * 1000:.1f}'
+        )
+        endpoint = endpoint_name(request)
+        if endpoint is not None:
+            profile_store.record(endpoint, recorder, total)
+        return response
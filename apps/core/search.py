@@ -0,0 +1,281 @@
+"""
+关键字搜索（中文友好）：分词写入 search_tokens 列，PostgreSQL 下以 GIN(tsvector) 索引检索
+
+分词（tokenize）：
+- 连续的 ASCII 字母数字为一个词（小写）；
+- 其他文字（中文等）按连续片段切成单字与相邻双字（bigram），编码为 ASCII 词（c + 码点十六进制），
+  避免数据库分词器受 locale 影响丢弃非 ASCII 字符；
+- 其余字符为分隔符；
+- 模型在 search_ngram_fields 中声明的 ID 类字段（如小鹅通ID），其 ASCII 片段另外写入双字母、三字母 n-gram
+  （编码为 n + 十六进制），用于按 ID 中间片段查找。
+
+存储：SearchIndexedModel 在 save() 时按 search_index_fields 重建 search_tokens（前后带空格、去重）；
+批量写入（bulk_create / update）需自行调用 refresh_search_tokens() 或运行 rebuild_search_index；
+新增该列的迁移以 search_backfill_operation 回填存量数据。
+
+检索（search_queryset）：查询词按同样规则分词，全部词命中即匹配（最后一个 ASCII 词按前缀匹配）；
+模型声明了 search_ngram_fields 时，ASCII 词也可由其全部 n-gram 命中（词长 2 取双字母，≥3 取三字母），
+与 pg_trgm 一样是“包含全部 n-gram”的近似匹配：
+- PostgreSQL：to_tsvector('simple', search_tokens) @@ to_tsquery，命中迁移中创建的 GIN 表达式索引，
+  未指定排序时按 ts_rank 相关度、再按创建时间倒序；
+- 其他数据库：search_tokens LIKE '% 词 %' 逐词过滤（无相关度排序）。
+关联对象（如学员昵称、教师姓名）不复制到本表：各自的匹配结果以 UNION 子查询合并为 pk IN (...)，
+每一路都能走各自的索引。
+"""
+import re
+
+from django.db import connection, migrations
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_CONFIG = 'simple'
+# 查询词最多取的词数（过长的查询只用前面的部分过滤）
+MAX_QUERY_TOKENS = 16
+
+
+# ID 类字段 ASCII 片段写入的 n-gram 长度
+NGRAM_SIZES = (2, 3)
+_ENCODED_TOKEN = re.compile(r'c(?:[0-9a-f]{5})+')
+
+
+def _encode(chars):
+    return 'c' + ''.join(f'{ord(ch):05x}' for ch in chars)
+
+
+def _encode_ngram(chars):
+    return 'n' + chars.encode('ascii').hex()
+
+
+def _runs(text):
+    """
+    切分为 (类型, 片段)：'w' 为 ASCII 字母数字词，'c' 为其他文字片段
+    """
+    runs, current, kind = [], [], None
+    for ch in text:
+        if ch.isascii() and ch.isalnum():
+            char_kind = 'w'
+        elif ch.isalnum():
+            char_kind = 'c'
+        else:
+            char_kind = None
+        if char_kind != kind and current:
+            runs.append((kind, ''.join(current)))
+            current = []
+        kind = char_kind
+        if char_kind is not None:
+            current.append(ch)
+    if current:
+        runs.append((kind, ''.join(current)))
+    return runs
+
+
+def tokenize(text):
+    """
+    Returns:
+        list[str]: 词（按出现顺序，可能重复）
+    """
+    tokens = []
+    for kind, run in _runs(text or ''):
+        if kind == 'w':
+            tokens.append(run.lower())
+            continue
+        for i, ch in enumerate(run):
+            tokens.append(_encode(ch))
+            if i + 1 < len(run):
+                tokens.append(_encode(run[i:i + 2]))
+    return tokens
+
+
+def ngram_tokens(text):
+    """
+    ASCII 片段的双字母、三字母 n-gram（小写后编码）
+    """
+    tokens = []
+    for kind, run in _runs(text or ''):
+        if kind != 'w':
+            continue
+        run = run.lower()
+        for size in NGRAM_SIZES:
+            tokens.extend(_encode_ngram(run[i:i + size]) for i in range(len(run) - size + 1))
+    return tokens
+
+
+def build_search_tokens(*values, ngram_values=()):
+    tokens = {token for value in values for token in tokenize(value)}
+    tokens.update(token for value in ngram_values for token in ngram_tokens(value))
+    tokens = sorted(tokens)
+    return f" {' '.join(tokens)} " if tokens else ''
+
+
+def query_tokens(term):
+    """
+    查询词 → [(词, 是否前缀匹配)]；中文片段只取双字（单字片段取单字），最后一个 ASCII 词按前缀匹配
+    """
+    parsed = []
+    runs = _runs(term or '')
+    for index, (kind, run) in enumerate(runs):
+        if kind == 'w':
+            parsed.append((run.lower(), index == len(runs) - 1))
+        elif len(run) == 1:
+            parsed.append((_encode(run), False))
+        else:
+            parsed.extend((_encode(run[i:i + 2]), False) for i in range(len(run) - 1))
+    seen, unique = set(), []
+    for token, prefix in parsed:
+        if token not in seen:
+            seen.add(token)
+            unique.append((token, prefix))
+    return unique[:MAX_QUERY_TOKENS]
+
+
+def search_index_operation(model_name, index_name):
+    """
+    迁移操作：PostgreSQL 下创建 GIN(to_tsvector('simple', search_tokens)) 表达式索引，其他数据库不做任何事
+
+    索引不声明在模型 Meta 中（SQLite 无法建该表达式索引），因此 makemigrations 不会感知它。
+    """
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+        model = apps.get_model(model_name)
+        schema_editor.add_index(model, GinIndex(SearchVector('search_tokens', config=SEARCH_CONFIG), name=index_name))
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index_name)}')
+
+    return migrations.RunPython(forwards, backwards, elidable=False)
+
+
+def _alternatives(token, prefix, ngram):
+    """
+    单个查询词的候选匹配方式：[[(词, 是否前缀)], ...]，任一组全部命中即可
+    """
+    alternatives = [[(token, prefix)]]
+    if ngram and len(token) >= 2 and not _ENCODED_TOKEN.fullmatch(token):
+        size = min(len(token), max(NGRAM_SIZES))
+        grams = dict.fromkeys(_encode_ngram(token[i:i + size]) for i in range(len(token) - size + 1))
+        alternatives.append([(gram, False) for gram in grams])
+    return alternatives
+
+
+def _uses_ngrams(model):
+    return bool(getattr(model, 'search_ngram_fields', ()))
+
+
+def search_backfill_operation(model_name, fields, ngram_fields=(), batch_size=1000):
+    """
+    迁移操作：按主键分批回填存量行的 search_tokens
+
+    字段在迁移中显式列出（历史模型上没有 search_index_fields），与新增列时模型的声明保持一致；
+    之后分词规则或字段声明再变化时，运行 rebuild_search_index 重建。
+    """
+
+    def forwards(apps, schema_editor):
+        model = apps.get_model(model_name)
+        qs = model._base_manager.using(schema_editor.connection.alias).order_by('pk').only(*fields)
+        last_pk = None
+        while True:
+            batch = list((qs if last_pk is None else qs.filter(pk__gt=last_pk))[:batch_size])
+            if not batch:
+                return
+            last_pk = batch[-1].pk
+            for obj in batch:
+                obj.search_tokens = build_search_tokens(
+                    *(getattr(obj, name) for name in fields),
+                    ngram_values=[getattr(obj, name) for name in ngram_fields],
+                )
+            model._base_manager.using(schema_editor.connection.alias).bulk_update(batch, ['search_tokens'])
+
+    return migrations.RunPython(forwards, migrations.RunPython.noop, elidable=False)
+
+
+def _tsquery(tokens, ngram=False):
+    def term(token, prefix):
+        return f"'{token}':*" if prefix else f"'{token}'"
+
+    groups = []
+    for token, prefix in tokens:
+        options = [' & '.join(term(*item) for item in group) for group in _alternatives(token, prefix, ngram)]
+        groups.append(options[0] if len(options) == 1 else '(' + ' | '.join(f'({o})' for o in options) + ')')
+    return ' & '.join(groups)
+
+
+def _vector():
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('search_tokens', config=SEARCH_CONFIG)
+
+
+def matching(queryset, tokens):
+    """
+    在 queryset 的模型自身 search_tokens 上过滤
+    """
+    ngram = _uses_ngrams(queryset.model)
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery
+        return queryset.annotate(search_vector=_vector()).filter(
+            search_vector=SearchQuery(_tsquery(tokens, ngram), config=SEARCH_CONFIG, search_type='raw')
+        )
+    for token, prefix in tokens:
+        condition = Q()
+        for group in _alternatives(token, prefix, ngram):
+            both = Q()
+            for item, item_prefix in group:
+                both &= Q(search_tokens__contains=f' {item}' if item_prefix else f' {item} ')
+            condition |= both
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def search_queryset(queryset, term, relations=(), rank=True):
+    """
+    Args:
+        queryset: 模型需继承 SearchIndexedModel
+        term (str): 查询词
+        relations (Iterable[str]): 参与匹配的外键名，目标模型同样需继承 SearchIndexedModel
+        rank (bool): PostgreSQL 下是否按相关度 + 创建时间排序
+
+    Returns:
+        QuerySet: 过滤（及排序）后的查询集；查询词无有效字符时返回空集
+    """
+    tokens = query_tokens(term)
+    if not tokens:
+        return queryset.none()
+    model = queryset.model
+    ids = matching(model.objects.all(), tokens).values('pk')
+    for name in relations:
+        target = model._meta.get_field(name).related_model
+        ids = ids.union(model.objects.filter(**{f'{name}__in': matching(target.objects.all(), tokens).values('pk')})
+                        .values('pk'))
+    queryset = queryset.filter(pk__in=ids)
+    if rank and connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        query = SearchQuery(_tsquery(tokens, _uses_ngrams(model)), config=SEARCH_CONFIG, search_type='raw')
+        queryset = queryset.annotate(search_rank=SearchRank(_vector(), query)).order_by('-search_rank', '-created_at')
+    return queryset
+
+
+class KeywordSearchFilter(BaseFilterBackend):
+    """
+    统一的关键字搜索过滤后端（替代 SearchFilter 的 icontains 扫描）
+
+    视图属性：
+    - search_relations：参与匹配的外键名（如 ('student', 'sender')）
+    - search_query_params：读取的查询参数，默认 ('search', 'q')，取第一个非空值
+    放在 OrderingFilter 之后：请求未指定 ?ordering= 时按相关度排序。
+    """
+    default_query_params = ('search', 'q')
+
+    def filter_queryset(self, request, queryset, view):
+        params = getattr(view, 'search_query_params', self.default_query_params)
+        term = next((request.query_params.get(p) for p in params if request.query_params.get(p)), None)
+        if not term:
+            return queryset
+        return search_queryset(
+            queryset, term.strip(), getattr(view, 'search_relations', ()),
+            rank='ordering' not in request.query_params,
+        )
@@ -0,0 +1,160 @@
+"""
+表格文件流式读取：CSV / XLSX（与 export.py 的写出对应）
+
+两种格式都逐行产出字符串列表，内存占用与文件行数无关：
+- CSV：按文件头部探测编码（UTF-8 / 带 BOM 的 UTF-8，否则按 GB18030，兼容 Excel 另存的中文 CSV）；
+- XLSX：不依赖第三方库，zipfile 打开后对首个工作表 XML 做 iterparse，
+  每处理完一行即清理已解析的元素；共享字符串表需整体载入（与不重复文本量相关，而非行数）。
+"""
+import codecs
+import csv
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_CELL_REF = re.compile(r'^([A-Z]+)')
+
+# 探测编码时读取的字节数
+_SNIFF_BYTES = 64 * 1024
+
+
+def detect_csv_encoding(path):
+    with open(path, 'rb') as fh:
+        head = fh.read(_SNIFF_BYTES)
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as exc:
+        # 截断在多字节字符中间不算解码失败
+        if exc.start < len(head) - 3:
+            return 'gb18030'
+    return 'utf-8'
+
+
+def iter_csv_rows(path):
+    with open(path, 'r', encoding=detect_csv_encoding(path), newline='') as fh:
+        for row in csv.reader(fh):
+            yield [value.strip() for value in row]
+
+
+def _column_index(ref):
+    letters = _CELL_REF.match(ref or '')
+    if not letters:
+        return None
+    index = 0
+    for char in letters.group(1):
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def _sheet_paths(zf):
+    """
+    按 workbook.xml 与其关系文件列出工作表：[(名称, 包内路径), ...]（工作簿中的顺序）
+    """
+    try:
+        with zf.open('xl/workbook.xml') as fh:
+            sheets = [
+                (elem.get('name'), elem.get(f'{_NS_REL}id'))
+                for _, elem in iterparse(fh) if elem.tag == f'{_NS_MAIN}sheet'
+            ]
+        with zf.open('xl/_rels/workbook.xml.rels') as fh:
+            targets = {
+                elem.get('Id'): elem.get('Target')
+                for _, elem in iterparse(fh) if elem.tag == f'{_NS_PKG_REL}Relationship'
+            }
+    except KeyError:
+        return [('Sheet1', 'xl/worksheets/sheet1.xml')]
+    paths = []
+    for name, rel_id in sheets:
+        target = targets.get(rel_id)
+        if not target:
+            continue
+        if target.startswith('/'):
+            paths.append((name, target.lstrip('/')))
+        else:
+            paths.append((name, posixpath.normpath(posixpath.join('xl', target))))
+    return paths or [('Sheet1', 'xl/worksheets/sheet1.xml')]
+
+
+def _shared_strings(zf):
+    try:
+        fh = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with fh:
+        for _, elem in iterparse(fh):
+            if elem.tag == f'{_NS_MAIN}si':
+                strings.append(''.join(t.text or '' for t in elem.iter(f'{_NS_MAIN}t')))
+                elem.clear()
+    return strings
+
+
+def _cell_value(cell, shared):
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(f'{_NS_MAIN}t'))
+    value = cell.find(f'{_NS_MAIN}v')
+    text = value.text if value is not None and value.text is not None else ''
+    if kind == 's' and text:
+        return shared[int(text)]
+    if kind == 'b':
+        return '是' if text == '1' else '否'
+    if kind is None and text.endswith('.0'):
+        # 纯数字单元格（如数字形式的 ID）去掉 Excel 追加的 .0
+        return text[:-2]
+    return text
+
+
+def _iter_sheet(zf, sheet_path, shared):
+    with zf.open(sheet_path) as fh:
+        for _, elem in iterparse(fh):
+            if elem.tag != f'{_NS_MAIN}row':
+                continue
+            row = []
+            for cell in elem.iter(f'{_NS_MAIN}c'):
+                index = _column_index(cell.get('r'))
+                if index is not None and index > len(row):
+                    row.extend([''] * (index - len(row)))
+                row.append(_cell_value(cell, shared).strip())
+            elem.clear()
+            yield row
+
+
+def iter_xlsx_rows(path):
+    """
+    逐行读取第一个工作表
+    """
+    with zipfile.ZipFile(path) as zf:
+        shared = _shared_strings(zf)
+        yield from _iter_sheet(zf, _sheet_paths(zf)[0][1], shared)
+
+
+def iter_xlsx_sheets(path):
+    """
+    依次读取全部工作表：产出 (工作表名, 行列表)；整表载入，仅用于课程目录这类小表
+    """
+    with zipfile.ZipFile(path) as zf:
+        shared = _shared_strings(zf)
+        for name, sheet_path in _sheet_paths(zf):
+            yield name, list(_iter_sheet(zf, sheet_path, shared))
+
+
+def iter_table_rows(path, file_format):
+    """
+    逐行读取表格文件（首行为表头）
+
+    Args:
+        path (str): 文件路径
+        file_format (str): 'csv' 或 'xlsx'
+    """
+    if file_format == 'xlsx':
+        return iter_xlsx_rows(path)
+    return iter_csv_rows(path)
+
@@ -0,0 +1,301 @@
+import unittest
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.core.benchmarks import check_budgets, load_budgets, run_suite
+from apps.core.pagination import count_queryset, planner_estimate
+from apps.core.perf import fingerprint, profile_store
+from apps.core.search import build_search_tokens, query_tokens, search_queryset
+from apps.evaluations.models import EvaluationTask, FeedbackRecord, StudentPieceStatus
+from apps.notifications.models import UnreadCounter
+from apps.persons.models import Person
+from apps.reminders.models import Reminder, ReminderRecipient
+from apps.students.models import Student
+
+
+class GenerateDatasetTests(TestCase):
+    """
+    压测数据集：同种子可复现、教师负载倾斜、派生数据已重建
+    """
+
+    def _generate(self, **options):
+        call_command('generate_dataset', scale=0.02, stdout=StringIO(), **options)
+
+    def _fingerprint(self):
+        return (
+            sorted(str(pk) for pk in Student.objects.values_list('id', flat=True)),
+            sorted(str(pk) for pk in FeedbackRecord.objects.values_list('id', flat=True)),
+            ReminderRecipient.objects.count(),
+        )
+
+    def test_same_seed_reproduces_dataset(self):
+        self._generate(skip_derived=True)
+        first = self._fingerprint()
+        self._generate(skip_derived=True, clear=True)
+        self.assertEqual(self._fingerprint(), first)
+        self.assertEqual(Student.objects.count(), 20)
+
+    def test_other_seed_reuses_staff_accounts(self):
+        self._generate()
+        demo = Person.objects.get(user__username='李老师_teacher')
+        self._generate(seed=7)
+        self.assertEqual(Student.objects.count(), 40)
+        self.assertEqual(Person.objects.filter(user__username='李老师_teacher').get(), demo)
+        self.assertTrue(EvaluationTask.objects.filter(assignee=demo, student__xiaoetong_id__startswith='ld7_').exists())
+        self.assertEqual(
+            sum(UnreadCounter.objects.filter(source=UnreadCounter.SOURCE_REMINDER).values_list('unread', flat=True)),
+            ReminderRecipient.objects.filter(is_read=False).count(),
+        )
+        with self.assertRaisesMessage(CommandError, '该种子的数据集已存在'):
+            self._generate(seed=7)
+
+    def test_skew_and_derived_data(self):
+        self._generate()
+        loads = list(
+            EvaluationTask.objects.values('assignee').annotate(n=Count('id')).order_by('-n').values_list('n', flat=True)
+        )
+        self.assertGreater(loads[0], 3 * loads[len(loads) // 2])
+        self.assertTrue(StudentPieceStatus.objects.exists())
+        self.assertEqual(
+            sum(UnreadCounter.objects.filter(source=UnreadCounter.SOURCE_REMINDER).values_list('unread', flat=True)),
+            ReminderRecipient.objects.filter(is_read=False).count(),
+        )
+
+
+class ApiBudgetTests(TestCase):
+    """
+    热点 API 的 SQL 语句数不超过 api_budgets.json（延迟与响应大小依赖机器和数据规模，只在 bench_api 中比对）
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_dataset', scale=0.02, stdout=StringIO())
+
+    def test_query_budgets(self):
+        results = run_suite(repeat=2)
+        self.assertEqual(check_budgets(results, load_budgets(), check_latency=False, check_bytes=False), [])
+
+
+@override_settings(PERF_SAMPLE_RATE=1.0)
+class QueryProfileTests(APITestCase):
+    """
+    SQL 画像：Server-Timing 响应头、按 URL 名聚合、重复指纹、仅管理员可查看
+    """
+
+    def setUp(self):
+        profile_store.reset()
+        User = get_user_model()
+        self.admin_token = Token.objects.create(user=User.objects.create_user(username='perf_admin', is_staff=True))
+        self.user_token = Token.objects.create(user=User.objects.create_user(username='perf_user'))
+
+    def test_fingerprint_ignores_literals_and_in_list_length(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s) LIMIT 21'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 5'),
+        )
+
+    def test_records_per_endpoint_and_exposes_to_admin_only(self):
+        resp = self.client.get('/api/v1/tasks/')
+        self.assertIn('db;dur=', resp['Server-Timing'])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user_token.key}')
+        self.assertEqual(self.client.get('/api/_perf/').status_code, 403)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.admin_token.key}')
+        rows = {row['endpoint']: row for row in self.client.get('/api/_perf/').json()['endpoints']}
+        self.assertIn('GET task-list', rows)
+        self.assertNotIn('GET perf-profiles', rows)
+        self.assertGreaterEqual(rows['GET task-list']['queries_max'], 1)
+        self.assertTrue(rows['GET task-list']['slowest']['sql'])
+
+        self.assertEqual(self.client.delete('/api/_perf/').status_code, 204)
+        self.assertEqual(profile_store.snapshot(), [])
+
+
+class KeysetPaginationTests(APITestCase):
+    """
+    ?cursor= 键集分页：逐页遍历不重不漏（含同一时间戳的并列行），深页语句数与首页相同
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        teacher = Person.objects.create(name='键集老师')
+        student = Student.objects.create(xiaoetong_id='keyset-1', nickname='键集学员')
+        EvaluationTask.objects.bulk_create([
+            EvaluationTask(student=student, assignee=teacher, source='teacher') for _ in range(45)
+        ])
+        # 一半任务共用同一创建时间，验证并列行按 id 切分
+        tied = list(EvaluationTask.objects.values_list('id', flat=True)[:20])
+        EvaluationTask.objects.filter(id__in=tied).update(created_at=timezone.now())
+        cls.expected = [str(pk) for pk in EvaluationTask.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+
+    def _walk(self, url, **params):
+        seen, cursor, queries = [], '', []
+        while cursor is not None:
+            with CaptureQueriesContext(connection) as ctx:
+                body = self.client.get(url, {'cursor': cursor, **params}).json()
+            queries.append(len(ctx.captured_queries))
+            seen.extend(item['id'] for item in body['items'])
+            cursor = body['next_cursor']
+        return seen, queries, body
+
+    def test_walks_every_row_once_with_constant_cost(self):
+        seen, queries, last = self._walk('/api/v1/tasks/', page_size=20)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(queries), 3)
+        # 两个满页（首页与深页）语句数相同；末页行数少
+        self.assertEqual(queries[0], queries[1])
+        self.assertIsNone(last['total'])
+        self.assertEqual(last['size'], 20)
+
+    def test_total_is_optional(self):
+        body = self.client.get('/api/v1/tasks/', {'cursor': '', 'total': 1}).json()
+        self.assertEqual(body['total'], 45)
+        self.assertIsNotNone(body['next_cursor'])
+
+    def test_page_number_mode_unchanged(self):
+        body = self.client.get('/api/v1/tasks/').json()
+        self.assertEqual(body['count'], 45)
+        self.assertNotIn('next_cursor', body)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/v1/tasks/', {'cursor': 'bogus'}).status_code, 404)
+
+
+class ApproximateCountTests(APITestCase):
+    """
+    分页计数：达到阈值后缓存精确值并标明近似；近似计数时不按总页数拒绝页码
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        teacher = Person.objects.create(name='计数老师')
+        student = Student.objects.create(xiaoetong_id='count-1', nickname='计数学员')
+        EvaluationTask.objects.bulk_create([
+            EvaluationTask(student=student, assignee=teacher, source='teacher') for _ in range(45)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_small_lists_count_exactly(self):
+        for _ in range(2):
+            body = self.client.get('/api/v1/tasks/').json()
+            self.assertEqual((body['count'], body['count_approximate']), (45, False))
+
+    @override_settings(PAGINATION_COUNT_THRESHOLD=10)
+    def test_large_counts_are_cached_and_flagged(self):
+        first = self.client.get('/api/v1/tasks/').json()
+        self.assertEqual((first['count'], first['count_approximate']), (45, False))
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get('/api/v1/tasks/', {'page': 2}).json()
+        self.assertEqual((second['count'], second['count_approximate']), (45, True))
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+        # 不同过滤条件各自计数
+        filtered = self.client.get('/api/v1/tasks/', {'status': 'completed'}).json()
+        self.assertEqual((filtered['count'], filtered['count_approximate']), (0, False))
+        # 近似计数时超出估算页数的页码返回空页而不是 404
+        self.assertEqual(self.client.get('/api/v1/tasks/', {'page': 9}).json()['results'], [])
+
+    @override_settings(PAGINATION_COUNT_THRESHOLD=10)
+    def test_keyset_total_uses_same_strategy(self):
+        self.client.get('/api/v1/tasks/', {'cursor': '', 'total': 1})
+        body = self.client.get('/api/v1/tasks/', {'cursor': '', 'total': 1}).json()
+        self.assertEqual((body['total'], body['total_approximate']), (45, True))
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', '规划器估算依赖 PostgreSQL')
+    def test_planner_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE evaluations_evaluation_task')
+        self.assertIsNotNone(planner_estimate(EvaluationTask.objects.all()))
+        self.assertIsNotNone(planner_estimate(EvaluationTask.objects.filter(status='pending')))
+
+
+class KeywordSearchTests(APITestCase):
+    """
+    关键字搜索：中文双字分词、保存时维护分词列、关联对象（学员/人员）参与匹配、q 与 search 共用后端
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Person.objects.create(name='王晓明')
+        cls.student = Student.objects.create(xiaoetong_id='u_ABC123', nickname='小提琴学员', remark_name='周末班')
+        other = Student.objects.create(xiaoetong_id='u_XYZ999', nickname='钢琴学员')
+        cls.hit = Reminder.objects.create(sender=cls.teacher, student=cls.student, content='下周请复习音阶练习')
+        cls.miss = Reminder.objects.create(sender=cls.teacher, student=other, content='按时上课')
+        task = EvaluationTask.objects.create(student=cls.student, assignee=cls.teacher, source='teacher')
+        cls.feedback = FeedbackRecord.objects.create(task=task, student=cls.student, teacher=cls.teacher,
+                                                     teacher_content='揉弦稍显紧张，注意放松')
+
+    def _reminder_ids(self, **params):
+        return {row['id'] for row in self.client.get('/api/v1/reminders/', params).json()['results']}
+
+    def test_tokens(self):
+        tokens = build_search_tokens('音阶练习', 'u_ABC123')
+        for token, prefix in query_tokens('阶练') + query_tokens('abc'):
+            self.assertIn(f' {token}' if prefix else f' {token} ', tokens)
+        # 查询词中的中文只取双字，最后一个 ASCII 词按前缀匹配
+        self.assertEqual([prefix for _, prefix in query_tokens('音阶练 ab')], [False, False, True])
+        self.assertEqual(query_tokens('!!'), [])
+
+    def test_partial_xiaoetong_id(self):
+        hit = str(self.hit.id)
+        # 小鹅通ID 的后缀、中间片段（含双字母）均可命中；不连续的片段不命中
+        for term in ('123', 'bc12', 'C1', 'u_abc'):
+            self.assertEqual(self._reminder_ids(q=term), {hit}, term)
+        self.assertEqual(self._reminder_ids(q='124'), set())
+        students = self.client.get('/api/v1/students/', {'search': 'z99'}).json()['results']
+        self.assertEqual([row['xiaoetong_id'] for row in students], ['u_XYZ999'])
+        # 普通文本字段不做 n-gram
+        self.assertNotIn(' n', Reminder.objects.get(pk=self.hit.pk).search_tokens)
+
+    def test_tokens_maintained_on_save(self):
+        self.hit.content = '换弦练习'
+        self.hit.save(update_fields=['content'])
+        self.hit.refresh_from_db()
+        self.assertIn(query_tokens('换弦')[0][0], self.hit.search_tokens)
+        self.assertNotIn(query_tokens('音阶')[0][0], self.hit.search_tokens)
+
+    def test_reminder_search_covers_content_and_relations(self):
+        hit = str(self.hit.id)
+        self.assertEqual(self._reminder_ids(q='音阶练习'), {hit})
+        self.assertEqual(self._reminder_ids(q='小提琴'), {hit})
+        self.assertEqual(self._reminder_ids(search='abc12'), {hit})
+        self.assertEqual(self._reminder_ids(search='周末'), {hit})
+        self.assertEqual(self._reminder_ids(q='晓明'), {hit, str(self.miss.id)})
+        self.assertEqual(self._reminder_ids(q='练琴'), set())
+        # 无有效字符的检索词得到空结果，而不是 500
+        self.assertEqual(self._reminder_ids(q='!!'), set())
+        # 显式排序仍然生效
+        self.assertEqual(self._reminder_ids(q='晓明', ordering='created_at'), {hit, str(self.miss.id)})
+
+    def test_feedback_list_and_export_filter(self):
+        from apps.evaluations.views import filter_feedback_records
+
+        body = self.client.get('/api/v1/feedbacks/', {'q': '揉弦'}).json()
+        self.assertEqual([row['id'] for row in body['items']], [str(self.feedback.id)])
+        self.assertEqual(self.client.get('/api/v1/feedbacks/', {'q': '钢琴'}).json()['items'], [])
+        exported = filter_feedback_records(FeedbackRecord.objects.all(), {'q': '王晓明'})
+        self.assertEqual(list(exported), [self.feedback])
+
+    def test_punctuation_only_term(self):
+        self.assertEqual(count_queryset(Student.objects.none()), (0, False))
+        for url in ('/api/v1/students/', '/api/v1/reminders/', '/api/v1/feedbacks/'):
+            resp = self.client.get(url, {'search': '!!!'})
+            self.assertEqual(resp.status_code, 200, url)
+
+    def test_rebuild_search_index(self):
+        Student.objects.update(search_tokens='')
+        self.assertFalse(search_queryset(Student.objects.all(), '小提琴').exists())
+        call_command('rebuild_search_index', '--model', 'students.Student', '--only-empty', stdout=StringIO())
+        self.assertEqual(list(search_queryset(Student.objects.all(), '小提琴')), [self.student])
@@ -0,0 +1,26 @@
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.persons.identity import CachedTokenAuthentication
+from .perf import profile_store
+
+
+class PerfProfileView(APIView):
+    """
+    本进程的抽样 SQL 画像（仅管理员；Token 或 Admin 登录会话均可）
+    - GET    /api/_perf/   各端点语句数、数据库耗时、重复语句指纹、最慢语句
+    - DELETE /api/_perf/   清空聚合
+    """
+    authentication_classes = [CachedTokenAuthentication, SessionAuthentication]
+    permission_classes = [IsAdminUser]
+    pagination_class = None
+
+    def get(self, request):
+        return Response({'endpoints': profile_store.snapshot()})
+
+    def delete(self, request):
+        profile_store.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
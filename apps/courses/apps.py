@@ -16,4 +16,4 @@ class CoursesConfig(AppConfig):
         """
         应用准备就绪时的初始化操作
         """
-        pass
\ No newline at end of file
+        from . import signals  # noqa: F401  注册课程树缓存失效信号
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+课程目录批量导入（课程 → 课 → 曲目）
+
+输入统一为 data/course_data_processor.py 输出的“Django 格式”：
+    { 课程名: { 'course': {name, status, description}, 'lessons': [ {name, status, sort_order, description,
+      'pieces': [ {name, status, attribute, is_required, description}, ... ]}, ... ] }, ... }
+也可由清洗格式（{basic_courses, intermediate_courses}，见 data/excel_reader.py）或原始 XLSX 转换得到。
+
+流程：
+1) plan_catalog：每个模型一次查询取回现有（未软删）数据，在内存中按 课程名 / (课程, 课名) / (课, 曲目名) 比对，
+   得到新增、变更、未变化，并校验部分唯一约束（课的排序号、课内曲目名）；
+2) apply_catalog：单个事务内 bulk_create / bulk_update；课排序号变化时先整体挪到临时区间再写回目标值，
+   避免逐行更新时与约束冲突；提交后递增课程树缓存版本（批量写入不触发 post_save 信号）。
+"""
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.core.enums import EnableStatus, PieceAttribute
+from apps.core.tabular import iter_xlsx_sheets
+from .models import Course, Lesson, Piece
+from .tree import bump_tree_version
+
+BULK_BATCH_SIZE = 500
+
+COURSE_FIELDS = ('status', 'description')
+LESSON_FIELDS = ('sort_order', 'status', 'description')
+PIECE_FIELDS = ('status', 'attribute', 'is_required', 'description')
+
+# 清洗格式中的课程分组 → 课程名与描述
+CLEANED_GROUPS = (
+    ('basic_courses', '基础班', '钢琴基础班课程'),
+    ('intermediate_courses', '中级班', '钢琴中级班课程'),
+)
+
+ETUDE_KEYWORDS = ('练习曲', '车尔尼', '莱蒙', '哈农', 'czerny', 'lemoine', 'hanon')
+TECHNIQUE_KEYWORDS = ('音阶', '琶音', '和弦', '八度', '训练', '支撑', '行走')
+
+
+class CatalogError(ValueError):
+    """
+    目录数据不可导入（格式错误或违反唯一约束），message 为逐条问题的汇总
+    """
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__('；'.join(self.problems))
+
+
+def determine_piece_attribute(song_name):
+    """
+    根据曲目名称判断曲目属性（练习曲 / 技术练习 / 默认乐曲）
+    """
+    lowered = song_name.lower()
+    if any(keyword in lowered for keyword in ETUDE_KEYWORDS):
+        return PieceAttribute.ETUDE.value
+    if any(keyword in lowered for keyword in TECHNIQUE_KEYWORDS):
+        return PieceAttribute.TECHNIQUE.value
+    return PieceAttribute.MUSIC.value
+
+
+def catalog_from_cleaned(data):
+    """
+    清洗格式 → Django 格式（基础班曲目属性统一为乐曲，中级班按名称判断，与原处理脚本一致）
+    """
+    catalog = {}
+    for key, course_name, description in CLEANED_GROUPS:
+        lessons = []
+        for sort_order, lesson_data in enumerate(data.get(key) or [], 1):
+            lesson_name = lesson_data['course_number']
+            lessons.append({
+                'name': lesson_name,
+                'status': EnableStatus.ENABLED.value,
+                'sort_order': sort_order,
+                'description': f'{course_name}{lesson_name}',
+                'pieces': [{
+                    'name': song_name,
+                    'status': EnableStatus.ENABLED.value,
+                    'attribute': (PieceAttribute.MUSIC.value if key == 'basic_courses'
+                                  else determine_piece_attribute(song_name)),
+                    'is_required': True,
+                    'description': f'{course_name}{lesson_name}曲目',
+                } for song_name in lesson_data['songs']],
+            })
+        catalog[course_name] = {
+            'course': {'name': course_name, 'status': EnableStatus.ENABLED.value, 'description': description},
+            'lessons': lessons,
+        }
+    return catalog
+
+
+def cleaned_from_xlsx(path):
+    """
+    课程＆曲目列表 XLSX → 清洗格式：前两个工作表依次为基础班、中级班；
+    每行首列为课名，其余非空单元格为曲目
+    """
+    data = {key: [] for key, _, _ in CLEANED_GROUPS}
+    sheets = iter_xlsx_sheets(path)
+    for (key, course_name, _), (_, rows) in zip(CLEANED_GROUPS, sheets):
+        for row in rows[1:]:
+            if not row or not row[0]:
+                continue
+            data[key].append({
+                'course_number': row[0],
+                'course_type': course_name,
+                'songs': [cell for cell in row[1:] if cell],
+            })
+    return data
+
+
+def load_catalog(path):
+    """
+    读取 JSON（清洗格式或 Django 格式）或 XLSX，统一返回 Django 格式
+    """
+    if path.lower().endswith('.xlsx'):
+        return catalog_from_cleaned(cleaned_from_xlsx(path))
+    with open(path, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+    if 'basic_courses' in data or 'intermediate_courses' in data:
+        return catalog_from_cleaned(data)
+    return data
+
+
+def _diff(obj, values, fields):
+    changed = [field for field in fields if getattr(obj, field) != values[field]]
+    for field in changed:
+        setattr(obj, field, values[field])
+    return changed
+
+
+def _validate(catalog):
+    problems = []
+    for course_name, course_info in catalog.items():
+        if len(course_name) > 100:
+            problems.append(f'课程名过长：{course_name}')
+        lesson_names, sort_orders = set(), set()
+        for lesson_info in course_info['lessons']:
+            label = f"{course_name}/{lesson_info['name']}"
+            if lesson_info['name'] in lesson_names:
+                problems.append(f'课名重复：{label}')
+            if lesson_info['sort_order'] in sort_orders:
+                problems.append(f"排序号重复：{label}（{lesson_info['sort_order']}）")
+            if len(lesson_info['name']) > 100:
+                problems.append(f'课名过长：{label}')
+            lesson_names.add(lesson_info['name'])
+            sort_orders.add(lesson_info['sort_order'])
+            piece_names = set()
+            for piece_info in lesson_info['pieces']:
+                if piece_info['name'] in piece_names:
+                    problems.append(f"课内曲目重复：{label}/{piece_info['name']}")
+                if len(piece_info['name']) > 150:
+                    problems.append(f"曲目名过长：{label}/{piece_info['name']}")
+                piece_names.add(piece_info['name'])
+    return problems
+
+
+def plan_catalog(catalog):
+    """
+    与现有目录比对（每个模型一次查询）
+
+    Returns:
+        dict: {'course'|'lesson'|'piece': {'create': [...], 'update': [...], 'unchanged': int},
+               'resort': [需要挪动排序号的现有课], 'problems': [str]}
+    """
+    plan = {model: {'create': [], 'update': [], 'unchanged': 0} for model in ('course', 'lesson', 'piece')}
+    plan['resort'] = []
+    plan['problems'] = _validate(catalog)
+    if plan['problems']:
+        return plan
+
+    courses = {c.name: c for c in Course.objects.filter(deleted_at__isnull=True, name__in=list(catalog))}
+    lessons = {
+        (lesson.course_id, lesson.name): lesson
+        for lesson in Lesson.objects.filter(deleted_at__isnull=True, course__in=list(courses.values()))
+    }
+    pieces = {
+        (piece.lesson_id, piece.name): piece
+        for piece in Piece.objects.filter(deleted_at__isnull=True, lesson__in=list(lessons.values()))
+    }
+
+    touched_lessons = set()
+    targets = defaultdict(dict)  # course_id → {sort_order: 课名}
+    for course_name, course_info in catalog.items():
+        values = course_info['course']
+        course = courses.get(course_name)
+        if course is None:
+            course = Course(name=course_name, **{f: values[f] for f in COURSE_FIELDS})
+            plan['course']['create'].append(course)
+        elif _diff(course, values, COURSE_FIELDS):
+            plan['course']['update'].append(course)
+        else:
+            plan['course']['unchanged'] += 1
+
+        for lesson_info in course_info['lessons']:
+            lesson = lessons.get((course.id, lesson_info['name']))
+            targets[course.id][lesson_info['sort_order']] = lesson_info['name']
+            if lesson is None:
+                lesson = Lesson(course=course, name=lesson_info['name'], **{f: lesson_info[f] for f in LESSON_FIELDS})
+                plan['lesson']['create'].append(lesson)
+            else:
+                touched_lessons.add(lesson.id)
+                changed = _diff(lesson, lesson_info, LESSON_FIELDS)
+                if 'sort_order' in changed:
+                    plan['resort'].append(lesson)
+                if changed:
+                    plan['lesson']['update'].append(lesson)
+                else:
+                    plan['lesson']['unchanged'] += 1
+
+            for piece_info in lesson_info['pieces']:
+                piece = pieces.get((lesson.id, piece_info['name']))
+                if piece is None:
+                    plan['piece']['create'].append(Piece(
+                        course=course, lesson=lesson, name=piece_info['name'],
+                        **{f: piece_info[f] for f in PIECE_FIELDS}
+                    ))
+                elif _diff(piece, piece_info, PIECE_FIELDS):
+                    plan['piece']['update'].append(piece)
+                else:
+                    plan['piece']['unchanged'] += 1
+
+    course_names = {course.id: course.name for course in courses.values()}
+    # 文件中未出现的现有课保持原排序号，不能与导入后的排序号冲突
+    for (course_id, name), lesson in lessons.items():
+        if lesson.id in touched_lessons:
+            continue
+        holder = targets.get(course_id, {}).get(lesson.sort_order)
+        if holder is not None:
+            plan['problems'].append(
+                f'排序号冲突：{course_names[course_id]} 第{lesson.sort_order}位已被未导入的课“{name}”占用'
+                f'（导入的课“{holder}”）'
+            )
+    return plan
+
+
+def apply_catalog(plan):
+    """
+    在单个事务内写入 plan_catalog 的结果
+
+    Returns:
+        dict: 各模型 created / updated / unchanged 计数
+    """
+    if plan['problems']:
+        raise CatalogError(plan['problems'])
+    now = timezone.now()
+    for model in ('course', 'lesson', 'piece'):
+        for obj in plan[model]['update']:
+            obj.updated_at = now
+
+    with transaction.atomic():
+        Course.objects.bulk_create(plan['course']['create'], batch_size=BULK_BATCH_SIZE)
+        Course.objects.bulk_update(plan['course']['update'], [*COURSE_FIELDS, 'updated_at'], batch_size=BULK_BATCH_SIZE)
+
+        if plan['resort']:
+            # 第一步：把要改排序号的课挪到该课程当前最大排序号之后的临时区间
+            final = {lesson.id: lesson.sort_order for lesson in plan['resort']}
+            course_ids = {lesson.course_id for lesson in plan['resort']}
+            ceiling = Lesson.objects.filter(course_id__in=course_ids).aggregate(m=Max('sort_order'))['m'] or 0
+            ceiling = max(ceiling, max(final.values()))
+            for offset, lesson in enumerate(plan['resort'], 1):
+                lesson.sort_order = ceiling + offset
+            Lesson.objects.bulk_update(plan['resort'], ['sort_order'], batch_size=BULK_BATCH_SIZE)
+            # 第二步：随其余变更字段一起写回目标排序号
+            for lesson in plan['resort']:
+                lesson.sort_order = final[lesson.id]
+        Lesson.objects.bulk_update(plan['lesson']['update'], [*LESSON_FIELDS, 'updated_at'], batch_size=BULK_BATCH_SIZE)
+        Lesson.objects.bulk_create(plan['lesson']['create'], batch_size=BULK_BATCH_SIZE)
+
+        Piece.objects.bulk_create(plan['piece']['create'], batch_size=BULK_BATCH_SIZE)
+        Piece.objects.bulk_update(plan['piece']['update'], [*PIECE_FIELDS, 'updated_at'], batch_size=BULK_BATCH_SIZE)
+
+        transaction.on_commit(bump_tree_version)
+    return summarize(plan)
+
+
+def summarize(plan):
+    return {
+        model: {
+            'created': len(plan[model]['create']),
+            'updated': len(plan[model]['update']),
+            'unchanged': plan[model]['unchanged'],
+        }
+        for model in ('course', 'lesson', 'piece')
+    }
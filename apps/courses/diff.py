@@ -0,0 +1,256 @@
+"""
+课程版本快照对比与学员迁移预览
+
+对比（diff_snapshots）：
+- 课、曲目先按 id 匹配，未匹配的再按名称兜底（曲目为“所属课 + 名称”），均为字典查找，整体线性；
+- 课：新增 / 删除 / 改名 / 调序；曲目：新增 / 删除 / 改名 / 换课 / 调序 / attribute、is_required 变化；
+- 调序只报告最少的移动项：匹配项按旧顺序编号后，在新顺序中取最长递增子序列（O(n log n)），
+  不在其中的才算调序，避免插入一课导致后续所有课都被标记。
+结果按两份快照的内容摘要缓存（版本发布后快照不变，等价于按版本对缓存，且内容相同的版本对共享结果）。
+
+迁移预览（migration_preview）：读取缓存的对比结果，学员侧只做聚合查询（不逐个学员加载快照），
+语句数与学员数无关。
+"""
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef
+
+from .snapshots import load_snapshot
+
+DIFF_CACHE_KEY = 'courses:diff:{from_hash}:{to_hash}'
+DIFF_CACHE_TIMEOUT = 60 * 60 * 24
+PREVIEW_SAMPLE_SIZE = 20
+
+
+class VersionDiffError(ValueError):
+    """
+    版本无法对比（未发布或不属于同一课程）
+    """
+
+
+def _match(old_items, new_items, fallback_old, fallback_new):
+    """
+    Returns:
+        tuple(list[tuple], list, list): (匹配对 (old, new)，新增项，删除项)
+    """
+    old_by_id = {item['id']: item for item in old_items}
+    pairs, unmatched = [], []
+    for item in new_items:
+        old = old_by_id.pop(item['id'], None)
+        if old is None:
+            unmatched.append(item)
+        else:
+            pairs.append((old, item))
+
+    by_key = {}
+    for old in reversed([item for item in old_items if item['id'] in old_by_id]):
+        by_key.setdefault(fallback_old(old), []).append(old)
+    added = []
+    for item in unmatched:
+        bucket = by_key.get(fallback_new(item))
+        if bucket:
+            old = bucket.pop()
+            del old_by_id[old['id']]
+            pairs.append((old, item))
+        else:
+            added.append(item)
+    removed = [item for item in old_items if item['id'] in old_by_id]
+    return pairs, added, removed
+
+
+def _moved(pairs, old_position):
+    """
+    Args:
+        pairs: 按新顺序排列的匹配对
+        old_position (dict): 旧项 id → 旧顺序
+
+    Returns:
+        set: 需要报告为调序的旧项 id（不在最长递增子序列中的项）
+    """
+    ranks = [old_position[old['id']] for old, _ in pairs]
+    tails, tail_index, previous = [], [], [None] * len(ranks)
+    for i, rank in enumerate(ranks):
+        j = bisect_left(tails, rank)
+        if j == len(tails):
+            tails.append(rank)
+            tail_index.append(i)
+        else:
+            tails[j] = rank
+            tail_index[j] = i
+        previous[i] = tail_index[j - 1] if j else None
+    keep = set()
+    i = tail_index[-1] if tail_index else None
+    while i is not None:
+        keep.add(i)
+        i = previous[i]
+    return {pairs[i][0]['id'] for i in range(len(pairs)) if i not in keep}
+
+
+def _flatten_pieces(snapshot):
+    return [
+        dict(piece, lesson_id=lesson['id'], lesson_name=lesson['name'])
+        for lesson in snapshot.get('lessons', [])
+        for piece in lesson.get('pieces', [])
+    ]
+
+
+def diff_snapshots(old, new):
+    """
+    Args:
+        old (dict), new (dict): CourseVersion.content_snapshot 结构
+
+    Returns:
+        dict: summary / lessons / pieces 三部分
+    """
+    old_lessons, new_lessons = old.get('lessons', []), new.get('lessons', [])
+    lesson_pairs, lessons_added, lessons_removed = _match(
+        old_lessons, new_lessons, lambda l: l['name'], lambda l: l['name'],
+    )
+    # 匹配对按新顺序排列，便于调序判断
+    new_lesson_order = {lesson['id']: i for i, lesson in enumerate(new_lessons)}
+    lesson_pairs.sort(key=lambda pair: new_lesson_order[pair[1]['id']])
+    old_lesson_order = {lesson['id']: i for i, lesson in enumerate(old_lessons)}
+    moved_lessons = _moved(lesson_pairs, old_lesson_order)
+    # 新课 id → 对应的旧课 id（曲目按“所属课 + 名称”兜底匹配时使用）
+    lesson_map = {new_lesson['id']: old_lesson['id'] for old_lesson, new_lesson in lesson_pairs}
+
+    lessons = {
+        'added': [{'id': l['id'], 'name': l['name'], 'sort_order': l['sort_order']} for l in lessons_added],
+        'removed': [{'id': l['id'], 'name': l['name'], 'sort_order': l['sort_order']} for l in lessons_removed],
+        'renamed': [
+            {'id': n['id'], 'from': o['name'], 'to': n['name']}
+            for o, n in lesson_pairs if o['name'] != n['name']
+        ],
+        'reordered': [
+            {'id': n['id'], 'name': n['name'], 'from': o['sort_order'], 'to': n['sort_order']}
+            for o, n in lesson_pairs if o['id'] in moved_lessons
+        ],
+    }
+
+    old_pieces, new_pieces = _flatten_pieces(old), _flatten_pieces(new)
+    piece_pairs, pieces_added, pieces_removed = _match(
+        old_pieces, new_pieces,
+        lambda p: (p['lesson_id'], p['name']),
+        lambda p: (lesson_map.get(p['lesson_id']), p['name']),
+    )
+    new_piece_order = {piece['id']: i for i, piece in enumerate(new_pieces)}
+    piece_pairs.sort(key=lambda pair: new_piece_order[pair[1]['id']])
+
+    renamed, moved, changed, same_lesson = [], [], [], {}
+    for o, n in piece_pairs:
+        if o['name'] != n['name']:
+            renamed.append({'id': n['id'], 'from': o['name'], 'to': n['name']})
+        if lesson_map.get(n['lesson_id']) != o['lesson_id']:
+            moved.append({'id': n['id'], 'name': n['name'], 'from': o['lesson_name'], 'to': n['lesson_name']})
+        else:
+            same_lesson.setdefault(n['lesson_id'], []).append((o, n))
+        for field in ('attribute', 'is_required'):
+            if o.get(field) != n.get(field):
+                changed.append({'id': n['id'], 'name': n['name'], 'field': field, 'from': o.get(field), 'to': n.get(field)})
+    old_piece_order = {piece['id']: i for i, piece in enumerate(old_pieces)}
+    reordered = []
+    for pairs in same_lesson.values():
+        moved_ids = _moved(pairs, old_piece_order)
+        reordered.extend(
+            {'id': n['id'], 'name': n['name'], 'lesson': n['lesson_name']} for o, n in pairs if o['id'] in moved_ids
+        )
+
+    pieces = {
+        'added': [{'id': p['id'], 'name': p['name'], 'lesson': p['lesson_name']} for p in pieces_added],
+        'removed': [{'id': p['id'], 'name': p['name'], 'lesson': p['lesson_name']} for p in pieces_removed],
+        'renamed': renamed,
+        'moved': moved,
+        'reordered': reordered,
+        'changed': changed,
+    }
+    return {
+        'summary': {
+            'lessons': {key: len(value) for key, value in lessons.items()},
+            'pieces': {key: len(value) for key, value in pieces.items()},
+        },
+        'lessons': lessons,
+        'pieces': pieces,
+    }
+
+
+def diff_versions(from_version, to_version):
+    """
+    对比两个已发布版本（from → to），结果按快照摘要缓存
+
+    Raises:
+        VersionDiffError: 任一版本未发布
+    """
+    if from_version.snapshot_id is None or to_version.snapshot_id is None:
+        raise VersionDiffError('版本尚未发布，没有内容快照')
+    key = DIFF_CACHE_KEY.format(from_hash=from_version.snapshot.content_hash,
+                                to_hash=to_version.snapshot.content_hash)
+    result = cache.get(key)
+    if result is None:
+        result = diff_snapshots(load_snapshot(from_version.snapshot), load_snapshot(to_version.snapshot))
+        cache.set(key, result, timeout=DIFF_CACHE_TIMEOUT)
+    return dict(result, from_version=str(from_version.id), to_version=str(to_version.id))
+
+
+def migration_preview(from_version, to_version, sample_size=PREVIEW_SAMPLE_SIZE):
+    """
+    预览把 from_version 上的有效课程记录批量迁移到 to_version 的影响（只读）
+
+    Returns:
+        dict: 待迁移记录数/学员数、按学习状态分布、已在目标版本的学员数、
+              已点评但在目标版本中被删除的曲目及涉及学员、样例记录、版本对比摘要
+
+    Raises:
+        VersionDiffError: 未发布或不属于同一课程
+    """
+    from apps.core.enums import RecordStatus
+    from apps.evaluations.models import StudentPieceStatus
+    from apps.students.models import CourseRecord
+
+    if from_version.course_id != to_version.course_id:
+        raise VersionDiffError('两个版本不属于同一课程')
+    diff = diff_versions(from_version, to_version)
+
+    records = CourseRecord.objects.filter(
+        course_version=from_version, deleted_at__isnull=True, record_status=RecordStatus.ACTIVE,
+    )
+    student_ids = records.values('student_id')
+    by_status = dict(records.order_by().values_list('course_status').annotate(n=Count('id')))
+    totals = records.aggregate(records=Count('id'), students=Count('student_id', distinct=True))
+    already_on_target = records.filter(Exists(CourseRecord.objects.filter(
+        student_id=OuterRef('student_id'), course_version=to_version,
+        deleted_at__isnull=True, record_status=RecordStatus.ACTIVE,
+    ))).aggregate(n=Count('student_id', distinct=True))['n']
+
+    removed_ids = [piece['id'] for piece in diff['pieces']['removed']]
+    removed_names = {piece['id']: piece['name'] for piece in diff['pieces']['removed']}
+    reviewed_removed = []
+    affected_students = 0
+    if removed_ids:
+        statuses = StudentPieceStatus.objects.filter(
+            student_id__in=student_ids, piece_id__in=removed_ids, deleted_at__isnull=True,
+        )
+        affected_students = statuses.aggregate(n=Count('student_id', distinct=True))['n']
+        reviewed_removed = [
+            {'piece_id': str(piece_id), 'name': removed_names.get(str(piece_id)), 'students': n}
+            for piece_id, n in statuses.order_by().values_list('piece_id').annotate(n=Count('student_id', distinct=True))
+        ]
+        reviewed_removed.sort(key=lambda row: -row['students'])
+
+    sample = [
+        {'record_id': str(pk), 'student_id': str(student_id), 'nickname': nickname, 'course_status': course_status}
+        for pk, student_id, nickname, course_status in records.order_by('student__nickname', 'id')
+        .values_list('id', 'student_id', 'student__nickname', 'course_status')[:sample_size]
+    ]
+    return {
+        'from_version': diff['from_version'],
+        'to_version': diff['to_version'],
+        'records': totals['records'],
+        'students': totals['students'],
+        'by_course_status': by_status,
+        'already_on_target': already_on_target,
+        'students_with_removed_reviewed_pieces': affected_students,
+        'removed_reviewed_pieces': reviewed_removed,
+        'diff_summary': diff['summary'],
+        'sample': sample,
+    }
@@ -0,0 +1,45 @@
+"""
+批量导入课程目录（课程 → 课 → 曲目）
+
+用法：
+  python manage.py import_catalog data/django_course_data.json
+  python manage.py import_catalog data/cleaned_course_data.json --dry-run
+  python manage.py import_catalog "data/【基础班＋中级班】课程＆曲目列表（20250908）.xlsx"
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.courses.catalog import apply_catalog, load_catalog, plan_catalog, summarize
+
+MODEL_LABELS = (('course', '课程'), ('lesson', '课'), ('piece', '曲目'))
+
+
+class Command(BaseCommand):
+    help = '从 JSON / XLSX 批量导入课程目录：内存比对后单事务批量新增、更新'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='目录文件（清洗格式或 Django 格式 JSON，或课程＆曲目列表 XLSX）')
+        parser.add_argument('--dry-run', action='store_true', help='只比对并输出报告，不写入数据库')
+
+    def handle(self, *args, **options):
+        try:
+            catalog = load_catalog(options['path'])
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'读取目录文件失败：{exc}')
+
+        plan = plan_catalog(catalog)
+        for problem in plan['problems']:
+            self.stderr.write(self.style.ERROR(problem))
+        if plan['problems']:
+            raise CommandError(f"目录数据有 {len(plan['problems'])} 处问题，未导入")
+
+        summary = summarize(plan) if options['dry_run'] else apply_catalog(plan)
+        self.stdout.write(f"{'模型':<6}{'新增':>8}{'更新':>8}{'未变化':>8}")
+        for model, label in MODEL_LABELS:
+            row = summary[model]
+            self.stdout.write(f"{label:<6}{row['created']:>8}{row['updated']:>8}{row['unchanged']:>8}")
+        if plan['resort']:
+            self.stdout.write(f"其中调整排序号的课：{len(plan['resort'])}")
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('dry-run：未写入数据库'))
+        else:
+            self.stdout.write(self.style.SUCCESS('课程目录导入完成'))
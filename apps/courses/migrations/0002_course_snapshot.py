@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:11
+
+import ast
+import hashlib
+import json
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.courses.snapshots import canonical_json, compress
+
+
+def _parse_legacy(text):
+    # 旧版 release() 把 dict 直接赋给 TextField，存下的是 Python repr；也兼容 JSON 文本
+    try:
+        return json.loads(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def move_snapshots(apps, schema_editor):
+    CourseSnapshot = apps.get_model('courses', 'CourseSnapshot')
+    CourseVersion = apps.get_model('courses', 'CourseVersion')
+    versions = CourseVersion.objects.exclude(content_snapshot__isnull=True).exclude(content_snapshot='')
+    for version in versions.only('id', 'content_snapshot').iterator():
+        try:
+            data = _parse_legacy(version.content_snapshot)
+        except (ValueError, SyntaxError):
+            continue
+        body = canonical_json(data)
+        snapshot, _ = CourseSnapshot.objects.get_or_create(
+            content_hash=hashlib.sha256(body).hexdigest(),
+            defaults={'data': compress(body), 'raw_size': len(body)},
+        )
+        CourseVersion.objects.filter(pk=version.pk).update(snapshot=snapshot)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('content_hash', models.CharField(help_text='规范化 JSON 的 SHA-256', max_length=64, unique=True, verbose_name='内容摘要')),
+                ('data', models.BinaryField(help_text='gzip 压缩的规范化 JSON', verbose_name='压缩内容')),
+                ('raw_size', models.PositiveIntegerField(default=0, help_text='压缩前的字节数', verbose_name='原始大小')),
+            ],
+            options={
+                'verbose_name': '课程内容快照',
+                'verbose_name_plural': '课程内容快照',
+                'db_table': 'courses_course_snapshot',
+            },
+        ),
+        migrations.AddField(
+            model_name='courseversion',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, help_text='版本发布时的内容快照，用于历史回查', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='course_versions', to='courses.coursesnapshot', verbose_name='内容快照'),
+        ),
+        migrations.RunPython(move_snapshots, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='courseversion',
+            name='content_snapshot',
+        ),
+    ]
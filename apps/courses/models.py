@@ -6,7 +6,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
-from apps.core.models import AuditModel, SoftDeleteModel
+from apps.core.models import AuditModel, BaseModel, SoftDeleteModel
 from apps.core.enums import EnableStatus, LessonCategory, LessonFocus, PieceAttribute
 
 
@@ -432,6 +432,44 @@ class Piece(AuditModel):
                 })
 
 
+class CourseSnapshot(BaseModel):
+    """
+    课程内容快照（不可变，按内容去重）
+    
+    字段说明：
+    - content_hash: 规范化 JSON 的 SHA-256 摘要，内容相同的快照只存一份
+    - data: gzip 压缩后的规范化 JSON
+    - raw_size: 压缩前字节数
+    构建与读写见 apps/courses/snapshots.py
+    """
+    
+    content_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name='内容摘要',
+        help_text='规范化 JSON 的 SHA-256'
+    )
+    
+    data = models.BinaryField(
+        verbose_name='压缩内容',
+        help_text='gzip 压缩的规范化 JSON'
+    )
+    
+    raw_size = models.PositiveIntegerField(
+        default=0,
+        verbose_name='原始大小',
+        help_text='压缩前的字节数'
+    )
+    
+    class Meta:
+        db_table = 'courses_course_snapshot'
+        verbose_name = '课程内容快照'
+        verbose_name_plural = '课程内容快照'
+    
+    def __str__(self):
+        return self.content_hash[:12]
+
+
 class CourseVersion(AuditModel):
     """
     课程版本模型
@@ -442,7 +480,7 @@ class CourseVersion(AuditModel):
     - version_label: 版本标签，如"2024版"
     - status: 版本状态
     - released_at: 发布时间
-    - content_snapshot: 内容快照（JSON格式存储）
+    - snapshot: 发布时生成的内容快照（CourseSnapshot，压缩存储并按内容去重）
     """
     
     course = models.ForeignKey(
@@ -474,11 +512,14 @@ class CourseVersion(AuditModel):
         help_text='版本的正式发布时间'
     )
     
-    content_snapshot = models.TextField(
+    snapshot = models.ForeignKey(
+        CourseSnapshot,
+        on_delete=models.PROTECT,
         null=True,
         blank=True,
+        related_name='course_versions',
         verbose_name='内容快照',
-        help_text='版本内容的JSON快照，用于历史回查'
+        help_text='版本发布时的内容快照，用于历史回查'
     )
     
     class Meta:
@@ -521,48 +562,21 @@ class CourseVersion(AuditModel):
         设置发布时间并生成内容快照
         """
         from django.utils import timezone
-        import json
+        from .snapshots import build_snapshot_data, store_snapshot
         
         if not self.is_released():
             self.released_at = timezone.now()
-            # 生成内容快照
-            self.content_snapshot = self._generate_content_snapshot()
+            # 生成内容快照（与已有快照内容相同时复用同一行）
+            self.snapshot = store_snapshot(build_snapshot_data(self.course))
             self.save()
     
-    def _generate_content_snapshot(self):
-        """
-        生成版本内容快照（JSON结构），用于历史回查
-        按最小化文档要求，不包含 Lesson 的 category、focus（它们在 LessonVersion 中）
-        """
-        data = {
-            'course': {
-                'id': str(self.course.id),
-                'name': self.course.name,
-                'status': self.course.status,
-                'description': self.course.description,
-            },
-            'lessons': []
-        }
-        lessons = Lesson.objects.filter(course=self.course, deleted_at__isnull=True).order_by('sort_order')
-        for lesson in lessons:
-            lesson_entry = {
-                'id': str(lesson.id),
-                'name': lesson.name,
-                'sort_order': lesson.sort_order,
-                'description': lesson.description,
-                'pieces': []
-            }
-            pieces = Piece.objects.filter(lesson=lesson, deleted_at__isnull=True).order_by('name')
-            for piece in pieces:
-                lesson_entry['pieces'].append({
-                    'id': str(piece.id),
-                    'name': piece.name,
-                    'attribute': piece.attribute,
-                    'is_required': piece.is_required,
-                    'description': piece.description
-                })
-            data['lessons'].append(lesson_entry)
-        return data
+    @property
+    def content_snapshot(self):
+        """
+        解压后的内容快照（dict），未发布时为 None
+        """
+        from .snapshots import load_snapshot
+        return load_snapshot(self.snapshot)
 
 
 class LessonVersion(AuditModel):
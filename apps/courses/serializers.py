@@ -6,13 +6,29 @@ from rest_framework import serializers
 from .models import Course, Lesson, Piece, CourseVersion, LessonVersion
 
 
+class AnnotatedCountField(serializers.ReadOnlyField):
+    """
+    计数字段：优先读取查询集注解（列表接口一次聚合得到），
+    缺失时（如单对象创建/更新后返回）回退调用模型方法
+    """
+    def __init__(self, method_name, **kwargs):
+        self.method_name = method_name
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        value = getattr(instance, self.field_name, None)
+        if value is not None:
+            return value
+        return getattr(instance, self.method_name)()
+
+
 class CourseSerializer(serializers.ModelSerializer):
     """
     课程序列化器
     """
-    lesson_count = serializers.ReadOnlyField(source='get_lesson_count')
-    piece_count = serializers.ReadOnlyField(source='get_piece_count')
-    required_piece_count = serializers.ReadOnlyField(source='get_required_piece_count')
+    lesson_count = AnnotatedCountField('get_lesson_count')
+    piece_count = AnnotatedCountField('get_piece_count')
+    required_piece_count = AnnotatedCountField('get_required_piece_count')
     
     class Meta:
         model = Course
@@ -29,8 +45,8 @@ class LessonSerializer(serializers.ModelSerializer):
     课序列化器
     """
     course_name = serializers.ReadOnlyField(source='course.name')
-    piece_count = serializers.ReadOnlyField(source='get_piece_count')
-    required_piece_count = serializers.ReadOnlyField(source='get_required_piece_count')
+    piece_count = AnnotatedCountField('get_piece_count')
+    required_piece_count = AnnotatedCountField('get_required_piece_count')
     
     class Meta:
         model = Lesson
@@ -66,13 +82,24 @@ class CourseVersionSerializer(serializers.ModelSerializer):
     课程版本序列化器
     """
     course_name = serializers.ReadOnlyField(source='course.name')
-    is_released = serializers.ReadOnlyField(source='is_released')
+    is_released = serializers.ReadOnlyField()
+    snapshot_hash = serializers.ReadOnlyField(source='snapshot.content_hash')
+    snapshot_size = serializers.ReadOnlyField(source='snapshot.raw_size')
+    # 快照内容较大：仅当 context['include_snapshot'] 为真时输出，否则使用 snapshot 动作单独获取
+    content_snapshot = serializers.ReadOnlyField()
     
     class Meta:
         model = CourseVersion
         fields = [
             'id', 'course', 'course_name', 'version_label', 'status',
-            'released_at', 'is_released', 'content_snapshot',
+            'released_at', 'is_released', 'snapshot_hash', 'snapshot_size', 'content_snapshot',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'is_released', 'content_snapshot', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'is_released', 'snapshot_hash', 'snapshot_size', 'content_snapshot',
+                            'created_at', 'updated_at']
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get('include_snapshot'):
+            fields.pop('content_snapshot')
+        return fields
\ No newline at end of file
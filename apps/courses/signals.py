@@ -0,0 +1,23 @@
+"""
+课程应用信号
+课程结构（Course/Lesson/Piece）变更后使课程树缓存失效
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Course, Lesson, Piece
+from .tree import bump_tree_version
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=Piece)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=Piece)
+def invalidate_course_tree(sender, **kwargs):
+    """
+    提交后再递增版本号，避免其他请求在事务提交前用旧数据重建新版本的缓存
+    """
+    transaction.on_commit(bump_tree_version)
@@ -0,0 +1,97 @@
+"""
+课程版本内容快照：构建、规范化、压缩与去重存储
+
+- build_snapshot_data：课、曲目各查询一次，在内存中按课分组（与课程树构建方式一致）；
+- 规范化 JSON（键排序、紧凑分隔符）后取 SHA-256 作为内容摘要，gzip 压缩存入 CourseSnapshot，
+  摘要唯一：内容相同的快照（如未改动的课程再次发版）只存一份；
+- 压缩固定 mtime=0，相同内容得到相同字节，可直接作为 Content-Encoding: gzip 的响应体下发。
+"""
+import gzip
+import hashlib
+import json
+
+from .models import CourseSnapshot, Lesson, Piece
+
+COMPRESS_LEVEL = 6
+
+
+def build_snapshot_data(course):
+    """
+    Args:
+        course (Course): 课程（已加载，不再额外查询）
+
+    Returns:
+        dict: {'course': {...}, 'lessons': [{..., 'pieces': [...]}]}，按最小化文档要求不含课的 category、focus
+    """
+    lessons = (
+        Lesson.objects.filter(course=course, deleted_at__isnull=True)
+        .order_by('sort_order')
+        .values('id', 'name', 'sort_order', 'description')
+    )
+    pieces = (
+        Piece.objects.filter(lesson__course=course, deleted_at__isnull=True, lesson__deleted_at__isnull=True)
+        .order_by('name')
+        .values('id', 'lesson_id', 'name', 'attribute', 'is_required', 'description')
+    )
+    entries, pieces_by_lesson = [], {}
+    for lesson in lessons:
+        entry = {
+            'id': str(lesson['id']),
+            'name': lesson['name'],
+            'sort_order': lesson['sort_order'],
+            'description': lesson['description'],
+            'pieces': [],
+        }
+        entries.append(entry)
+        pieces_by_lesson[lesson['id']] = entry['pieces']
+    for piece in pieces:
+        pieces_by_lesson[piece['lesson_id']].append({
+            'id': str(piece['id']),
+            'name': piece['name'],
+            'attribute': piece['attribute'],
+            'is_required': piece['is_required'],
+            'description': piece['description'],
+        })
+    return {
+        'course': {
+            'id': str(course.id),
+            'name': course.name,
+            'status': course.status,
+            'description': course.description,
+        },
+        'lessons': entries,
+    }
+
+
+def canonical_json(data):
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def compress(body):
+    return gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+
+def store_snapshot(data):
+    """
+    按内容摘要去重保存
+
+    Returns:
+        CourseSnapshot
+    """
+    body = canonical_json(data)
+    content_hash = hashlib.sha256(body).hexdigest()
+    snapshot, _ = CourseSnapshot.objects.get_or_create(
+        content_hash=content_hash,
+        defaults={'data': compress(body), 'raw_size': len(body)},
+    )
+    return snapshot
+
+
+def load_snapshot(snapshot):
+    """
+    Returns:
+        dict|None
+    """
+    if snapshot is None:
+        return None
+    return json.loads(gzip.decompress(bytes(snapshot.data)))
@@ -0,0 +1,358 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.core.enums import EnableStatus, PieceAttribute
+from . import catalog, tree
+from .diff import diff_snapshots
+from .models import Course, CourseSnapshot, CourseVersion, Lesson, Piece
+from .snapshots import build_snapshot_data
+
+
+def make_course(name, lessons=2, pieces_per_lesson=3):
+    course = Course.objects.create(name=name)
+    for i in range(1, lessons + 1):
+        lesson = Lesson.objects.create(course=course, name=f'第{i}课', sort_order=i)
+        for j in range(pieces_per_lesson):
+            Piece.objects.create(
+                lesson=lesson,
+                name=f'曲目{j}',
+                attribute=PieceAttribute.ETUDE,
+                is_required=(j % 2 == 0),
+            )
+    return course
+
+
+class CourseCountAnnotationTests(APITestCase):
+    """
+    课程/课列表的计数字段由注解一次聚合得到，查询数不随行数增长
+    """
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, {'page_size': 100})
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), resp.data['results']
+
+    def test_course_list_counts(self):
+        course = make_course('基础班', lessons=2, pieces_per_lesson=3)
+        Lesson.objects.create(course=course, name='停用课', sort_order=9, status=EnableStatus.DISABLED)
+        small, rows = self._count_queries('/api/courses/')
+        row = rows[0]
+        self.assertEqual(row['lesson_count'], course.get_lesson_count())
+        self.assertEqual(row['piece_count'], course.get_piece_count())
+        self.assertEqual(row['required_piece_count'], course.get_required_piece_count())
+        self.assertEqual((row['lesson_count'], row['piece_count'], row['required_piece_count']), (2, 6, 4))
+
+        for i in range(10):
+            make_course(f'课程{i}')
+        large, rows = self._count_queries('/api/courses/')
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(small, large)
+
+    def test_lesson_list_counts(self):
+        course = make_course('中级班', lessons=1, pieces_per_lesson=3)
+        small, rows = self._count_queries('/api/courses/lessons/')
+        lesson = course.lessons.get()
+        self.assertEqual(rows[0]['piece_count'], lesson.get_piece_count())
+        self.assertEqual(rows[0]['required_piece_count'], lesson.get_required_piece_count())
+
+        make_course('高级班', lessons=12, pieces_per_lesson=2)
+        large, rows = self._count_queries('/api/courses/lessons/')
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(small, large)
+
+    def test_create_falls_back_to_model_methods(self):
+        resp = self.client.post('/api/courses/', {'name': '新课程'}, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data['lesson_count'], 0)
+        self.assertEqual(resp.data['piece_count'], 0)
+
+
+class CourseTreeTests(APITestCase):
+    """
+    课程树接口：一次返回完整层级，按版本缓存并支持 ETag 协商
+    """
+
+    def setUp(self):
+        cache.clear()
+        tree._local_tree.update(version=None, etag=None, data=None)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course = make_course('基础班', lessons=2, pieces_per_lesson=2)
+            Lesson.objects.create(course=self.course, name='停用课', sort_order=9, status=EnableStatus.DISABLED)
+
+    def test_tree_shape(self):
+        resp = self.client.get('/api/courses/tree/')
+        self.assertEqual(resp.status_code, 200)
+        courses = resp.data['courses']
+        self.assertEqual(len(courses), 1)
+        self.assertEqual([l['sort_order'] for l in courses[0]['lessons']], [1, 2])
+        self.assertEqual(len(courses[0]['lessons'][0]['pieces']), 2)
+        self.assertTrue(resp['ETag'])
+
+    def test_warm_cache_and_not_modified(self):
+        etag = self.client.get('/api/courses/tree/')['ETag']
+        with self.assertNumQueries(0):
+            resp = self.client.get('/api/courses/tree/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_save_bumps_version(self):
+        etag = self.client.get('/api/courses/tree/')['ETag']
+        lesson = self.course.lessons.get(sort_order=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Piece.objects.create(lesson=lesson, name='新曲目', attribute=PieceAttribute.MUSIC)
+        resp = self.client.get('/api/courses/tree/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp['ETag'], etag)
+        self.assertEqual(len(resp.data['courses'][0]['lessons'][0]['pieces']), 3)
+
+
+class CatalogImportTests(APITestCase):
+    """
+    课程目录批量导入：内存比对、批量写入、排序号约束与 dry-run
+    """
+
+    def _cleaned(self, basic):
+        return {'basic_courses': [
+            {'course_number': name, 'course_type': '基础班', 'songs': songs} for name, songs in basic
+        ], 'intermediate_courses': []}
+
+    def _import(self, basic):
+        with self.captureOnCommitCallbacks(execute=True):
+            return catalog.apply_catalog(catalog.plan_catalog(catalog.catalog_from_cleaned(self._cleaned(basic))))
+
+    def test_import_then_reimport_is_noop(self):
+        basic = [('第一课', ['小星星', '欢乐颂']), ('第二课', ['车尔尼599第1条'])]
+        result = self._import(basic)
+        self.assertEqual(result['lesson']['created'], 2)
+        self.assertEqual(result['piece']['created'], 3)
+        self.assertEqual(Piece.objects.get(name='小星星').course.name, '基础班')
+
+        with self.assertNumQueries(3):
+            plan = catalog.plan_catalog(catalog.catalog_from_cleaned(self._cleaned(basic)))
+        self.assertEqual(catalog.summarize(plan)['piece'], {'created': 0, 'updated': 0, 'unchanged': 3})
+
+    def test_insert_lesson_before_existing_shifts_sort_order(self):
+        self._import([('第一课', ['小星星']), ('第二课', ['欢乐颂'])])
+        etag = self.client.get('/api/courses/tree/')['ETag']
+        result = self._import([('零基础课', ['玛丽有只小羔羊']), ('第一课', ['小星星']), ('第二课', ['欢乐颂'])])
+        self.assertEqual((result['lesson']['created'], result['lesson']['updated']), (1, 2))
+        self.assertEqual(
+            list(Lesson.objects.order_by('sort_order').values_list('name', flat=True)),
+            ['零基础课', '第一课', '第二课'],
+        )
+        # 批量写入后课程树缓存同样失效
+        self.assertNotEqual(self.client.get('/api/courses/tree/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_sort_order_taken_by_untouched_lesson(self):
+        course = Course.objects.create(name='基础班')
+        Lesson.objects.create(course=course, name='旧课', sort_order=2)
+        plan = catalog.plan_catalog(catalog.catalog_from_cleaned(self._cleaned([('第一课', []), ('第二课', [])])))
+        self.assertEqual(len(plan['problems']), 1)
+        with self.assertRaises(catalog.CatalogError):
+            catalog.apply_catalog(plan)
+
+    def test_command_dry_run(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as fh:
+            json.dump(self._cleaned([('第一课', ['小星星', '小星星'])]), fh, ensure_ascii=False)
+        with self.assertRaises(CommandError):
+            call_command('import_catalog', fh.name, stdout=io.StringIO(), stderr=io.StringIO())
+
+        with open(fh.name, 'w', encoding='utf-8') as out:
+            json.dump(self._cleaned([('第一课', ['小星星'])]), out, ensure_ascii=False)
+        stdout = io.StringIO()
+        call_command('import_catalog', fh.name, '--dry-run', stdout=stdout)
+        self.assertIn('dry-run', stdout.getvalue())
+        self.assertFalse(Course.objects.exists())
+        os.remove(fh.name)
+
+
+class CourseVersionSnapshotTests(APITestCase):
+    """
+    版本快照：两次查询构建、压缩去重存储；列表默认不含快照，snapshot 动作支持 ETag 与 gzip 直出
+    """
+
+    def setUp(self):
+        self.course = make_course('基础班', lessons=2, pieces_per_lesson=2)
+        self.first = CourseVersion.objects.create(course=self.course, version_label='2024版')
+        self.second = CourseVersion.objects.create(course=self.course, version_label='2025版')
+
+    def test_build_in_two_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            data = build_snapshot_data(self.course)
+        self.assertEqual([len(lesson['pieces']) for lesson in data['lessons']], [2, 2])
+        Lesson.objects.create(course=self.course, name='第3课', sort_order=3)
+        with CaptureQueriesContext(connection) as large:
+            build_snapshot_data(self.course)
+        self.assertEqual(len(small.captured_queries), 2)
+        self.assertEqual(len(large.captured_queries), 2)
+
+    def test_identical_snapshots_stored_once(self):
+        self.first.release()
+        self.second.release()
+        self.assertEqual(self.first.snapshot_id, self.second.snapshot_id)
+        self.assertEqual(CourseSnapshot.objects.count(), 1)
+        self.assertEqual(self.second.content_snapshot['course']['name'], '基础班')
+
+        third = CourseVersion.objects.create(course=self.course, version_label='2026版')
+        Piece.objects.filter(lesson__course=self.course).first().delete()
+        third.release()
+        self.assertNotEqual(third.snapshot_id, self.first.snapshot_id)
+
+    def test_list_omits_snapshot(self):
+        self.first.release()
+        row = self.client.get('/api/courses/versions/').json()['results'][0]
+        self.assertNotIn('content_snapshot', row)
+        self.assertTrue(row['snapshot_hash'])
+        row = self.client.get('/api/courses/versions/', {'include_snapshot': 1}).json()['results'][0]
+        self.assertEqual(len(row['content_snapshot']['lessons']), 2)
+
+    def test_snapshot_action(self):
+        url = f'/api/courses/versions/{self.first.id}/snapshot/'
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.post(f'/api/courses/versions/{self.first.id}/release/')
+
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.content)['course']['name'], '基础班')
+        zipped = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(zipped.content), resp.content)
+
+        with CaptureQueriesContext(connection) as ctx:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertFalse(any('courses_course_snapshot"."data"' in q['sql'] for q in ctx.captured_queries))
+
+
+def _lesson(lesson_id, name, sort_order, pieces=()):
+    return {'id': lesson_id, 'name': name, 'sort_order': sort_order, 'pieces': list(pieces)}
+
+
+def _piece(piece_id, name, attribute='etude', is_required=True):
+    return {'id': piece_id, 'name': name, 'attribute': attribute, 'is_required': is_required}
+
+
+class SnapshotDiffTests(APITestCase):
+    """
+    版本对比：id 优先、名称兜底匹配；调序只报告最少移动项；接口结果缓存；迁移预览查询数与学员数无关
+    """
+
+    def test_diff_snapshots(self):
+        old = {'lessons': [
+            _lesson('l1', '第1课', 1, [_piece('p1', '音阶'), _piece('p2', '琶音'), _piece('p3', '练习曲一')]),
+            _lesson('l2', '第2课', 2, [_piece('p4', '小步舞曲')]),
+            _lesson('l3', '第3课', 3),
+            _lesson('l4', '第4课', 4),
+        ]}
+        new = {'lessons': [
+            _lesson('l2', '第二课', 1, [_piece('p4', '小步舞曲', is_required=False), _piece('p2', '琶音')]),
+            _lesson('l1', '第1课', 2, [_piece('p3', '练习曲1'), _piece('x1', '音阶')]),
+            _lesson('l3', '第3课', 3, [_piece('p9', '新曲')]),
+            # 重建的课（id 不同）按名称兜底匹配
+            _lesson('x4', '第4课', 4),
+        ]}
+        result = diff_snapshots(old, new)
+        lessons, pieces = result['lessons'], result['pieces']
+        self.assertEqual(lessons['added'], [])
+        self.assertEqual(lessons['removed'], [])
+        self.assertEqual(lessons['renamed'], [{'id': 'l2', 'from': '第2课', 'to': '第二课'}])
+        self.assertEqual([row['id'] for row in lessons['reordered']], ['l2'])
+
+        self.assertEqual([row['id'] for row in pieces['added']], ['p9'])
+        self.assertEqual(pieces['removed'], [])
+        self.assertEqual(pieces['renamed'], [{'id': 'p3', 'from': '练习曲一', 'to': '练习曲1'}])
+        self.assertEqual(pieces['moved'], [{'id': 'p2', 'name': '琶音', 'from': '第1课', 'to': '第二课'}])
+        self.assertEqual([row['id'] for row in pieces['reordered']], ['p3'])
+        self.assertEqual(pieces['changed'], [
+            {'id': 'p4', 'name': '小步舞曲', 'field': 'is_required', 'from': True, 'to': False},
+        ])
+        self.assertEqual(result['summary']['pieces']['added'], 1)
+
+    def test_insert_does_not_mark_following_lessons(self):
+        old = {'lessons': [_lesson(f'l{i}', f'第{i}课', i) for i in range(1, 6)]}
+        new = {'lessons': [_lesson('l0', '导论', 1)] + [_lesson(f'l{i}', f'第{i}课', i + 1) for i in range(1, 6)]}
+        result = diff_snapshots(old, new)
+        self.assertEqual([row['id'] for row in result['lessons']['added']], ['l0'])
+        self.assertEqual(result['lessons']['reordered'], [])
+
+    def _versions(self):
+        course = make_course('基础班', lessons=2, pieces_per_lesson=2)
+        old = CourseVersion.objects.create(course=course, version_label='2024版')
+        old.release()
+        removed = Piece.objects.filter(lesson__course=course).order_by('lesson__sort_order', 'name').first()
+        removed.delete()
+        lesson = Lesson.objects.get(course=course, sort_order=2)
+        lesson.name = '第2课（新）'
+        lesson.save()
+        new = CourseVersion.objects.create(course=course, version_label='2025版')
+        new.release()
+        return course, old, new, removed
+
+    def test_diff_action_cached(self):
+        cache.clear()
+        _, old, new, removed = self._versions()
+        url = f'/api/courses/versions/{new.id}/diff/'
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'against': 'bad'}).status_code, 404)
+
+        resp = self.client.get(url, {'against': old.id})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['from_version'], str(old.id))
+        self.assertEqual([row['id'] for row in resp.data['pieces']['removed']], [str(removed.id)])
+        self.assertEqual(resp.data['summary']['lessons']['renamed'], 1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, {'against': old.id})
+        self.assertFalse(any('courses_course_snapshot"."data"' in q['sql'] for q in ctx.captured_queries))
+
+        draft = CourseVersion.objects.create(course=old.course, version_label='草稿')
+        self.assertEqual(self.client.get(url, {'against': draft.id}).status_code, 400)
+
+    def test_migration_preview(self):
+        from apps.core.enums import RecordStatus
+        from apps.evaluations.models import StudentPieceStatus
+        from apps.students.models import CourseRecord, Student
+
+        cache.clear()
+        course, old, new, removed = self._versions()
+        url = f'/api/courses/versions/{old.id}/migration-preview/'
+
+        def enroll(count, start=0):
+            for i in range(start, start + count):
+                student = Student.objects.create(xiaoetong_id=f'mig-{i}', nickname=f'学员{i}')
+                CourseRecord.objects.create(student=student, course=course, course_version=old, start_at=timezone.now())
+                if i % 2 == 0:
+                    StudentPieceStatus.objects.create(student=student, piece=removed, review_count=1)
+
+        enroll(2)
+        closed = Student.objects.create(xiaoetong_id='mig-closed', nickname='已结课')
+        CourseRecord.objects.create(student=closed, course=course, course_version=old,
+                                    start_at=timezone.now(), record_status=RecordStatus.CLOSED)
+        self.client.get(url, {'to': new.id})
+        with CaptureQueriesContext(connection) as small:
+            resp = self.client.get(url, {'to': new.id})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['records'], 2)
+        self.assertEqual(resp.data['students_with_removed_reviewed_pieces'], 1)
+
+        enroll(6, start=2)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(url, {'to': new.id})
+        self.assertEqual(resp.data['students'], 8)
+        self.assertEqual(resp.data['students_with_removed_reviewed_pieces'], 4)
+        self.assertEqual(resp.data['removed_reviewed_pieces'][0]['name'], removed.name)
+        self.assertEqual(len(resp.data['sample']), 8)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+        other = CourseVersion.objects.create(course=make_course('中级班'), version_label='2025版')
+        other.release()
+        self.assertEqual(self.client.get(url, {'to': other.id}).status_code, 400)
@@ -0,0 +1,123 @@
+"""
+课程树（课程 → 课 → 曲目）构建与缓存
+供教师端曲目选择器一次性加载完整的启用层级
+
+缓存策略：
+- 版本号存放在 Django cache（跨进程共享），Course/Lesson/Piece 保存或删除时由信号递增；
+- 树数据按版本号存入 Django cache，并在进程内保留最近一份，版本号未变时无需反序列化；
+- ETag 取内容摘要，客户端可通过 If-None-Match 协商得到 304。
+"""
+import hashlib
+import json
+import threading
+import time
+
+from django.core.cache import cache
+
+from apps.core.enums import EnableStatus
+from .models import Course, Lesson, Piece
+
+TREE_VERSION_KEY = 'courses:tree:version'
+TREE_DATA_KEY = 'courses:tree:data:{version}'
+TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+_local_lock = threading.Lock()
+_local_tree = {'version': None, 'etag': None, 'data': None}
+
+
+def get_tree_version():
+    """
+    读取当前课程树版本号；缓存中不存在时以时间戳初始化，避免与被淘汰的旧版本号重复
+    """
+    version = cache.get(TREE_VERSION_KEY)
+    if version is None:
+        cache.add(TREE_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(TREE_VERSION_KEY)
+    return version
+
+
+def bump_tree_version():
+    """
+    递增课程树版本号，使所有进程内与共享缓存中的旧树失效
+    """
+    try:
+        return cache.incr(TREE_VERSION_KEY)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(TREE_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def build_course_tree():
+    """
+    构建启用状态的课程树：三张表各查询一次，在内存中按外键分组
+
+    Returns:
+        list[dict]: 课程列表，每个课程包含 lessons，每个课包含 pieces
+    """
+    alive = {'deleted_at__isnull': True, 'status': EnableStatus.ENABLED}
+    courses = list(
+        Course.objects.filter(**alive).order_by('name').values('id', 'name')
+    )
+    lessons = (
+        Lesson.objects.filter(**alive, course__in=[c['id'] for c in courses])
+        .order_by('sort_order')
+        .values('id', 'course_id', 'name', 'sort_order')
+    )
+    pieces = (
+        Piece.objects.filter(**alive, lesson__deleted_at__isnull=True, lesson__status=EnableStatus.ENABLED)
+        .order_by('name')
+        .values('id', 'lesson_id', 'name', 'attribute', 'is_required')
+    )
+
+    lessons_by_course = {c['id']: [] for c in courses}
+    pieces_by_lesson = {}
+    for lesson in lessons:
+        entry = {
+            'id': str(lesson['id']),
+            'name': lesson['name'],
+            'sort_order': lesson['sort_order'],
+            'pieces': [],
+        }
+        lessons_by_course[lesson['course_id']].append(entry)
+        pieces_by_lesson[lesson['id']] = entry['pieces']
+    for piece in pieces:
+        bucket = pieces_by_lesson.get(piece['lesson_id'])
+        if bucket is None:
+            continue
+        bucket.append({
+            'id': str(piece['id']),
+            'name': piece['name'],
+            'attribute': piece['attribute'],
+            'is_required': piece['is_required'],
+        })
+
+    return [
+        {'id': str(c['id']), 'name': c['name'], 'lessons': lessons_by_course[c['id']]}
+        for c in courses
+    ]
+
+
+def get_course_tree():
+    """
+    获取（必要时构建）当前版本的课程树
+
+    Returns:
+        tuple[str, list]: (etag, 课程树数据)
+    """
+    version = get_tree_version()
+    with _local_lock:
+        if _local_tree['version'] == version:
+            return _local_tree['etag'], _local_tree['data']
+
+    cached = cache.get(TREE_DATA_KEY.format(version=version))
+    if cached is None:
+        data = build_course_tree()
+        body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        etag = '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest()
+        cached = {'etag': etag, 'data': data}
+        cache.set(TREE_DATA_KEY.format(version=version), cached, timeout=TREE_CACHE_TIMEOUT)
+
+    with _local_lock:
+        _local_tree.update(version=version, etag=cached['etag'], data=cached['data'])
+    return cached['etag'], cached['data']
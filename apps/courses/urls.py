@@ -11,6 +11,7 @@ app_name = 'courses'
 router = DefaultRouter()
 router.register(r'lessons', views.LessonViewSet, basename='lesson')  # 先注册明确前缀
 router.register(r'pieces', views.PieceViewSet, basename='piece')     # 先注册明确前缀
+router.register(r'versions', views.CourseVersionViewSet, basename='course-version')  # 先注册明确前缀
 router.register(r'', views.CourseViewSet, basename='course')         # 最后注册空前缀
 
 urlpatterns = [
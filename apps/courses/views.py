@@ -2,18 +2,50 @@
 课程应用视图
 提供课程相关的API接口
 """
+import gzip
+import uuid
+
+from django.http import HttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import Course, Lesson, Piece, CourseVersion
+from django.db.models import Q, Count
+from apps.core.enums import EnableStatus
+from .models import Course, Lesson, Piece, CourseVersion, CourseSnapshot
+from .diff import VersionDiffError, diff_versions, migration_preview
+from .tree import get_course_tree
 from .serializers import (
     CourseSerializer, LessonSerializer, PieceSerializer, CourseVersionSerializer
 )
 from rest_framework.filters import SearchFilter, OrderingFilter  # 修改：加入 OrderingFilter
 
 
+def annotate_course_counts(qs):
+    """
+    为课程查询集附加课数/曲目数/必修曲目数注解，列表一次聚合查询完成，避免逐行 COUNT
+    两个关联（lessons/pieces）同时 JOIN 会放大行数，因此使用 distinct 计数
+    """
+    lesson_filter = Q(lessons__deleted_at__isnull=True, lessons__status=EnableStatus.ENABLED)
+    piece_filter = Q(pieces__deleted_at__isnull=True, pieces__status=EnableStatus.ENABLED)
+    return qs.annotate(
+        lesson_count=Count('lessons', filter=lesson_filter, distinct=True),
+        piece_count=Count('pieces', filter=piece_filter, distinct=True),
+        required_piece_count=Count('pieces', filter=piece_filter & Q(pieces__is_required=True), distinct=True),
+    )
+
+
+def annotate_lesson_counts(qs):
+    """
+    为课查询集附加曲目数/必修曲目数注解，并预取所属课程名称
+    """
+    piece_filter = Q(pieces__deleted_at__isnull=True, pieces__status=EnableStatus.ENABLED)
+    return qs.select_related('course').annotate(
+        piece_count=Count('pieces', filter=piece_filter),
+        required_piece_count=Count('pieces', filter=piece_filter & Q(pieces__is_required=True)),
+    )
+
+
 class CourseViewSet(viewsets.ModelViewSet):
     """
     课程视图集
@@ -26,6 +58,22 @@ class CourseViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
+
+    def get_queryset(self):
+        return annotate_course_counts(super().get_queryset())
+
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def tree(self, request):
+        """
+        获取完整的启用课程树（课程 → 课 → 曲目），供曲目选择器一次加载
+        支持 If-None-Match 协商缓存，内容未变化时返回 304
+        """
+        etag, data = get_course_tree()
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response({'courses': data}, headers=headers)
     
     @action(detail=True, methods=['get'])
     def lessons(self, request, pk=None):
@@ -33,9 +81,9 @@ class CourseViewSet(viewsets.ModelViewSet):
         获取课程下的所有课
         """
         course = self.get_object()
-        lessons = course.lessons.filter(
+        lessons = annotate_lesson_counts(course.lessons.filter(
             deleted_at__isnull=True
-        ).order_by('sort_order')
+        )).order_by('sort_order')
         
         serializer = LessonSerializer(lessons, many=True)
         return Response(serializer.data)
@@ -66,6 +114,9 @@ class LessonViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description', 'course__name']  # 新增课程名参与搜索
     ordering_fields = ['sort_order', 'created_at']
     ordering = ['course', 'sort_order']
+
+    def get_queryset(self):
+        return annotate_lesson_counts(super().get_queryset())
     
     @action(detail=True, methods=['get'])
     def pieces(self, request, pk=None):
@@ -108,6 +159,87 @@ class CourseVersionViewSet(viewsets.ModelViewSet):
     ordering_fields = ['version_label', 'released_at', 'created_at']
     ordering = ['-released_at', '-created_at']
     
+    def _include_snapshot(self):
+        return self.request.query_params.get('include_snapshot') in ('1', 'true', 'True')
+    
+    def get_queryset(self):
+        qs = super().get_queryset().select_related('course', 'snapshot')
+        if not self._include_snapshot():
+            # 列表默认不输出快照内容，不读取压缩数据列
+            qs = qs.defer('snapshot__data')
+        return qs
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include_snapshot'] = self._include_snapshot()
+        return context
+    
+    @action(detail=True, methods=['get'])
+    def snapshot(self, request, pk=None):
+        """
+        获取版本内容快照（JSON）
+        - ETag 为快照内容摘要，If-None-Match 命中时返回 304，不读取快照数据
+        - 客户端接受 gzip 时直接下发库中存储的压缩字节（Content-Encoding: gzip）
+        """
+        version = self.get_object()
+        if version.snapshot_id is None:
+            return Response({'error': '该版本尚未发布，没有内容快照'}, status=status.HTTP_404_NOT_FOUND)
+        etag = '"%s"' % version.snapshot.content_hash
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache', 'Vary': 'Accept-Encoding'}
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        data = bytes(CourseSnapshot.objects.values_list('data', flat=True).get(pk=version.snapshot_id))
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(data, content_type='application/json; charset=utf-8', headers=headers)
+            response['Content-Encoding'] = 'gzip'
+            return response
+        return HttpResponse(gzip.decompress(data), content_type='application/json; charset=utf-8', headers=headers)
+    
+    def _other_version(self, param):
+        """
+        读取查询参数中的另一个版本；缺失或不存在时返回 (None, 错误响应)
+        """
+        other_id = self.request.query_params.get(param)
+        if not other_id:
+            return None, Response({'error': f'缺少参数 {param}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            other = self.get_queryset().filter(pk=uuid.UUID(other_id)).first()
+        except ValueError:
+            other = None
+        if other is None:
+            return None, Response({'error': '对比版本不存在'}, status=status.HTTP_404_NOT_FOUND)
+        return other, None
+    
+    @action(detail=True, methods=['get'])
+    def diff(self, request, pk=None):
+        """
+        版本对比：?against=<版本ID> 为基准，返回从基准到当前版本的课/曲目变化（结果按快照缓存）
+        """
+        version = self.get_object()
+        against, error = self._other_version('against')
+        if error:
+            return error
+        try:
+            return Response(diff_versions(against, version))
+        except VersionDiffError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=True, methods=['get'], url_path='migration-preview')
+    def migration_preview(self, request, pk=None):
+        """
+        学员迁移预览：?to=<版本ID>，预览把当前版本上的有效课程记录批量迁到目标版本的影响（只读）
+        """
+        version = self.get_object()
+        target, error = self._other_version('to')
+        if error:
+            return error
+        try:
+            return Response(migration_preview(version, target))
+        except VersionDiffError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
     @action(detail=True, methods=['post'])
     def release(self, request, pk=None):
         """
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.db.models import Count, Exists, OuterRef
-from .models import EvaluationTask, FeedbackRecord, FeedbackPieceDetail, StudentPieceStatus
+from .models import EvaluationTask, FeedbackRecord, FeedbackPieceDetail, StudentPieceStatus, PieceStatusJob, StudentCourseProgress
 
 
 class FeedbackPieceDetailInline(admin.TabularInline):
@@ -214,6 +214,31 @@ class StudentPieceStatusAdmin(admin.ModelAdmin):
     last_feedback_teacher.short_description = '最近反馈教师'
     last_feedback_teacher.admin_order_field = 'last_feedback__teacher__name'
 
+@admin.register(PieceStatusJob)
+class PieceStatusJobAdmin(admin.ModelAdmin):
+    """
+    曲目状态更新队列
+    - 便于排查积压与失败任务（attempts/last_error）
+    """
+    list_display = ('feedback', 'created_at', 'processed_at', 'attempts')
+    list_filter = ('processed_at',)
+    ordering = ('-created_at',)
+    raw_id_fields = ['feedback']
+
+@admin.register(StudentCourseProgress)
+class StudentCourseProgressAdmin(admin.ModelAdmin):
+    """
+    学员课程进度（预计算，只读查看）
+    """
+    list_display = (
+        'student', 'course', 'reviewed_piece_count', 'total_piece_count',
+        'required_reviewed_count', 'required_piece_count', 'last_reviewed_at',
+    )
+    list_filter = ('course',)
+    search_fields = ('student__nickname', 'student__xiaoetong_id')
+    list_select_related = ('student', 'course')
+    raw_id_fields = ['student', 'course']
+
 # 可选：如果希望单独管理曲目明细（非内联），取消注释以下注册
 # @admin.register(FeedbackPieceDetail)
 # class FeedbackPieceDetailAdmin(admin.ModelAdmin):
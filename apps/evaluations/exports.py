@@ -0,0 +1,54 @@
+"""
+点评记录导出：列定义与逐行生成
+
+查询以服务端游标分块读取（.iterator(chunk_size=EXPORT_CHUNK_SIZE)），
+每块额外一条查询预取曲目明细，整个导出过程只持有当前块的数据。
+"""
+from django.db.models import Prefetch
+
+from .models import FeedbackPieceDetail
+
+EXPORT_CHUNK_SIZE = 2000
+
+_BASE_COLUMNS = [
+    ('点评时间', lambda fb: fb.created_at),
+    ('学员昵称', lambda fb: fb.student.nickname),
+    ('小鹅通ID', lambda fb: fb.student.xiaoetong_id),
+    ('点评教师', lambda fb: fb.teacher.name),
+    ('曲目', lambda fb: '、'.join(d.piece.name for d in fb.details.all())),
+    ('教师点评内容', lambda fb: fb.teacher_content),
+]
+
+_RESEARCH_COLUMNS = [
+    ('教研反馈', lambda fb: fb.researcher_feedback),
+    ('产出当前印象', lambda fb: fb.produce_impression),
+    ('印象文本', lambda fb: fb.impression_text),
+]
+
+AUDIENCE_COLUMNS = {
+    'ops': _BASE_COLUMNS,
+    'research': _BASE_COLUMNS + _RESEARCH_COLUMNS,
+}
+
+
+def feedback_export_rows(queryset, audience='ops', chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Args:
+        queryset (QuerySet[FeedbackRecord]): 已过滤的点评记录
+        audience (str): 'ops' / 'research'，决定导出列
+
+    Returns:
+        tuple(list[str], Iterator[list]): 表头与惰性数据行
+    """
+    columns = AUDIENCE_COLUMNS[audience]
+    details = FeedbackPieceDetail.objects.filter(deleted_at__isnull=True) \
+        .select_related('piece').only('feedback_id', 'piece__name').order_by('created_at')
+    qs = queryset.select_related('student', 'teacher') \
+        .prefetch_related(Prefetch('details', queryset=details)) \
+        .order_by('-created_at', 'id')
+
+    def rows():
+        for fb in qs.iterator(chunk_size=chunk_size):
+            yield [getter(fb) for _, getter in columns]
+
+    return [title for title, _ in columns], rows()
@@ -0,0 +1,84 @@
+"""
+点评记录流式导出基准测试
+在不同导出规模下测量 CSV / XLSX 的耗时、输出字节数与 Python 内存峰值（tracemalloc），
+峰值应在超过一个读取块（EXPORT_CHUNK_SIZE）后基本不随行数增长。所有数据写在事务内，结束后回滚。
+
+用法：python manage.py bench_feedback_export [--rows 1000 10000 50000] [--pieces 3]
+"""
+import time
+import tracemalloc
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.core.enums import PieceAttribute
+from apps.core.export import iter_csv, iter_xlsx
+from apps.courses.models import Course, Lesson, Piece
+from apps.evaluations.exports import feedback_export_rows
+from apps.evaluations.models import EvaluationTask, FeedbackRecord, FeedbackPieceDetail
+from apps.persons.models import Person
+from apps.students.models import Student
+
+BULK_BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = '测量点评记录流式导出在不同规模下的内存峰值与耗时（数据在事务内回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', nargs='+', type=int, default=[1000, 10000, 50000], help='导出行数')
+        parser.add_argument('--pieces', type=int, default=3, help='每条点评的曲目数')
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['rows'])
+        self.stdout.write(f"{'format':<6} {'rows':>8} {'seconds':>8} {'output_kb':>10} {'peak_kb':>8}")
+        with transaction.atomic():
+            self.teacher = Person.objects.create(name='bench-teacher')
+            self.student = Student.objects.create(xiaoetong_id=f'bench-{uuid.uuid4().hex}', nickname='bench')
+            self.pieces = self._make_pieces(options['pieces'])
+            created = 0
+            for size in sizes:
+                self._make_feedbacks(size - created)
+                created = size
+                qs = FeedbackRecord.objects.filter(teacher=self.teacher)
+                for name, writer in (('csv', iter_csv), ('xlsx', iter_xlsx)):
+                    # 计时与内存分两轮测量：tracemalloc 本身会显著拖慢执行
+                    started = time.perf_counter()
+                    total = sum(len(chunk) for chunk in writer(*feedback_export_rows(qs, 'research')))
+                    elapsed = time.perf_counter() - started
+                    tracemalloc.start()
+                    for _ in writer(*feedback_export_rows(qs, 'research')):
+                        pass
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    self.stdout.write(
+                        f"{name:<6} {size:>8} {elapsed:>8.2f} {total / 1024:>10.0f} {peak / 1024:>8.0f}"
+                    )
+            transaction.set_rollback(True)
+
+    def _make_pieces(self, count):
+        course = Course.objects.create(name=f'bench-{uuid.uuid4().hex[:8]}')
+        lesson = Lesson.objects.create(course=course, name='bench', sort_order=1)
+        return Piece.objects.bulk_create([
+            Piece(course=course, lesson=lesson, name=f'曲目-{i}', attribute=PieceAttribute.ETUDE)
+            for i in range(count)
+        ])
+
+    def _make_feedbacks(self, count):
+        for start in range(0, count, BULK_BATCH_SIZE):
+            n = min(BULK_BATCH_SIZE, count - start)
+            tasks = EvaluationTask.objects.bulk_create([
+                EvaluationTask(student=self.student, assignee=self.teacher, source='teacher') for _ in range(n)
+            ])
+            feedbacks = FeedbackRecord.objects.bulk_create([
+                FeedbackRecord(
+                    task=task, student=self.student, teacher=self.teacher,
+                    teacher_content='本次回课节奏稳定，注意左手指法。', researcher_feedback='同意', impression_text='进步明显',
+                )
+                for task in tasks
+            ])
+            FeedbackPieceDetail.objects.bulk_create(
+                [FeedbackPieceDetail(feedback=fb, piece=p) for fb in feedbacks for p in self.pieces],
+                batch_size=BULK_BATCH_SIZE,
+            )
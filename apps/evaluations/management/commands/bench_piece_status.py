@@ -0,0 +1,73 @@
+"""
+学员曲目状态更新基准测试
+对比逐曲目循环（_update_by_feedback_loop）与集合化 upsert（update_by_feedbacks）
+在 1 / 20 / 200 个曲目下的耗时与 SQL 语句数。所有数据写在事务内，结束后回滚。
+
+用法：python manage.py bench_piece_status [--sizes 1 20 200] [--repeat 5]
+"""
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.enums import PieceAttribute
+from apps.courses.models import Course, Lesson, Piece
+from apps.evaluations.models import EvaluationTask, FeedbackRecord, FeedbackPieceDetail, StudentPieceStatus
+from apps.persons.models import Person
+from apps.students.models import Student
+
+
+class Command(BaseCommand):
+    help = '对比学员曲目状态的逐条更新与集合化 upsert 性能（数据在事务内回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1, 20, 200], help='每条点评的曲目数')
+        parser.add_argument('--repeat', type=int, default=5, help='每种规模重复次数')
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        repeat = max(1, options['repeat'])
+        strategies = [('loop', lambda fb: StudentPieceStatus._update_by_feedback_loop(fb))]
+        if connection.vendor == 'postgresql':
+            strategies.append(('upsert', lambda fb: StudentPieceStatus.update_by_feedbacks([fb])))
+        else:
+            self.stdout.write(self.style.WARNING('集合化 upsert 仅支持 PostgreSQL，本次只测逐条更新'))
+
+        self.stdout.write(f"{'strategy':<8} {'pieces':>6} {'queries':>8} {'median_ms':>10} {'min_ms':>8}")
+        with transaction.atomic():
+            self.teacher = Person.objects.create(name='bench-teacher')
+            pieces = self._make_pieces(max(sizes))
+            for size in sizes:
+                for name, run in strategies:
+                    # 每种策略使用独立学员，首轮为插入，后续轮次为冲突自增
+                    student = Student.objects.create(xiaoetong_id=f'bench-{uuid.uuid4().hex}', nickname='bench')
+                    timings, queries = [], 0
+                    for _ in range(repeat):
+                        feedback = self._make_feedback(student, pieces[:size])
+                        with CaptureQueriesContext(connection) as ctx:
+                            started = time.perf_counter()
+                            run(feedback)
+                            timings.append((time.perf_counter() - started) * 1000)
+                        queries = len(ctx.captured_queries)
+                    self.stdout.write(
+                        f"{name:<8} {size:>6} {queries:>8} {statistics.median(timings):>10.2f} {min(timings):>8.2f}"
+                    )
+            transaction.set_rollback(True)
+
+    def _make_pieces(self, count):
+        course = Course.objects.create(name=f'bench-{uuid.uuid4().hex[:8]}')
+        lesson = Lesson.objects.create(course=course, name='bench', sort_order=1)
+        Piece.objects.bulk_create([
+            Piece(course=course, lesson=lesson, name=f'piece-{i}', attribute=PieceAttribute.ETUDE)
+            for i in range(count)
+        ])
+        return list(Piece.objects.filter(lesson=lesson).order_by('name'))
+
+    def _make_feedback(self, student, pieces):
+        task = EvaluationTask.objects.create(student=student, assignee=self.teacher, source='teacher')
+        feedback = FeedbackRecord.objects.create(task=task, student=student, teacher=self.teacher, teacher_content='bench')
+        FeedbackPieceDetail.objects.bulk_create([FeedbackPieceDetail(feedback=feedback, piece=p) for p in pieces])
+        return feedback
@@ -0,0 +1,36 @@
+"""
+消费学员曲目状态更新队列（PieceStatusJob）
+
+用法：
+  python manage.py process_piece_status_queue            # 处理到队列为空后退出（适合 cron）
+  python manage.py process_piece_status_queue --forever  # 常驻轮询
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.evaluations.pipeline import DEFAULT_BATCH_SIZE, drain_piece_status_queue, queue_metrics
+
+
+class Command(BaseCommand):
+    help = '按批次消费学员曲目状态更新队列，并输出队列滞后指标'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批处理的点评数')
+        parser.add_argument('--forever', action='store_true', help='常驻运行，队列为空时休眠后继续')
+        parser.add_argument('--interval', type=float, default=2.0, help='常驻模式下的轮询间隔（秒）')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        while True:
+            before = queue_metrics()
+            processed = drain_piece_status_queue(batch_size=batch_size)
+            if processed or not options['forever']:
+                after = queue_metrics()
+                self.stdout.write(
+                    f"processed={processed} lag_before={before['lag_seconds']}s "
+                    f"pending={after['pending']} failed={after['failed']}"
+                )
+            if not options['forever']:
+                return
+            time.sleep(options['interval'])
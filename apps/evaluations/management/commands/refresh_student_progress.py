@@ -0,0 +1,42 @@
+"""
+全量（或按学员）重建学员课程进度表 StudentCourseProgress
+
+组合来源：在读课程记录（CourseRecord，未软删）∪ 已有点评状态涉及的课程。
+用法：
+  python manage.py refresh_student_progress
+  python manage.py refresh_student_progress --student <uuid> [--student <uuid> ...]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.evaluations.models import StudentCourseProgress, StudentPieceStatus
+from apps.students.models import CourseRecord, Student
+
+
+class Command(BaseCommand):
+    help = '重建学员课程进度预计算表，用于修复增量刷新之外的漂移（如课程目录变更）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', action='append', dest='students', help='仅刷新指定学员（可重复）')
+        parser.add_argument('--chunk-size', type=int, default=500, help='每批处理的学员数')
+
+    def handle(self, *args, **options):
+        student_ids = options['students'] or list(Student.objects.order_by('id').values_list('id', flat=True))
+        chunk_size = max(1, options['chunk_size'])
+        total = 0
+        for start in range(0, len(student_ids), chunk_size):
+            chunk = student_ids[start:start + chunk_size]
+            pairs = set(
+                CourseRecord.objects.filter(deleted_at__isnull=True, student_id__in=chunk)
+                .values_list('student_id', 'course_id')
+            )
+            pairs |= set(
+                StudentPieceStatus.objects.filter(deleted_at__isnull=True, student_id__in=chunk)
+                .values_list('student_id', 'piece__course_id')
+            )
+            with transaction.atomic():
+                StudentCourseProgress.objects.filter(student_id__in=chunk).exclude(
+                    course_id__in={course_id for _, course_id in pairs}
+                ).delete()
+                total += StudentCourseProgress.refresh_pairs(pairs)
+        self.stdout.write(self.style.SUCCESS(f'已刷新 {total} 条学员课程进度'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:16
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0005_studentpiecestatus_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PieceStatusJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='处理完成时间')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='失败次数')),
+                ('last_error', models.TextField(blank=True, null=True, verbose_name='最近错误')),
+                ('feedback', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='piece_status_job', to='evaluations.feedbackrecord', verbose_name='点评记录')),
+            ],
+            options={
+                'verbose_name': '曲目状态更新任务',
+                'verbose_name_plural': '曲目状态更新任务',
+                'db_table': 'evaluations_piece_status_job',
+                'indexes': [models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['created_at'], name='idx_psjob_pending')],
+            },
+        ),
+    ]
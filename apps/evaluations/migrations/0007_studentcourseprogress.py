@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:17
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('evaluations', '0006_piecestatusjob'),
+        ('students', '0002_courserecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentCourseProgress',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('reviewed_piece_count', models.PositiveIntegerField(default=0, verbose_name='已点评曲目数')),
+                ('required_reviewed_count', models.PositiveIntegerField(default=0, verbose_name='已点评必修曲目数')),
+                ('total_piece_count', models.PositiveIntegerField(default=0, verbose_name='曲目总数')),
+                ('required_piece_count', models.PositiveIntegerField(default=0, verbose_name='必修曲目总数')),
+                ('last_reviewed_at', models.DateTimeField(blank=True, null=True, verbose_name='最后点评时间')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_progress', to='courses.course', verbose_name='课程')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_progress', to='students.student', verbose_name='学员')),
+            ],
+            options={
+                'verbose_name': '学员课程进度',
+                'verbose_name_plural': '学员课程进度',
+                'db_table': 'evaluations_student_course_progress',
+                'indexes': [models.Index(fields=['course'], name='idx_scp_course')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'course'), name='uq_scp_student_course')],
+            },
+        ),
+    ]
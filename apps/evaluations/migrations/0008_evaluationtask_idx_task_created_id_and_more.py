@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0007_studentcourseprogress'),
+        ('persons', '0003_person_user'),
+        ('students', '0003_importbatch_importrowerror_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluationtask',
+            index=models.Index(fields=['created_at', 'id'], name='idx_task_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='feedbackrecord',
+            index=models.Index(fields=['created_at', 'id'], name='idx_feedback_created_id'),
+        ),
+    ]
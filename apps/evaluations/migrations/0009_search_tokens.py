@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:02
+
+from django.db import migrations, models
+
+from apps.core.search import search_backfill_operation, search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0008_evaluationtask_idx_task_created_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedbackrecord',
+            name='search_tokens',
+            field=models.TextField(blank=True, default='', editable=False, help_text='由 search_index_fields 生成的分词，供关键字搜索使用', verbose_name='搜索分词'),
+        ),
+        # 回填存量数据的分词
+        search_backfill_operation('evaluations.FeedbackRecord', ('teacher_content', 'researcher_feedback')),
+        # 仅 PostgreSQL：关键字搜索的 GIN 表达式索引（见 apps.core.search）
+        search_index_operation('evaluations.FeedbackRecord', 'idx_feedback_search'),
+    ]
@@ -1,9 +1,11 @@
+import uuid
 from django.db import models
-from apps.core.models import AuditModel
+from apps.core.models import AuditModel, BaseModel, SearchIndexedModel
 from apps.core.enums import TaskStatus, TaskSource
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import F
+from django.db import connection, transaction
+from django.db.models import F, Q, Count, Max
+from apps.core.enums import EnableStatus
 
 class EvaluationTask(AuditModel):
     """
@@ -25,15 +27,19 @@ class EvaluationTask(AuditModel):
             models.Index(fields=['student'], name='idx_task_student'),
             models.Index(fields=['batch_id'], name='idx_task_batch'),
             models.Index(fields=['source'], name='idx_task_source'),
+            # 键集分页：(created_at, id) 倒序翻页
+            models.Index(fields=['created_at', 'id'], name='idx_task_created_id'),
         ]
 
     def __str__(self):
         return f"Task[{self.status}] for {self.student} -> {self.assignee}"
 
-class FeedbackRecord(AuditModel):
+class FeedbackRecord(SearchIndexedModel, AuditModel):
     """
     点评记录（一任务一反馈）
     """
+    search_index_fields = ('teacher_content', 'researcher_feedback')
+
     task = models.OneToOneField('evaluations.EvaluationTask', on_delete=models.PROTECT, related_name='feedback', verbose_name='任务')
     student = models.ForeignKey('students.Student', on_delete=models.PROTECT, related_name='feedback_records', verbose_name='学员')
     teacher = models.ForeignKey('persons.Person', on_delete=models.PROTECT, related_name='feedback_given', verbose_name='点评教师')
@@ -50,6 +56,8 @@ class FeedbackRecord(AuditModel):
             models.Index(fields=['student', 'created_at'], name='idx_feedback_student_created'),
             models.Index(fields=['teacher', 'created_at'], name='idx_feedback_teacher_created'),
             models.Index(fields=['task'], name='idx_feedback_task'),
+            # 键集分页：(created_at, id) 倒序翻页
+            models.Index(fields=['created_at', 'id'], name='idx_feedback_created_id'),
         ]
 
     def __str__(self):
@@ -190,8 +198,8 @@ class StudentPieceStatus(AuditModel):
         3) 更新最后点评时间（UTC），并记录溯源 last_feedback
         
         特性：
-        - 使用事务保证同一条反馈的状态更新原子性；
-        - 使用 F 表达式避免并发下计数丢失；
+        - PostgreSQL 下走集合化 upsert（见 update_by_feedbacks），语句数与曲目数无关；
+        - 其他数据库回退逐曲目处理（见 _update_by_feedback_loop）；
         - 与“可删除点评记录”的规则兼容（状态保留，仅 last_feedback 可能变为 NULL）。
         
         Args:
@@ -200,6 +208,16 @@ class StudentPieceStatus(AuditModel):
         Returns:
             int: 被处理的曲目明细数量（便于调用端统计与测试校验）
         """
+        if connection.vendor == 'postgresql':
+            return cls.update_by_feedbacks([feedback])
+        return cls._update_by_feedback_loop(feedback)
+
+    @classmethod
+    def _update_by_feedback_loop(cls, feedback):
+        """
+        逐曲目更新：每个曲目 get_or_create + F 表达式自增，2~3 次往返/曲目。
+        作为非 PostgreSQL 环境的回退实现，并供基准测试对比。
+        """
         details_qs = feedback.details.select_related('piece').all()
         if not details_qs:
             return 0
@@ -228,3 +246,248 @@ class StudentPieceStatus(AuditModel):
                 )
                 processed += 1
         return processed
+
+    @classmethod
+    def update_by_feedbacks(cls, feedbacks):
+        """
+        集合化更新（PostgreSQL）：一次查询读取全部曲目明细，一条 INSERT ... ON CONFLICT
+        针对部分唯一约束 uq_sps_student_piece_not_deleted 完成插入或自增。
+        
+        计数语义与逐条处理一致：
+        - 每条曲目明细使 (student, piece) 的被点评次数 +1，同批次重复的组合在内存中先累加；
+        - last_feedback 取该组合在本批次中最晚创建的点评记录；
+        - 新建记录的 created_by/updated_by 取自对应点评记录。
+        
+        并发：ON CONFLICT 由唯一索引保证原子性，行按 (student, piece) 排序写入，
+        使并发提交以相同顺序加锁，避免死锁。
+        
+        非 PostgreSQL 环境逐条回退到 _update_by_feedback_loop。
+        
+        Args:
+            feedbacks (Iterable[FeedbackRecord|UUID]): 点评记录或其主键
+        
+        Returns:
+            int: 被处理的曲目明细数量
+        """
+        feedback_ids = [getattr(fb, 'pk', fb) for fb in feedbacks]
+        if not feedback_ids:
+            return 0
+        if connection.vendor != 'postgresql':
+            return sum(
+                cls._update_by_feedback_loop(fb)
+                for fb in FeedbackRecord.objects.filter(pk__in=feedback_ids).select_related('student')
+            )
+
+        details = (FeedbackPieceDetail.objects
+                   .filter(feedback_id__in=feedback_ids)
+                   .values_list('feedback_id', 'feedback__student_id', 'piece_id',
+                                'feedback__created_at', 'feedback__created_by_id', 'feedback__updated_by_id'))
+        rows = {}
+        processed = 0
+        for feedback_id, student_id, piece_id, fb_created_at, created_by_id, updated_by_id in details:
+            processed += 1
+            key = (student_id, piece_id)
+            row = rows.get(key)
+            if row is None:
+                rows[key] = {
+                    'count': 1, 'feedback_id': feedback_id, 'feedback_at': fb_created_at,
+                    'created_by_id': created_by_id, 'updated_by_id': updated_by_id,
+                }
+                continue
+            row['count'] += 1
+            if fb_created_at >= row['feedback_at']:
+                row.update(feedback_id=feedback_id, feedback_at=fb_created_at, updated_by_id=updated_by_id)
+        if not rows:
+            return 0
+
+        keys = sorted(rows)
+        now = timezone.now()
+        table = cls._meta.db_table
+        sql = f"""
+            INSERT INTO {table} AS sps
+                (id, created_at, updated_at, deleted_at, student_id, piece_id, last_feedback_id,
+                 review_count, last_reviewed_at, created_by_id, updated_by_id)
+            SELECT v.id, %(now)s, %(now)s, NULL, v.student_id, v.piece_id, v.feedback_id,
+                   v.cnt, %(now)s, v.created_by_id, v.updated_by_id
+            FROM unnest(%(ids)s::uuid[], %(students)s::uuid[], %(pieces)s::uuid[], %(feedbacks)s::uuid[],
+                        %(counts)s::int[], %(created_by)s::uuid[], %(updated_by)s::uuid[])
+                AS v(id, student_id, piece_id, feedback_id, cnt, created_by_id, updated_by_id)
+            ON CONFLICT (student_id, piece_id) WHERE deleted_at IS NULL
+            DO UPDATE SET review_count = sps.review_count + EXCLUDED.review_count,
+                          last_feedback_id = EXCLUDED.last_feedback_id,
+                          last_reviewed_at = EXCLUDED.last_reviewed_at,
+                          updated_at = EXCLUDED.updated_at,
+                          updated_by_id = EXCLUDED.updated_by_id
+        """
+        params = {
+            'now': now,
+            'ids': [uuid.uuid4() for _ in keys],
+            'students': [k[0] for k in keys],
+            'pieces': [k[1] for k in keys],
+            'feedbacks': [rows[k]['feedback_id'] for k in keys],
+            'counts': [rows[k]['count'] for k in keys],
+            'created_by': [rows[k]['created_by_id'] for k in keys],
+            'updated_by': [rows[k]['updated_by_id'] for k in keys],
+        }
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+        return processed
+
+
+class PieceStatusJob(BaseModel):
+    """
+    学员曲目状态更新队列（提交点评后的异步阶段）
+    
+    设计说明：
+    - 与点评记录在同一事务内写入（一条点评一行，唯一约束保证重复入队无副作用）；
+    - 事务提交后由进程内线程池或 process_piece_status_queue 命令按批次消费；
+    - 消费时在同一事务内更新状态表并写 processed_at，失败整体回滚，重试不会重复计数；
+    - 待处理行的最早 created_at 即为队列滞后（见 pipeline.queue_metrics）。
+    """
+    feedback = models.OneToOneField(
+        'evaluations.FeedbackRecord',
+        on_delete=models.CASCADE,
+        related_name='piece_status_job',
+        verbose_name='点评记录'
+    )
+    processed_at = models.DateTimeField(null=True, blank=True, verbose_name='处理完成时间')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='失败次数')
+    last_error = models.TextField(null=True, blank=True, verbose_name='最近错误')
+
+    class Meta:
+        db_table = 'evaluations_piece_status_job'
+        verbose_name = '曲目状态更新任务'
+        verbose_name_plural = '曲目状态更新任务'
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(processed_at__isnull=True),
+                name='idx_psjob_pending'
+            ),
+        ]
+
+    def __str__(self):
+        state = 'done' if self.processed_at else 'pending'
+        return f"PieceStatusJob(feedback={self.feedback_id}, {state})"
+
+
+class StudentCourseProgress(BaseModel):
+    """
+    学员课程进度（预计算表，按 学员+课程 一行）
+    
+    设计说明：
+    - 由学员曲目状态表聚合得到：已点评曲目数、已点评必修曲目数、最后点评时间；
+    - 同时冗余课程下启用曲目总数与必修总数，读取时无需再关联曲目表；
+    - 点评事件处理后按受影响的 (学员, 课程) 增量刷新（见 pipeline.process_batch），
+      课程目录变化等漂移由 refresh_student_progress 命令全量修复；
+    - 学员在读课程（CourseRecord）即使尚未被点评也会在全量刷新时生成 0 进度行。
+    """
+    student = models.ForeignKey(
+        'students.Student',
+        on_delete=models.CASCADE,
+        related_name='course_progress',
+        verbose_name='学员'
+    )
+    course = models.ForeignKey(
+        'courses.Course',
+        on_delete=models.CASCADE,
+        related_name='student_progress',
+        verbose_name='课程'
+    )
+    reviewed_piece_count = models.PositiveIntegerField(default=0, verbose_name='已点评曲目数')
+    required_reviewed_count = models.PositiveIntegerField(default=0, verbose_name='已点评必修曲目数')
+    total_piece_count = models.PositiveIntegerField(default=0, verbose_name='曲目总数')
+    required_piece_count = models.PositiveIntegerField(default=0, verbose_name='必修曲目总数')
+    last_reviewed_at = models.DateTimeField(null=True, blank=True, verbose_name='最后点评时间')
+
+    class Meta:
+        db_table = 'evaluations_student_course_progress'
+        verbose_name = '学员课程进度'
+        verbose_name_plural = '学员课程进度'
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'course'], name='uq_scp_student_course'),
+        ]
+        indexes = [
+            models.Index(fields=['course'], name='idx_scp_course'),
+        ]
+
+    def __str__(self):
+        return f"Progress(student={self.student_id}, course={self.course_id}, {self.reviewed_piece_count}/{self.total_piece_count})"
+
+    @classmethod
+    def refresh_for_feedbacks(cls, feedback_ids):
+        """
+        按点评记录涉及的 (学员, 课程) 增量刷新进度
+        
+        Returns:
+            int: 刷新的进度行数
+        """
+        pairs = set(
+            FeedbackPieceDetail.objects.filter(feedback_id__in=list(feedback_ids))
+            .values_list('feedback__student_id', 'piece__course_id')
+        )
+        return cls.refresh_pairs(pairs)
+
+    @classmethod
+    def refresh_pairs(cls, pairs):
+        """
+        重算给定 (student_id, course_id) 组合的进度并 upsert，语句数与组合数无关
+        
+        Args:
+            pairs (Iterable[tuple]): (student_id, course_id) 集合
+        
+        Returns:
+            int: 写入的进度行数
+        """
+        pairs = set(pairs)
+        if not pairs:
+            return 0
+        student_ids = {sid for sid, _ in pairs}
+        course_ids = {cid for _, cid in pairs}
+        alive_piece = Q(piece__deleted_at__isnull=True, piece__status=EnableStatus.ENABLED)
+
+        reviewed = {
+            (row['student_id'], row['piece__course_id']): row
+            for row in StudentPieceStatus.objects
+            .filter(alive_piece, deleted_at__isnull=True, student_id__in=student_ids, piece__course_id__in=course_ids)
+            .values('student_id', 'piece__course_id')
+            .annotate(
+                reviewed=Count('piece_id', distinct=True),
+                required_reviewed=Count('piece_id', filter=Q(piece__is_required=True), distinct=True),
+                last=Max('last_reviewed_at'),
+            )
+        }
+        from apps.courses.models import Piece
+        totals = {
+            row['course_id']: row
+            for row in Piece.objects
+            .filter(deleted_at__isnull=True, status=EnableStatus.ENABLED, course_id__in=course_ids)
+            .values('course_id')
+            .annotate(total=Count('id'), required=Count('id', filter=Q(is_required=True)))
+        }
+
+        objs = []
+        for student_id, course_id in pairs:
+            stat = reviewed.get((student_id, course_id), {})
+            total = totals.get(course_id, {})
+            objs.append(cls(
+                student_id=student_id,
+                course_id=course_id,
+                reviewed_piece_count=stat.get('reviewed', 0),
+                required_reviewed_count=stat.get('required_reviewed', 0),
+                total_piece_count=total.get('total', 0),
+                required_piece_count=total.get('required', 0),
+                last_reviewed_at=stat.get('last'),
+            ))
+        cls.objects.bulk_create(
+            objs,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['student', 'course'],
+            update_fields=[
+                'reviewed_piece_count', 'required_reviewed_count', 'total_piece_count',
+                'required_piece_count', 'last_reviewed_at', 'updated_at',
+            ],
+        )
+        return len(objs)
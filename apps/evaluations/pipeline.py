@@ -0,0 +1,160 @@
+"""
+点评提交后的异步阶段：学员曲目状态维护
+
+流程：
+1) 提交点评的事务内调用 enqueue_piece_status_update 写入 PieceStatusJob（与点评同生共死）；
+2) 事务提交后（transaction.on_commit）唤醒进程内线程池消费队列；
+   若 settings.PIECE_STATUS_WORKER = 'command'，则不在进程内消费，
+   改由 `python manage.py process_piece_status_queue` 常驻或定时消费；
+3) 每批在一个事务内：锁定待处理任务（SKIP LOCKED）→ 集合化更新状态表 →
+   增量刷新学员课程进度 → 标记 processed_at，任一步失败整体回滚，因此重试不会重复计数。
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .models import PieceStatusJob, StudentPieceStatus, StudentCourseProgress
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+MAX_ATTEMPTS = 5
+
+_executor = None
+_executor_lock = threading.Lock()
+_drain_scheduled = threading.Event()
+
+
+def _worker_mode():
+    return getattr(settings, 'PIECE_STATUS_WORKER', 'thread')
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='piece-status')
+        return _executor
+
+
+def enqueue_piece_status_update(feedback_id):
+    """
+    将点评记录加入曲目状态更新队列（须在写入点评的事务内调用）
+    重复入队被唯一约束吸收；事务提交后再唤醒消费者
+    """
+    PieceStatusJob.objects.bulk_create([PieceStatusJob(feedback_id=feedback_id)], ignore_conflicts=True)
+    transaction.on_commit(schedule_drain)
+
+
+def schedule_drain():
+    """
+    唤醒进程内消费者；已有排队中的消费则合并，不重复提交
+    """
+    if _worker_mode() != 'thread':
+        return
+    if _drain_scheduled.is_set():
+        return
+    _drain_scheduled.set()
+    _get_executor().submit(_drain_in_thread)
+
+
+def _drain_in_thread():
+    _drain_scheduled.clear()
+    try:
+        drain_piece_status_queue()
+    except Exception:
+        logger.exception('曲目状态队列消费失败')
+    finally:
+        close_old_connections()
+        connection.close()
+
+
+def process_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    消费一批待处理任务
+
+    Returns:
+        int: 本批成功处理的任务数（0 表示队列已空）
+    """
+    try:
+        with transaction.atomic():
+            jobs = list(
+                PieceStatusJob.objects.select_for_update(skip_locked=True)
+                .filter(processed_at__isnull=True, attempts__lt=MAX_ATTEMPTS)
+                .order_by('created_at')[:batch_size]
+            )
+            if not jobs:
+                return 0
+            feedback_ids = [job.feedback_id for job in jobs]
+            StudentPieceStatus.update_by_feedbacks(feedback_ids)
+            StudentCourseProgress.refresh_for_feedbacks(feedback_ids)
+            PieceStatusJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                processed_at=timezone.now(), updated_at=timezone.now()
+            )
+            return len(jobs)
+    except Exception:
+        logger.exception('曲目状态批处理失败，改为逐条处理以隔离问题数据')
+    return _process_individually(batch_size)
+
+
+def _process_individually(batch_size):
+    processed = 0
+    pending = list(
+        PieceStatusJob.objects.filter(processed_at__isnull=True, attempts__lt=MAX_ATTEMPTS)
+        .order_by('created_at').values_list('pk', flat=True)[:batch_size]
+    )
+    for pk in pending:
+        try:
+            with transaction.atomic():
+                job = (PieceStatusJob.objects.select_for_update(skip_locked=True)
+                       .filter(pk=pk, processed_at__isnull=True).first())
+                if job is None:
+                    continue
+                StudentPieceStatus.update_by_feedbacks([job.feedback_id])
+                StudentCourseProgress.refresh_for_feedbacks([job.feedback_id])
+                job.processed_at = timezone.now()
+                job.save(update_fields=['processed_at', 'updated_at'])
+                processed += 1
+        except Exception as exc:
+            PieceStatusJob.objects.filter(pk=pk).update(
+                attempts=F('attempts') + 1, last_error=str(exc)[:2000], updated_at=timezone.now()
+            )
+    return processed
+
+
+def drain_piece_status_queue(batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """
+    持续消费直到队列为空（或达到 max_batches）
+
+    Returns:
+        int: 累计处理的任务数
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        done = process_batch(batch_size)
+        batches += 1
+        if not done:
+            break
+        total += done
+    return total
+
+
+def queue_metrics():
+    """
+    队列指标：待处理数、失败挂起数、最早待处理任务的等待秒数（队列滞后）
+    """
+    pending = PieceStatusJob.objects.filter(processed_at__isnull=True)
+    oldest = pending.filter(attempts__lt=MAX_ATTEMPTS).aggregate(oldest=Min('created_at'))['oldest']
+    lag = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    return {
+        'pending': pending.filter(attempts__lt=MAX_ATTEMPTS).count(),
+        'failed': pending.filter(attempts__gte=MAX_ATTEMPTS).count(),
+        'lag_seconds': round(lag, 3),
+        'worker': _worker_mode(),
+    }
@@ -1,5 +1,19 @@
+from django.db.models import F, Prefetch
 from rest_framework import serializers
-from .models import FeedbackRecord, FeedbackPieceDetail, EvaluationTask
+from .models import FeedbackRecord, FeedbackPieceDetail, EvaluationTask, StudentCourseProgress
+
+# FeedbackRecordSerializer 实际读取的列（.only() 裁剪，不加载 search_tokens 等大字段）
+FEEDBACK_RECORD_COLUMNS = (
+    'id', 'task_id', 'student_id', 'teacher_id',
+    'teacher_content', 'researcher_feedback', 'produce_impression', 'impression_text',
+    'created_at', 'updated_at', 'created_by_id', 'updated_by_id', 'deleted_at',
+    'task__status', 'student__nickname', 'teacher__name',
+)
+FEEDBACK_DETAIL_COLUMNS = (
+    'id', 'feedback_id', 'piece_id', 'course_version_id', 'lesson_version_id',
+    'created_at', 'updated_at', 'created_by_id', 'updated_by_id', 'deleted_at',
+    'piece__name',
+)
 
 class FeedbackPieceDetailSerializer(serializers.ModelSerializer):
     piece_name = serializers.ReadOnlyField(source='piece.name')
@@ -29,6 +43,16 @@ class FeedbackRecordSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'deleted_at']
 
+def feedback_serializer_queryset(queryset):
+    """
+    为 FeedbackRecordSerializer 准备查询集：学员/教师/任务走 JOIN，曲目明细（含曲目名）整页一条查询预取，
+    列表与学员弹窗的最近点评共用，语句数与条数无关
+    """
+    details = FeedbackPieceDetail.objects.select_related('piece').only(*FEEDBACK_DETAIL_COLUMNS)
+    return queryset.select_related('student', 'teacher', 'task') \
+        .only(*FEEDBACK_RECORD_COLUMNS) \
+        .prefetch_related(Prefetch('details', queryset=details))
+
 class EvaluationTaskSerializer(serializers.ModelSerializer):
     student_nickname = serializers.ReadOnlyField(source='student.nickname')
     assignee_name = serializers.ReadOnlyField(source='assignee.name')
@@ -49,17 +73,43 @@ class EvaluationTaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'deleted_at']
 
-    def get_last_teacher_content(self, obj):
+    def _feedback_value(self, obj, field):
+        # 经 task_serializer_queryset 查询的任务已带注解 feedback_<field>，不再逐行访问反向一对一
+        annotated = f'feedback_{field}'
+        if hasattr(obj, annotated):
+            return getattr(obj, annotated) or None
         # 注意：OneToOne 反向访问器在没有记录时会抛 DoesNotExist，必须捕获
         try:
             fb = obj.feedback  # related_name='feedback'
         except FeedbackRecord.DoesNotExist:
             return None
-        return fb.teacher_content or None
+        return getattr(fb, field) or None
+
+    def get_last_teacher_content(self, obj):
+        return self._feedback_value(obj, 'teacher_content')
 
     def get_last_researcher_feedback(self, obj):
-        try:
-            fb = obj.feedback
-        except FeedbackRecord.DoesNotExist:
-            return None
-        return fb.researcher_feedback or None
+        return self._feedback_value(obj, 'researcher_feedback')
+
+
+def task_serializer_queryset(queryset):
+    """
+    为 EvaluationTaskSerializer 准备查询集：学员/负责人走 JOIN，点评摘要两列经 LEFT JOIN 注解到主查询
+    """
+    return queryset.select_related('student', 'assignee').annotate(
+        feedback_teacher_content=F('feedback__teacher_content'),
+        feedback_researcher_feedback=F('feedback__researcher_feedback'),
+    )
+
+class StudentCourseProgressSerializer(serializers.ModelSerializer):
+    course_name = serializers.ReadOnlyField(source='course.name')
+
+    class Meta:
+        model = StudentCourseProgress
+        fields = [
+            'course', 'course_name',
+            'reviewed_piece_count', 'required_reviewed_count',
+            'total_piece_count', 'required_piece_count',
+            'last_reviewed_at', 'updated_at'
+        ]
+        read_only_fields = fields
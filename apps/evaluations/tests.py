@@ -1,3 +1,293 @@
-from django.test import TestCase
+import csv
+import io
+import unittest
+import uuid
+import zipfile
 
-# Create your tests here.
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.enums import PieceAttribute
+from apps.courses.models import Course, CourseVersion, Lesson, Piece
+from apps.persons.models import Person
+from apps.students.models import CourseRecord, Student
+from rest_framework.test import APITestCase
+
+from . import pipeline
+from .models import (
+    EvaluationTask, FeedbackRecord, FeedbackPieceDetail, StudentPieceStatus, PieceStatusJob, StudentCourseProgress,
+)
+
+
+class EvaluationFixtureMixin:
+    """
+    点评相关测试的公共数据构造
+    """
+
+    @classmethod
+    def make_pieces(cls, count, course_name='基础班'):
+        course = Course.objects.create(name=course_name)
+        lesson = Lesson.objects.create(course=course, name='第1课', sort_order=1)
+        return [
+            Piece.objects.create(lesson=lesson, name=f'曲目{i}', attribute=PieceAttribute.ETUDE)
+            for i in range(count)
+        ]
+
+    @classmethod
+    def make_student(cls, nickname='学员'):
+        return Student.objects.create(xiaoetong_id=uuid.uuid4().hex, nickname=nickname)
+
+    @classmethod
+    def make_feedback(cls, student, teacher, pieces=()):
+        task = EvaluationTask.objects.create(student=student, assignee=teacher, source='teacher')
+        feedback = FeedbackRecord.objects.create(
+            task=task, student=student, teacher=teacher, teacher_content='点评内容示例',
+            created_by=teacher, updated_by=teacher,
+        )
+        FeedbackPieceDetail.objects.bulk_create([FeedbackPieceDetail(feedback=feedback, piece=p) for p in pieces])
+        return feedback
+
+
+class StudentPieceStatusUpdateTests(EvaluationFixtureMixin, TestCase):
+    """
+    学员曲目状态：逐条与集合化两条路径的计数语义一致
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Person.objects.create(name='李老师')
+        cls.student = cls.make_student()
+        cls.pieces = cls.make_pieces(3)
+
+    def _counts(self):
+        return dict(
+            StudentPieceStatus.objects.filter(student=self.student, deleted_at__isnull=True)
+            .values_list('piece_id', 'review_count')
+        )
+
+    def test_update_by_feedback_counts(self):
+        first = self.make_feedback(self.student, self.teacher, self.pieces[:2])
+        second = self.make_feedback(self.student, self.teacher, self.pieces[1:])
+        self.assertEqual(StudentPieceStatus.update_by_feedback(first), 2)
+        self.assertEqual(StudentPieceStatus.update_by_feedback(second), 2)
+        counts = self._counts()
+        self.assertEqual([counts[p.id] for p in self.pieces], [1, 2, 1])
+        status = StudentPieceStatus.objects.get(student=self.student, piece=self.pieces[1])
+        self.assertEqual(status.last_feedback_id, second.id)
+        self.assertEqual(status.created_by_id, self.teacher.id)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', '集合化 upsert 依赖 PostgreSQL')
+    def test_set_based_matches_loop(self):
+        other = self.make_student('对照学员')
+        with CaptureQueriesContext(connection) as single:
+            StudentPieceStatus.update_by_feedbacks([self.make_feedback(other, self.teacher, self.pieces[:1])])
+        feedbacks = [self.make_feedback(self.student, self.teacher, self.pieces) for _ in range(2)]
+        with CaptureQueriesContext(connection) as batch:
+            processed = StudentPieceStatus.update_by_feedbacks(feedbacks)
+        self.assertEqual(processed, 6)
+        self.assertEqual(len(single.captured_queries), len(batch.captured_queries))
+        self.assertEqual(set(self._counts().values()), {2})
+        self.assertEqual(
+            StudentPieceStatus.objects.get(student=self.student, piece=self.pieces[0]).last_feedback_id,
+            feedbacks[1].id,
+        )
+        StudentPieceStatus._update_by_feedback_loop(feedbacks[0])
+        self.assertEqual(set(self._counts().values()), {3})
+
+
+@override_settings(PIECE_STATUS_WORKER='command')
+class PieceStatusPipelineTests(EvaluationFixtureMixin, APITestCase):
+    """
+    提交点评 → 入队 → 批量消费：重复消费与重复入队都不会重复计数
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(username='teacher_li', password='x')
+        cls.user = user
+        cls.teacher = Person.objects.create(name='李老师', user=user)
+        cls.student = cls.make_student()
+        cls.pieces = cls.make_pieces(2)
+
+    def _submit(self):
+        task = EvaluationTask.objects.create(student=self.student, assignee=self.teacher, source='teacher')
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                f'/api/v1/tasks/{task.id}/submit/',
+                {'teacher_content': '本次回课整体不错', 'piece_ids': [str(p.id) for p in self.pieces]},
+                format='json',
+            )
+        self.assertEqual(resp.status_code, 201)
+        return resp.data['id']
+
+    def test_submit_enqueues_and_worker_is_idempotent(self):
+        feedback_id = self._submit()
+        self.assertFalse(StudentPieceStatus.objects.exists())
+        self.assertEqual(pipeline.queue_metrics()['pending'], 1)
+
+        pipeline.enqueue_piece_status_update(feedback_id)  # 重复入队被吸收
+        self.assertEqual(pipeline.drain_piece_status_queue(), 1)
+        self.assertEqual(pipeline.drain_piece_status_queue(), 0)
+        self.assertEqual(
+            set(StudentPieceStatus.objects.values_list('review_count', flat=True)), {1}
+        )
+        self.assertIsNotNone(PieceStatusJob.objects.get(feedback_id=feedback_id).processed_at)
+        self.assertEqual(pipeline.queue_metrics()['lag_seconds'], 0.0)
+
+    def test_metrics_endpoint(self):
+        self._submit()
+        self._submit()
+        resp = self.client.get('/api/v1/ops/piece-status-queue')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['pending'], 2)
+        pipeline.drain_piece_status_queue(batch_size=1)
+        self.assertEqual(
+            set(StudentPieceStatus.objects.values_list('review_count', flat=True)), {2}
+        )
+
+    def test_progress_refreshed_from_feedback_events(self):
+        Piece.objects.create(lesson=self.pieces[0].lesson, name='选修曲', attribute=PieceAttribute.MUSIC, is_required=False)
+        self._submit()
+        pipeline.drain_piece_status_queue()
+        progress = StudentCourseProgress.objects.get(student=self.student)
+        self.assertEqual((progress.reviewed_piece_count, progress.total_piece_count), (2, 3))
+        self.assertEqual((progress.required_reviewed_count, progress.required_piece_count), (2, 2))
+        self.assertIsNotNone(progress.last_reviewed_at)
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(f'/api/v1/students/{self.student.id}/progress/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data[0]['course'], progress.course_id)
+
+    def test_refresh_command_covers_enrolled_courses(self):
+        other_course = Course.objects.create(name='中级班')
+        CourseRecord.objects.create(
+            student=self.student, course=other_course, start_at=timezone.now(),
+            course_version=CourseVersion.objects.create(course=other_course, version_label='2025版'),
+        )
+        call_command('refresh_student_progress', stdout=io.StringIO())
+        progress = StudentCourseProgress.objects.get(student=self.student, course=other_course)
+        self.assertEqual(progress.reviewed_piece_count, 0)
+
+
+class FeedbackExportTests(EvaluationFixtureMixin, APITestCase):
+    """
+    点评导出：流式响应、过滤参数与列表一致、XLSX 可解压
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Person.objects.create(name='李老师')
+        cls.other = Person.objects.create(name='黄老师')
+        cls.student = cls.make_student('小明')
+        cls.pieces = cls.make_pieces(2)
+        cls.mine = cls.make_feedback(cls.student, cls.teacher, cls.pieces)
+        cls.theirs = cls.make_feedback(cls.student, cls.other, cls.pieces[:1])
+
+    def _download(self, url, **params):
+        resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        return b''.join(resp.streaming_content)
+
+    def test_csv_rows_and_filters(self):
+        body = self._download('/api/v1/ops/feedbacks/export', teacher=str(self.teacher.id))
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+        self.assertEqual(rows[0][:4], ['点评时间', '学员昵称', '小鹅通ID', '点评教师'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][3], '李老师')
+        self.assertEqual(set(rows[1][4].split('、')), {p.name for p in self.pieces})
+
+        body = self._download('/api/v1/ops/feedbacks/export', q='黄')
+        self.assertEqual(len(list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))), 2)
+
+    def test_xlsx_is_valid_zip(self):
+        body = self._download('/api/v1/feedbacks/export', file_format='xlsx')
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            self.assertIsNone(zf.testzip())
+            sheet = zf.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertEqual(sheet.count('<row>'), 3)
+        self.assertIn('教研反馈', sheet)
+
+    def test_query_count_independent_of_rows(self):
+        with CaptureQueriesContext(connection) as small:
+            self._download('/api/v1/feedbacks/export')
+        for _ in range(20):
+            self.make_feedback(self.student, self.teacher, self.pieces)
+        with CaptureQueriesContext(connection) as large:
+            self._download('/api/v1/feedbacks/export')
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_bad_format(self):
+        resp = self.client.get('/api/v1/feedbacks/export', {'file_format': 'pdf'})
+        self.assertEqual(resp.status_code, 400)
+
+
+class FeedbackSerializationQueryTests(EvaluationFixtureMixin, APITestCase):
+    """
+    点评列表与学员最近点评：曲目明细整页预取，语句数与每页条数无关
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Person.objects.create(name='李老师')
+        cls.student = cls.make_student('小明')
+        pieces = cls.make_pieces(2)
+        for _ in range(100):
+            cls.make_feedback(cls.student, cls.teacher, pieces)
+
+    def _count(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), resp.json()
+
+    def test_list_query_count_constant(self):
+        small, body = self._count('/api/v1/feedbacks/', size=20)
+        large, body_large = self._count('/api/v1/feedbacks/', size=100)
+        self.assertEqual((len(body['items']), len(body_large['items'])), (20, 100))
+        self.assertEqual(small, large)
+        self.assertEqual({d['piece_name'] for d in body_large['items'][-1]['details']}, {'曲目0', '曲目1'})
+        self.assertEqual(body['items'][0]['student_nickname'], '小明')
+
+    def test_recent_feedbacks_query_count_constant(self):
+        url = f'/api/v1/students/{self.student.id}/recent_feedbacks/'
+        small, rows = self._count(url, limit=5)
+        large, rows_large = self._count(url, limit=50)
+        self.assertEqual((len(rows), len(rows_large)), (5, 50))
+        self.assertEqual(small, large)
+        self.assertEqual(len(rows_large[-1]['details']), 2)
+
+
+class TaskListQueryTests(EvaluationFixtureMixin, APITestCase):
+    """
+    任务列表：点评摘要随主查询取回，语句数与每页条数无关
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Person.objects.create(name='李老师')
+        student = cls.make_student('小明')
+        for _ in range(30):
+            cls.make_feedback(student, cls.teacher)
+        EvaluationTask.objects.bulk_create([
+            EvaluationTask(student=student, assignee=cls.teacher, source='teacher') for _ in range(30)
+        ])
+
+    def test_query_count_constant(self):
+        counts, rows = [], []
+        for size in (10, 60):
+            with CaptureQueriesContext(connection) as ctx:
+                body = self.client.get('/api/v1/tasks/', {'page_size': size}).json()
+            counts.append(len(ctx.captured_queries))
+            rows = body['results']
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(len(rows), 60)
+        contents = [row['last_teacher_content'] for row in rows]
+        self.assertEqual((contents.count('点评内容示例'), contents.count(None)), (30, 30))
+        self.assertEqual({row['last_researcher_feedback'] for row in rows}, {None})
@@ -1,7 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from .views import FeedbackRecordViewSet, OpsFeedbackExportView, ResearchFeedbackExportView, WorkloadsView, EvaluationTaskViewSet
 from django.urls import path
-from .views import EvaluationTaskBatchListView, EvaluationTaskBatchDetailView
+from .views import EvaluationTaskBatchListView, EvaluationTaskBatchDetailView, PieceStatusQueueMetricsView
 
 router = DefaultRouter()
 router.register(r'feedbacks', FeedbackRecordViewSet, basename='feedback')
@@ -14,4 +14,5 @@ urlpatterns = router.urls + [
     path('workloads', WorkloadsView.as_view(), name='research-workloads'),
     path('eval-task-batches/', EvaluationTaskBatchListView.as_view(), name='eval-task-batches'),
     path('eval-task-batches/<uuid:batch_id>/', EvaluationTaskBatchDetailView.as_view(), name='eval-task-batch-detail'),
+    path('ops/piece-status-queue', PieceStatusQueueMetricsView.as_view(), name='piece-status-queue-metrics'),
 ]
\ No newline at end of file
@@ -12,68 +12,22 @@ from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from django.db.models import Q
 from django.utils.dateparse import parse_datetime, parse_date
 from django.db.models import Count, Min, Max  # 新增聚合
 
 from .models import EvaluationTask, FeedbackRecord, FeedbackPieceDetail
-from .serializers import EvaluationTaskSerializer, FeedbackRecordSerializer, FeedbackPieceDetailSerializer
+from .exports import feedback_export_rows
+from .pipeline import enqueue_piece_status_update, queue_metrics
+from .serializers import (
+    EvaluationTaskSerializer, FeedbackRecordSerializer, FeedbackPieceDetailSerializer, feedback_serializer_queryset,
+    task_serializer_queryset,
+)
 from apps.courses.models import Piece  # 新增：用于校验与创建曲目明细
+from apps.core.export import streaming_export_response
+from apps.core.pagination import ApproximateCountMixin, KeysetPaginationMixin
+from apps.core.search import KeywordSearchFilter, search_queryset
+from apps.persons.identity import resolve_person_id
 
-def resolve_person_id(user):
-    """
-    根据当前登录用户解析 Person：
-    - 优先通过显式绑定的 OneToOne（person_profile）
-    - 其次通过 email/username 匹配 Person
-    - 若均不存在且已认证，则自动创建对应 Person 并绑定
-    - 最后在本次请求周期内把 person_id 临时挂到 user 上，便于后续使用
-    """
-    pid = getattr(user, 'person_id', None)
-    if pid:
-        return str(pid)
-
-    # 1) 优先用绑定关系
-    try:
-        linked = getattr(user, 'person_profile', None)
-    except Exception:
-        linked = None
-    if linked:
-        setattr(user, 'person_id', str(linked.id))
-        return str(linked.id)
-
-    # 2) 退回到 email/username 匹配（并顺带绑定起来）
-    try:
-        from apps.persons.models import Person
-    except Exception:
-        return None
-
-    if not getattr(user, 'is_authenticated', False):
-        return None
-
-    person = None
-    email = getattr(user, 'email', None) or None
-    if email:
-        person = Person.objects.filter(email=email).first()
-    if not person:
-        username = getattr(user, 'username', None) or None
-        if username:
-            person = Person.objects.filter(name=username).first()
-
-    # 找到就绑定
-    if person and not getattr(person, 'user_id', None):
-        person.user = user
-        try:
-            person.save(update_fields=['user'])
-        except Exception:
-            pass
-
-    # 3) 还没有就创建并绑定（可按需要改为“不创建，只报错”）
-    if not person:
-        username = getattr(user, 'username', None) or '未命名用户'
-        person = Person.objects.create(name=username, email=email, user=user)
-
-    setattr(user, 'person_id', str(person.id))
-    return str(person.id)
 
 class EvaluationTaskViewSet(viewsets.ModelViewSet):
     queryset = EvaluationTask.objects.filter(deleted_at__isnull=True).order_by('-created_at')
@@ -85,7 +39,7 @@ class EvaluationTaskViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related('student', 'assignee')
+        qs = task_serializer_queryset(super().get_queryset())
         params = self.request.query_params
         assignee_me = params.get('assignee_me')
         assignee_id = params.get('assignee_id')
@@ -185,6 +139,8 @@ class EvaluationTaskViewSet(viewsets.ModelViewSet):
                         )
                         for pid in valid_piece_ids
                     ], ignore_conflicts=True)  # 保证幂等，避免 UniqueConstraint 冲突
+                    # 学员曲目状态在事务提交后异步维护，不拖慢提交
+                    enqueue_piece_status_update(fb.id)
 
             task.status = 'completed'
             task.updated_by_id = teacher_person_id
@@ -251,77 +207,90 @@ class EvaluationTaskViewSet(viewsets.ModelViewSet):
             "created": len(objs)
         }, status=status.HTTP_201_CREATED)
 
-class FeedbackPagination(PageNumberPagination):
+class FeedbackPagination(KeysetPaginationMixin, ApproximateCountMixin, PageNumberPagination):
     page_query_param = 'page'
     page_size_query_param = 'size'
     page_size = 20
     max_page_size = 100
 
     def get_paginated_response(self, data):
+        if self.keyset:
+            return super().get_paginated_response(data)
         return Response({
             'items': data,
             'page': self.page.number,
             'size': self.get_page_size(self.request) or self.page.paginator.per_page,
             'total': self.page.paginator.count,
+            'total_approximate': self.page.paginator.count_is_approximate,
         })
 
+# 点评关键字搜索：点评内容/教研反馈 + 学员昵称/备注名/小鹅通ID + 教师姓名
+FEEDBACK_SEARCH_RELATIONS = ('student', 'teacher')
+
+
+def filter_feedback_records(qs, params, me_person_id=None, keyword=True):
+    """
+    点评记录列表与导出共用的查询参数过滤
+    - teacher_me=1|true：仅当前人员的点评
+    - student / student_id：指定学员
+    - start / end：按 created_at 范围（支持日期或日期时间）
+    - q：关键字（见 FEEDBACK_SEARCH_RELATIONS）；keyword=False 时跳过，由视图的 KeywordSearchFilter 处理
+    """
+    # 我的点评历史：teacher_me=1|true
+    teacher_me = params.get('teacher_me')
+    if teacher_me in ('1', 'true', 'True') and me_person_id:
+        qs = qs.filter(teacher_id=me_person_id)
+
+    # 指定学员：用于学员信息弹窗内加载其历史点评
+    student_id = params.get('student') or params.get('student_id')
+    if student_id:
+        qs = qs.filter(student_id=student_id)
+
+    # 时间范围（可选）：按 created_at 过滤
+    start = params.get('start')
+    end = params.get('end')
+    if start:
+        dt = parse_datetime(start)
+        if not dt:
+            d = parse_date(start)
+            if d:
+                tz = timezone.get_current_timezone()
+                dt = timezone.make_aware(datetime.datetime.combine(d, datetime.time.min), tz)
+        if dt:
+            qs = qs.filter(created_at__gte=dt)
+    if end:
+        dt = parse_datetime(end)
+        if not dt:
+            d = parse_date(end)
+            if d:
+                tz = timezone.get_current_timezone()
+                dt = timezone.make_aware(datetime.datetime.combine(d, datetime.time.max), tz)
+        if dt:
+            qs = qs.filter(created_at__lte=dt)
+
+    # 关键字别名（可选）：导出按各自的排序输出，不按相关度排序
+    q = params.get('q')
+    if q and keyword:
+        qs = search_queryset(qs, q, FEEDBACK_SEARCH_RELATIONS, rank=False)
+
+    return qs
+
+
 class FeedbackRecordViewSet(ModelViewSet):
     queryset = FeedbackRecord.objects.filter(deleted_at__isnull=True).order_by('-created_at')
     serializer_class = FeedbackRecordSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, KeywordSearchFilter]
     filterset_fields = ['student', 'teacher', 'task']
-    search_fields = ['student__nickname', 'teacher__name']
+    search_relations = FEEDBACK_SEARCH_RELATIONS
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
     pagination_class = FeedbackPagination
 
     def get_queryset(self):
-        # 选择需要的关联，避免 N+1
-        qs = FeedbackRecord.objects.filter(deleted_at__isnull=True) \
-            .select_related('student', 'teacher', 'task')
-        params = self.request.query_params
-
-        # 解析“当前人员”
-        me_person_id = resolve_person_id(self.request.user)
-
-        # 我的点评历史：teacher_me=1|true
-        teacher_me = params.get('teacher_me')
-        if teacher_me in ('1', 'true', 'True') and me_person_id:
-            qs = qs.filter(teacher_id=me_person_id)
-
-        # 指定学员：用于学员信息弹窗内加载其历史点评
-        student_id = params.get('student') or params.get('student_id')
-        if student_id:
-            qs = qs.filter(student_id=student_id)
-
-        # 时间范围（可选）：按 created_at 过滤
-        start = params.get('start')
-        end = params.get('end')
-        if start:
-            dt = parse_datetime(start)
-            if not dt:
-                d = parse_date(start)
-                if d:
-                    tz = timezone.get_current_timezone()
-                    dt = timezone.make_aware(datetime.datetime.combine(d, datetime.time.min), tz)
-            if dt:
-                qs = qs.filter(created_at__gte=dt)
-        if end:
-            dt = parse_datetime(end)
-            if not dt:
-                d = parse_date(end)
-                if d:
-                    tz = timezone.get_current_timezone()
-                    dt = timezone.make_aware(datetime.datetime.combine(d, datetime.time.max), tz)
-            if dt:
-                qs = qs.filter(created_at__lte=dt)
-
-        # 关键字别名（可选）：q -> 学员昵称/教师名
-        q = params.get('q')
-        if q:
-            qs = qs.filter(Q(student__nickname__icontains=q) | Q(teacher__name__icontains=q))
-
-        return qs
+        # 关联与曲目明细统一预取，避免 N+1
+        qs = feedback_serializer_queryset(FeedbackRecord.objects.filter(deleted_at__isnull=True))
+        return filter_feedback_records(qs, self.request.query_params, resolve_person_id(self.request.user),
+                                       keyword=False)
 
 # 新增：反馈曲目明细 ViewSet
 class FeedbackPieceDetailViewSet(ModelViewSet):
@@ -404,15 +373,44 @@ class EvaluationTaskBatchDetailView(APIView):
             'tasks': tasks,
         }, status=status.HTTP_200_OK)
 
-# 新增：运营反馈导出（占位，后续可实现CSV/Excel导出）
-class OpsFeedbackExportView(APIView):
+class _FeedbackExportView(APIView):
+    """
+    点评记录流式导出基类
+    GET ?file_format=csv|xlsx（默认 csv），其余过滤参数与点评列表一致，另支持 teacher / task
+    服务端游标分块读取（EXPORT_CHUNK_SIZE），逐行写出，内存占用与导出规模无关
+    """
+    audience = None
+
     def get(self, request):
-        return Response({'detail': 'Not implemented'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        params = request.query_params
+        qs = filter_feedback_records(
+            FeedbackRecord.objects.filter(deleted_at__isnull=True), params, resolve_person_id(request.user)
+        )
+        if params.get('teacher'):
+            qs = qs.filter(teacher_id=params['teacher'])
+        if params.get('task'):
+            qs = qs.filter(task_id=params['task'])
+        file_format = params.get('file_format') or 'csv'
+        if file_format not in ('csv', 'xlsx'):
+            return Response({'detail': 'file_format must be csv or xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+        header, rows = feedback_export_rows(qs, self.audience)
+        filename = f"feedbacks-{self.audience}-{timezone.localtime():%Y%m%d%H%M%S}"
+        return streaming_export_response(header, rows, filename, file_format=file_format, sheet_name='点评记录')
+
+
+# 运营反馈导出
+class OpsFeedbackExportView(_FeedbackExportView):
+    audience = 'ops'
 
-# 新增：教研反馈导出（占位）
-class ResearchFeedbackExportView(APIView):
+
+# 教研反馈导出（含教研反馈与印象字段）
+class ResearchFeedbackExportView(_FeedbackExportView):
+    audience = 'research'
+
+# 新增：学员曲目状态队列指标（待处理数、滞后秒数）
+class PieceStatusQueueMetricsView(APIView):
     def get(self, request):
-        return Response({'detail': 'Not implemented'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response(queue_metrics(), status=status.HTTP_200_OK)
 
 # 新增：教研工作量统计（占位）
 class WorkloadsView(APIView):
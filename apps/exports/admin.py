@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'file_format', 'status', 'processed_rows', 'total_rows', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'file_format', 'status')
+    search_fields = ('params_hash', 'requested_by__name')
+    raw_id_fields = ('requested_by',)
+    ordering = ('-created_at',)
@@ -0,0 +1,30 @@
+"""
+消费后台导出任务（ExportJob）
+
+用法：
+  python manage.py process_export_jobs            # 处理到队列为空后退出（适合 cron）
+  python manage.py process_export_jobs --forever  # 常驻轮询
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.exports.worker import drain_export_jobs
+
+
+class Command(BaseCommand):
+    help = '领取并渲染排队中的导出任务'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-jobs', type=int, default=None, help='本次最多处理的任务数')
+        parser.add_argument('--forever', action='store_true', help='常驻运行，队列为空时休眠后继续')
+        parser.add_argument('--interval', type=float, default=2.0, help='常驻模式下的轮询间隔（秒）')
+
+    def handle(self, *args, **options):
+        while True:
+            done = drain_export_jobs(max_jobs=options['max_jobs'])
+            if done or not options['forever']:
+                self.stdout.write(f'processed={done}')
+            if not options['forever']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:39
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('persons', '0003_person_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('kind', models.CharField(max_length=50, verbose_name='导出类型')),
+                ('file_format', models.CharField(default='csv', max_length=10, verbose_name='文件格式')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='导出参数')),
+                ('params_hash', models.CharField(db_index=True, max_length=64, verbose_name='参数摘要')),
+                ('status', models.CharField(choices=[('pending', '排队中'), ('running', '生成中'), ('succeeded', '已完成'), ('failed', '失败')], default='pending', max_length=20, verbose_name='状态')),
+                ('total_rows', models.IntegerField(blank=True, null=True, verbose_name='总行数')),
+                ('processed_rows', models.IntegerField(default=0, verbose_name='已处理行数')),
+                ('file_path', models.CharField(blank=True, default='', max_length=500, verbose_name='文件路径')),
+                ('file_name', models.CharField(blank=True, default='', max_length=200, verbose_name='下载文件名')),
+                ('file_size', models.BigIntegerField(blank=True, null=True, verbose_name='文件大小')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='尝试次数')),
+                ('error', models.TextField(blank=True, default='', verbose_name='错误信息')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to='persons.person', verbose_name='发起人')),
+            ],
+            options={
+                'verbose_name': '导出任务',
+                'verbose_name_plural': '导出任务',
+                'db_table': 'exports_export_job',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='idx_export_job_status'), models.Index(fields=['requested_by', 'created_at'], name='idx_export_job_requester')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ('pending', 'running'))), fields=('params_hash',), name='uq_export_job_active_params')],
+            },
+        ),
+    ]
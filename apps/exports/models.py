@@ -0,0 +1,79 @@
+import hashlib
+import json
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.enums import ExportJobStatus
+from apps.core.models import BaseModel
+
+ACTIVE_STATUSES = (ExportJobStatus.PENDING, ExportJobStatus.RUNNING)
+
+
+class ExportJob(BaseModel):
+    """
+    后台导出任务
+
+    设计说明：
+    - 参数规范化后计算 params_hash，排队中/生成中的同参数任务由部分唯一约束保证只有一个，
+      多人同时发起相同导出共享同一任务；
+    - 由 worker 分块渲染到 MEDIA_ROOT/exports/ 下的文件并记录进度，完成后按 Range 分段下载。
+    """
+    kind = models.CharField(max_length=50, verbose_name=_('导出类型'))
+    file_format = models.CharField(max_length=10, default='csv', verbose_name=_('文件格式'))
+    params = models.JSONField(default=dict, blank=True, verbose_name=_('导出参数'))
+    params_hash = models.CharField(max_length=64, db_index=True, verbose_name=_('参数摘要'))
+    status = models.CharField(
+        max_length=20,
+        choices=ExportJobStatus.choices,
+        default=ExportJobStatus.PENDING,
+        verbose_name=_('状态'),
+    )
+    requested_by = models.ForeignKey(
+        'persons.Person',
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='export_jobs',
+        verbose_name=_('发起人'),
+    )
+    total_rows = models.IntegerField(null=True, blank=True, verbose_name=_('总行数'))
+    processed_rows = models.IntegerField(default=0, verbose_name=_('已处理行数'))
+    file_path = models.CharField(max_length=500, blank=True, default='', verbose_name=_('文件路径'))
+    file_name = models.CharField(max_length=200, blank=True, default='', verbose_name=_('下载文件名'))
+    file_size = models.BigIntegerField(null=True, blank=True, verbose_name=_('文件大小'))
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_('尝试次数'))
+    error = models.TextField(blank=True, default='', verbose_name=_('错误信息'))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_('开始时间'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('完成时间'))
+
+    class Meta:
+        db_table = 'exports_export_job'
+        verbose_name = '导出任务'
+        verbose_name_plural = '导出任务'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['params_hash'],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='uq_export_job_active_params',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_export_job_status'),
+            models.Index(fields=['requested_by', 'created_at'], name='idx_export_job_requester'),
+        ]
+
+    def __str__(self):
+        return f'ExportJob<{self.kind}.{self.file_format}:{self.status}>'
+
+    @staticmethod
+    def compute_hash(kind, file_format, params):
+        payload = json.dumps([kind, file_format, params], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @property
+    def progress(self):
+        if self.status == ExportJobStatus.SUCCEEDED:
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return round(min(self.processed_rows / self.total_rows, 1.0), 4)
@@ -0,0 +1,64 @@
+"""
+导出类型注册表：kind → 查询与行生成
+
+每个导出类型提供：
+- param_keys：认可的参数；经 normalize_params 规范化（去掉空值、把“与当前人员相关”的参数展开为具体 ID）
+  后参与去重摘要，保证语义相同的请求共享同一任务；
+- build(params)：返回 (queryset, header, rows)，queryset 用于统计总行数，rows 为惰性迭代器。
+"""
+from apps.evaluations.exports import feedback_export_rows
+from apps.evaluations.models import FeedbackRecord
+from apps.students.exports import student_export_rows, students_queryset
+
+FEEDBACK_PARAM_KEYS = ('teacher', 'task', 'student', 'student_id', 'start', 'end', 'q')
+STUDENT_PARAM_KEYS = ('status', 'tags', 'tag_any', 'tag_all', 'q')
+
+
+def _feedback_builder(audience):
+    def build(params):
+        from apps.evaluations.views import filter_feedback_records
+        qs = filter_feedback_records(FeedbackRecord.objects.filter(deleted_at__isnull=True), params)
+        if params.get('teacher'):
+            qs = qs.filter(teacher_id=params['teacher'])
+        if params.get('task'):
+            qs = qs.filter(task_id=params['task'])
+        header, rows = feedback_export_rows(qs, audience)
+        return qs, header, rows
+    return build
+
+
+def _students_build(params):
+    qs = students_queryset(params)
+    header, rows = student_export_rows(qs)
+    return qs, header, rows
+
+
+EXPORT_KINDS = {
+    'feedbacks_ops': {
+        'label': '运营点评导出', 'filename': 'feedbacks-ops',
+        'param_keys': FEEDBACK_PARAM_KEYS, 'build': _feedback_builder('ops'),
+    },
+    'feedbacks_research': {
+        'label': '教研点评导出', 'filename': 'feedbacks-research',
+        'param_keys': FEEDBACK_PARAM_KEYS, 'build': _feedback_builder('research'),
+    },
+    'students_ops': {
+        'label': '运营学员导出', 'filename': 'students-ops',
+        'param_keys': STUDENT_PARAM_KEYS, 'build': _students_build,
+    },
+}
+
+FILE_FORMATS = ('csv', 'xlsx')
+
+
+def normalize_params(kind, params, person_id=None):
+    """
+    规范化导出参数：只保留该类型认可的非空参数，teacher_me 展开为具体教师 ID
+    """
+    params = dict(params or {})
+    if str(params.pop('teacher_me', '')).lower() in ('1', 'true') and person_id:
+        params['teacher'] = str(person_id)
+    return {
+        key: params[key] for key in sorted(EXPORT_KINDS[kind]['param_keys'])
+        if params.get(key) not in (None, '', [])
+    }
@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from apps.core.enums import ExportJobStatus
+from .models import ExportJob
+from .registry import EXPORT_KINDS, FILE_FORMATS
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'kind', 'file_format', 'params', 'status', 'progress', 'total_rows', 'processed_rows',
+            'file_name', 'file_size', 'error', 'requested_by', 'created_at', 'started_at', 'finished_at',
+            'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJobStatus.SUCCEEDED:
+            return None
+        return f'/api/v1/exports/{obj.id}/download/'
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=sorted(EXPORT_KINDS))
+    file_format = serializers.ChoiceField(choices=FILE_FORMATS, default='csv')
+    params = serializers.DictField(required=False, default=dict)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.core.enums import ExportJobStatus
+from apps.persons.models import Person
+from apps.students.models import Student, StudentTag
+from .models import ExportJob
+from .worker import drain_export_jobs
+
+_MEDIA_ROOT = tempfile.mkdtemp(prefix='exports-test-')
+
+
+@override_settings(EXPORT_JOB_WORKER='command', MEDIA_ROOT=_MEDIA_ROOT)
+class ExportJobTests(APITestCase):
+    """
+    后台导出：同参数共享任务、消费生成文件、进度与断点续传下载
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = Person.objects.create(name='周运营', user=get_user_model().objects.create_user(username='zhou_ops'))
+        tag = StudentTag.objects.create(name='重点关注')
+        for i in range(30):
+            student = Student.objects.create(xiaoetong_id=f'xe-{i:04d}', nickname=f'学员{i}')
+            if i % 3 == 0:
+                student.tags.add(tag)
+
+    def setUp(self):
+        self.client.force_authenticate(self.me.user)
+
+    def _create(self, **params):
+        return self.client.post(
+            '/api/v1/exports/', {'kind': 'students_ops', 'file_format': 'csv', 'params': params}, format='json'
+        )
+
+    def test_same_params_share_one_job(self):
+        first = self._create(status='', q='学员')
+        self.assertEqual(first.status_code, 201)
+        second = self._create(q='学员')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(self._create(q='学员1').status_code, 201)
+        self.assertEqual(ExportJob.objects.count(), 2)
+
+    def test_drain_renders_file_and_reports_progress(self):
+        job_id = self._create().data['id']
+        self.assertEqual(self.client.get(f'/api/v1/exports/{job_id}/download/').status_code, 409)
+
+        self.assertEqual(drain_export_jobs(), 1)
+        job = ExportJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, ExportJobStatus.SUCCEEDED)
+        self.assertEqual((job.total_rows, job.processed_rows), (30, 30))
+        self.assertTrue(os.path.exists(job.file_path))
+
+        detail = self.client.get(f'/api/v1/exports/{job_id}/').data
+        self.assertEqual(detail['progress'], 1.0)
+        # 复用期内再次请求直接拿到已完成的任务
+        self.assertEqual(self._create().data['id'], job_id)
+
+    def test_range_download(self):
+        job_id = self._create().data['id']
+        drain_export_jobs()
+        with open(ExportJob.objects.get(pk=job_id).file_path, 'rb') as fh:
+            content = fh.read()
+
+        full = self.client.get(f'/api/v1/exports/{job_id}/download/')
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(b''.join(full.streaming_content), content)
+
+        part = self.client.get(f'/api/v1/exports/{job_id}/download/', HTTP_RANGE='bytes=10-')
+        self.assertEqual(part.status_code, 206)
+        self.assertEqual(part['Content-Range'], f'bytes 10-{len(content) - 1}/{len(content)}')
+        self.assertEqual(b''.join(part.streaming_content), content[10:])
+
+        stale = self.client.get(f'/api/v1/exports/{job_id}/download/', HTTP_RANGE='bytes=10-', HTTP_IF_RANGE='"old"')
+        self.assertEqual(stale.status_code, 200)
+
+        bad = self.client.get(f'/api/v1/exports/{job_id}/download/', HTTP_RANGE=f'bytes={len(content)}-')
+        self.assertEqual(bad.status_code, 416)
+
+    def test_ops_students_export_endpoint(self):
+        resp = self.client.post('/api/v1/ops/students/export', {'file_format': 'xlsx'}, format='json')
+        self.assertEqual(resp.status_code, 202)
+        drain_export_jobs()
+        job = ExportJob.objects.get(pk=resp.data['id'])
+        self.assertEqual(job.status, ExportJobStatus.SUCCEEDED)
+        self.assertTrue(job.file_name.endswith('.xlsx'))
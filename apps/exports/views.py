@@ -0,0 +1,125 @@
+import os
+import re
+
+from django.http import StreamingHttpResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.core.enums import ExportJobStatus
+from apps.core.export import CSV_CONTENT_TYPE, XLSX_CONTENT_TYPE
+from apps.persons.identity import resolve_person_id
+from .models import ExportJob
+from .serializers import ExportJobCreateSerializer, ExportJobSerializer
+from .worker import create_or_share_job
+
+# 下载时每次读取的字节数
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _parse_range(header, size):
+    """
+    解析单段 Range 头
+
+    Returns:
+        tuple(int, int)|None|False: (start, end) 闭区间；None 表示无 Range；False 表示不可满足
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None  # 多段或非法格式：按规范可忽略，返回完整内容
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _file_chunks(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = fh.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+class ExportJobViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    后台导出任务
+    - POST   /api/v1/exports/                 { kind, file_format, params } 创建（同参数进行中任务直接共享）
+    - GET    /api/v1/exports/                 我发起的任务（?all=1 查看全部）
+    - GET    /api/v1/exports/<id>/            状态与进度
+    - GET    /api/v1/exports/<id>/download/   下载（支持 Range 断点续传）
+    """
+    queryset = ExportJob.objects.all().order_by('-created_at')
+    serializer_class = ExportJobSerializer
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list' and self.request.query_params.get('all') not in ('1', 'true'):
+            qs = qs.filter(requested_by_id=resolve_person_id(self.request.user, create=False))
+        return qs
+
+    def create(self, request, *args, **kwargs):
+        payload = ExportJobCreateSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        job, created = create_or_share_job(
+            payload.validated_data['kind'],
+            payload.validated_data['file_format'],
+            payload.validated_data['params'],
+            person_id=resolve_person_id(request.user, create=False),
+        )
+        return Response(
+            ExportJobSerializer(job).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ExportJobStatus.SUCCEEDED:
+            return Response({'detail': 'export is not ready', 'status': job.status}, status=status.HTTP_409_CONFLICT)
+        if not job.file_path or not os.path.exists(job.file_path):
+            return Response({'detail': 'export file expired'}, status=status.HTTP_410_GONE)
+
+        size = os.path.getsize(job.file_path)
+        etag = f'"{job.id}-{size}"'
+        byte_range = _parse_range(request.headers.get('Range'), size)
+        if_range = request.headers.get('If-Range')
+        if byte_range and if_range and if_range != etag:
+            byte_range = None  # 文件已变化：返回完整内容
+        if byte_range is False:
+            response = Response(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        start, end = byte_range or (0, size - 1)
+        length = max(0, end - start + 1)
+        response = StreamingHttpResponse(
+            _file_chunks(job.file_path, start, length),
+            status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            content_type=XLSX_CONTENT_TYPE if job.file_format == 'xlsx' else CSV_CONTENT_TYPE,
+        )
+        response['Content-Length'] = str(length)
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Content-Disposition'] = f'attachment; filename="{job.file_name}"'
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return response
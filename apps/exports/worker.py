@@ -0,0 +1,224 @@
+"""
+后台导出任务：创建（去重）、领取、渲染
+
+流程：
+1) create_or_share_job：规范化参数 → 摘要；已有同摘要的排队/生成中任务（或复用期内已完成的任务）则直接共享；
+2) 事务提交后唤醒进程内线程池消费（settings.EXPORT_JOB_WORKER = 'thread'），
+   或由 `python manage.py process_export_jobs` 常驻/定时消费（'command'）；
+3) 领取时 SKIP LOCKED 锁定一条排队任务置为生成中，渲染到 MEDIA_ROOT/exports/<id>.<ext>.part，
+   每 PROGRESS_EVERY 行更新一次进度，完成后原子改名并记录文件大小。
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.enums import ExportJobStatus
+from apps.core.export import iter_csv, iter_xlsx
+from apps.notifications.events import publish_event
+from .models import ACTIVE_STATUSES, ExportJob
+from .registry import EXPORT_KINDS, normalize_params
+
+logger = logging.getLogger(__name__)
+
+EVENT_EXPORT = 'export'
+PROGRESS_EVERY = 5000
+MAX_ATTEMPTS = 3
+# 生成中任务超过该秒数没有进度更新视为 worker 已退出，重新排队
+STALE_RUNNING_SECONDS = 15 * 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _worker_mode():
+    return getattr(settings, 'EXPORT_JOB_WORKER', 'thread')
+
+
+def _reuse_seconds():
+    return getattr(settings, 'EXPORT_JOB_REUSE_SECONDS', 600)
+
+
+def export_dir():
+    return os.path.join(str(settings.MEDIA_ROOT), 'exports')
+
+
+def create_or_share_job(kind, file_format, params, person_id=None):
+    """
+    创建导出任务；相同参数的进行中任务（或复用期内已完成且文件仍在的任务）直接共享
+
+    Returns:
+        tuple(ExportJob, bool): 任务与是否新建
+    """
+    params = normalize_params(kind, params, person_id)
+    params_hash = ExportJob.compute_hash(kind, file_format, params)
+
+    shared = _find_shared(params_hash)
+    if shared:
+        return shared, False
+    try:
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                kind=kind, file_format=file_format, params=params, params_hash=params_hash,
+                requested_by_id=person_id,
+            )
+    except IntegrityError:
+        # 并发下另一请求刚创建了同参数任务：部分唯一约束兜底
+        return ExportJob.objects.get(params_hash=params_hash, status__in=ACTIVE_STATUSES), False
+    transaction.on_commit(schedule_worker)
+    return job, True
+
+
+def _find_shared(params_hash):
+    active = ExportJob.objects.filter(params_hash=params_hash, status__in=ACTIVE_STATUSES).first()
+    if active:
+        return active
+    recent = ExportJob.objects.filter(
+        params_hash=params_hash,
+        status=ExportJobStatus.SUCCEEDED,
+        finished_at__gte=timezone.now() - timedelta(seconds=_reuse_seconds()),
+    ).order_by('-finished_at').first()
+    if recent and recent.file_path and os.path.exists(recent.file_path):
+        return recent
+    return None
+
+
+def schedule_worker():
+    if _worker_mode() != 'thread':
+        return
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export-jobs')
+    _executor.submit(_drain_in_thread)
+
+
+def _drain_in_thread():
+    try:
+        drain_export_jobs()
+    except Exception:
+        logger.exception('导出任务消费失败')
+    finally:
+        close_old_connections()
+        connection.close()
+
+
+def claim_next_job():
+    """
+    领取一条排队中的任务并置为生成中（SKIP LOCKED，多 worker 互不阻塞）
+    """
+    with transaction.atomic():
+        job = (ExportJob.objects.select_for_update(skip_locked=True)
+               .filter(status=ExportJobStatus.PENDING, attempts__lt=MAX_ATTEMPTS)
+               .order_by('created_at').first())
+        if job is None:
+            return None
+        job.status = ExportJobStatus.RUNNING
+        job.started_at = timezone.now()
+        job.attempts = F('attempts') + 1
+        job.save(update_fields=['status', 'started_at', 'attempts', 'updated_at'])
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """
+    渲染导出文件；失败时记录错误（未达最大尝试次数则重新排队）
+    """
+    spec = EXPORT_KINDS[job.kind]
+    os.makedirs(export_dir(), exist_ok=True)
+    path = os.path.join(export_dir(), f'{job.id}.{job.file_format}')
+    tmp_path = path + '.part'
+    try:
+        qs, header, rows = spec['build'](job.params)
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=qs.count(), updated_at=timezone.now())
+        tracked = _track_progress(job, rows)
+        if job.file_format == 'xlsx':
+            chunks = iter_xlsx(header, tracked, sheet_name=spec['label'])
+        else:
+            chunks = (part.encode('utf-8') for part in iter_csv(header, tracked))
+        with open(tmp_path, 'wb') as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        logger.exception('导出任务 %s 失败', job.id)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        job.refresh_from_db()
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJobStatus.PENDING if job.attempts < MAX_ATTEMPTS else ExportJobStatus.FAILED,
+            error=str(exc)[:2000],
+            finished_at=None if job.attempts < MAX_ATTEMPTS else timezone.now(),
+            updated_at=timezone.now(),
+        )
+        _notify(job)
+        return False
+
+    finished = timezone.now()
+    ExportJob.objects.filter(pk=job.pk).update(
+        status=ExportJobStatus.SUCCEEDED,
+        file_path=path,
+        file_name=f"{spec['filename']}-{timezone.localtime(finished):%Y%m%d%H%M%S}.{job.file_format}",
+        file_size=os.path.getsize(path),
+        error='',
+        finished_at=finished,
+        updated_at=finished,
+    )
+    _notify(job)
+    return True
+
+
+def _track_progress(job, rows):
+    processed = 0
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed, updated_at=timezone.now())
+    ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed, updated_at=timezone.now())
+
+
+def _notify(job):
+    """
+    通过实时事件通道通知发起人刷新任务状态（共享该任务的其他请求方轮询状态接口）
+    """
+    if job.requested_by_id:
+        publish_event(EVENT_EXPORT, job.pk, [job.requested_by_id], action='updated')
+
+
+def requeue_stale_jobs():
+    """
+    将长时间无进度的生成中任务重新排队（worker 进程中途退出的情况）
+
+    Returns:
+        int: 重新排队的任务数
+    """
+    return ExportJob.objects.filter(
+        status=ExportJobStatus.RUNNING,
+        updated_at__lt=timezone.now() - timedelta(seconds=STALE_RUNNING_SECONDS),
+    ).update(status=ExportJobStatus.PENDING, updated_at=timezone.now())
+
+
+def drain_export_jobs(max_jobs=None):
+    """
+    持续领取并执行任务直到队列为空（或达到 max_jobs）
+
+    Returns:
+        int: 本次执行的任务数
+    """
+    requeue_stale_jobs()
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
@@ -1,13 +1,15 @@
 from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
-from apps.core.models import AuditModel
+from apps.core.models import AuditModel, SearchIndexedModel
 from apps.core.enums import FollowUpStatus, FollowUpPurpose, FollowUpUrgency
 
 
-class FollowUpRecord(AuditModel):
+class FollowUpRecord(SearchIndexedModel, AuditModel):
     """
     回访记录
     """
+    search_index_fields = ('content', 'result')
+
     student = models.ForeignKey(
         'students.Student',
         on_delete=models.PROTECT,
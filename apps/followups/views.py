@@ -1,16 +1,16 @@
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Q
 from django.utils.dateparse import parse_datetime, parse_date
 import datetime
 
 from .models import FollowUpRecord
 from .serializers import FollowUpRecordSerializer
 from apps.core.enums import FollowUpStatus
+from apps.core.search import KeywordSearchFilter
 
 class FollowUpRecordViewSet(viewsets.ModelViewSet):
     queryset = (FollowUpRecord.objects
@@ -18,9 +18,10 @@ class FollowUpRecordViewSet(viewsets.ModelViewSet):
                 .all()
                 .order_by('-created_at'))
     serializer_class = FollowUpRecordSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, KeywordSearchFilter]
     filterset_fields = ['student', 'operator', 'status', 'urgency', 'need_follow_up']
-    search_fields = ['content', 'result']
+    # 关键字搜索（search / q）：回访内容/结果 + 学员昵称/备注名/小鹅通ID
+    search_relations = ('student',)
     ordering_fields = ['created_at', 'next_follow_up_at']
 
     @action(detail=True, methods=['post'])
@@ -61,11 +62,6 @@ class FollowUpRecordViewSet(viewsets.ModelViewSet):
         if end_at:
             qs = qs.filter(created_at__lte=end_at)
 
-        # 学员关键词搜索（昵称 / 小鹅通ID）
-        q = params.get('q')
-        if q:
-            qs = qs.filter(Q(student__nickname__icontains=q) | Q(student__xiaoetong_id__icontains=q))
-
         # 操作人过滤（别名：operator_id）
         operator_id = params.get('operator_id')
         if operator_id:
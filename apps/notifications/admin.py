@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, UnreadCounter
 
 
 @admin.register(Notification)
@@ -10,4 +10,11 @@ class NotificationAdmin(admin.ModelAdmin):
     )
     list_filter = ('type', 'is_read')
     search_fields = ('title', 'message', 'recipient__name', 'sender__name')
-    ordering = ('-created_at',)
\ No newline at end of file
+    ordering = ('-created_at',)
+
+
+@admin.register(UnreadCounter)
+class UnreadCounterAdmin(admin.ModelAdmin):
+    list_display = ('person', 'source', 'category', 'urgency', 'unread', 'updated_at')
+    list_filter = ('source', 'category', 'urgency')
+    search_fields = ('person__name',)
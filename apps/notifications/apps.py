@@ -5,4 +5,7 @@ class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notifications'
     label = 'notifications'
-    verbose_name = '系统通知'
\ No newline at end of file
+    verbose_name = '系统通知'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册实时事件推送信号
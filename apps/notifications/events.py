@@ -0,0 +1,167 @@
+"""
+实时事件（提醒 / 通知 / 公告）的进程内发布订阅
+
+设计说明：
+- 写路径在事务提交后调用 publish_event，事件进入 broker 的环形缓冲区并唤醒等待者；
+- 长轮询（WSGI）使用 broker.wait(person_id, after_id, timeout)：取出该人员（或广播）在 after_id 之后的事件，
+  没有则在条件变量上阻塞等待直到超时；
+- SSE（ASGI）使用协程 broker.wait_async：每个等待者登记一个 asyncio.Event，publish 通过
+  loop.call_soon_threadsafe 唤醒，等待期间不占用线程池线程，连接数不受执行器大小限制；
+- 事件 id 在单个 broker 内单调递增，客户端断线重连时以 Last-Event-ID / after 补发缓冲区内遗漏的事件；
+- 进程内 broker 只在单进程内可见，多进程部署时通过 settings.EVENT_BROKER 指向
+  实现了相同 publish / wait / latest_id 接口的外部 broker（如基于 Redis 的实现）替换；
+  外部 broker 未提供 wait_async 时，SSE 退回在线程中调用 wait。
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+DEFAULT_BUFFER_SIZE = 1000
+
+EVENT_REMINDER = 'reminder'
+EVENT_NOTIFICATION = 'notification'
+EVENT_ANNOUNCEMENT = 'announcement'
+
+
+class InProcessBroker:
+    """
+    进程内事件 broker：环形缓冲 + 条件变量
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self._events = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._last_id = 0
+        # 协程等待者：(事件循环, asyncio.Event)
+        self._async_waiters = set()
+
+    def latest_id(self):
+        with self._cond:
+            return self._last_id
+
+    def publish(self, kind, object_id, person_ids=None, action='created'):
+        """
+        发布事件
+
+        Args:
+            kind (str): 事件类别（reminder / notification / announcement）
+            object_id: 关联对象主键
+            person_ids (Iterable|None): 接收人员；为 None 表示广播给所有在线人员
+            action (str): 动作（created / updated）
+
+        Returns:
+            dict: 已发布的事件
+        """
+        audience = None if person_ids is None else frozenset(str(pid) for pid in person_ids)
+        with self._cond:
+            self._last_id += 1
+            event = {
+                'id': self._last_id,
+                'type': f'{kind}.{action}',
+                'object_id': str(object_id),
+                'at': timezone.now().isoformat(),
+            }
+            self._events.append((audience, event))
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, wakeup in waiters:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                with self._cond:
+                    self._async_waiters.discard((loop, wakeup))
+        return event
+
+    def _collect(self, person_id, after_id):
+        return [
+            event for audience, event in self._events
+            if event['id'] > after_id and (audience is None or person_id in audience)
+        ]
+
+    def wait(self, person_id, after_id=0, timeout=25.0):
+        """
+        读取 after_id 之后发给该人员的事件；没有则最多阻塞 timeout 秒
+
+        Returns:
+            list[dict]: 事件列表（按 id 升序），超时返回空列表
+        """
+        person_id = str(person_id)
+        with self._cond:
+            if after_id > self._last_id:
+                # broker 重启后 id 回绕：从当前位置重新开始
+                after_id = 0
+            seen = self._last_id
+            events = self._collect(person_id, after_id)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not events:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+                if self._last_id != seen:
+                    seen = self._last_id
+                    events = self._collect(person_id, after_id)
+            return events
+
+    async def wait_async(self, person_id, after_id=0, timeout=25.0):
+        """
+        wait 的协程版本：在事件循环内等待，不占用线程
+
+        Returns:
+            list[dict]: 事件列表（按 id 升序），超时返回空列表
+        """
+        person_id = str(person_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = (loop, asyncio.Event())
+        with self._cond:
+            self._async_waiters.add(waiter)
+        try:
+            while True:
+                # 先清除再读取：读取之后的 publish 一定会再次唤醒
+                waiter[1].clear()
+                with self._cond:
+                    if after_id > self._last_id:
+                        after_id = 0
+                    events = self._collect(person_id, after_id)
+                remaining = deadline - loop.time()
+                if events or remaining <= 0:
+                    return events
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    获取当前进程的 broker（settings.EVENT_BROKER 指定实现类路径）
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            path = getattr(settings, 'EVENT_BROKER', 'apps.notifications.events.InProcessBroker')
+            _broker = import_string(path)()
+        return _broker
+
+
+def publish_event(kind, object_id, person_ids=None, action='created'):
+    """
+    在当前事务提交后发布事件（无事务时立即发布），避免推送回滚的数据
+    """
+    person_ids = None if person_ids is None else list(person_ids)
+    transaction.on_commit(lambda: get_broker().publish(kind, object_id, person_ids=person_ids, action=action))
@@ -0,0 +1,32 @@
+"""
+按明细表重算未读计数表 UnreadCounter，修复写路径之外产生的漂移
+
+用法：
+  python manage.py reconcile_unread_counters
+  python manage.py reconcile_unread_counters --person <uuid> [--person <uuid> ...]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.notifications.models import Notification, UnreadCounter
+from apps.reminders.models import ReminderRecipient
+
+
+class Command(BaseCommand):
+    help = '校准提醒/通知的未读计数表（建议定时执行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--person', action='append', dest='persons', help='仅校准指定人员（可重复）')
+
+    def handle(self, *args, **options):
+        person_ids = options['persons']
+        with transaction.atomic():
+            fixed_reminders = UnreadCounter.reconcile(
+                UnreadCounter.SOURCE_REMINDER, ReminderRecipient.unread_buckets(person_ids), person_ids=person_ids
+            )
+            fixed_notifications = UnreadCounter.reconcile(
+                UnreadCounter.SOURCE_NOTIFICATION, Notification.unread_buckets(person_ids), person_ids=person_ids
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'已校准未读计数：提醒 {fixed_reminders} 行，通知 {fixed_notifications} 行'
+        ))
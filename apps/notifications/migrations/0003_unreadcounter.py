@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:19
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_auto_20250916_0225'),
+        ('persons', '0003_person_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('source', models.CharField(max_length=20, verbose_name='来源')),
+                ('category', models.CharField(max_length=50, verbose_name='分类')),
+                ('urgency', models.CharField(blank=True, default='', max_length=16, verbose_name='紧急度')),
+                ('unread', models.IntegerField(default=0, verbose_name='未读数')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unread_counters', to='persons.person', verbose_name='人员')),
+            ],
+            options={
+                'verbose_name': '未读计数',
+                'verbose_name_plural': '未读计数',
+                'db_table': 'notifications_unread_counter',
+                'constraints': [models.UniqueConstraint(fields=('person', 'source', 'category', 'urgency'), name='uq_unread_counter_bucket')],
+            },
+        ),
+    ]
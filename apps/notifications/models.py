@@ -1,8 +1,15 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from apps.core.models import AuditModel
+from apps.core.models import AuditModel, BaseModel
 from apps.core.enums import NotificationType, LinkType
 
+# 计数批量增减时单条 SQL 覆盖的最大人员数（群发场景）
+ADJUST_BATCH_SIZE = 1000
+
 
 class Notification(AuditModel):
     """
@@ -59,7 +66,181 @@ class Notification(AuditModel):
             models.Index(fields=['recipient', 'created_at'], name='idx_ntf_recipient_created'),
             models.Index(fields=['type'], name='idx_ntf_type'),
             models.Index(fields=['link_type', 'link_id'], name='idx_ntf_link'),
+            # 键集分页：(created_at, id) 倒序翻页
+            models.Index(fields=['created_at', 'id'], name='idx_ntf_created_id'),
         ]
 
     def __str__(self):
-        return f'Notification#{self.id} to={self.recipient_id} type={self.type}'
\ No newline at end of file
+        return f'Notification#{self.id} to={self.recipient_id} type={self.type}'
+
+    def save(self, *args, **kwargs):
+        """
+        新建未读通知时同步累加接收人的未读计数
+        """
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and not self.is_read and not self.is_deleted:
+                UnreadCounter.adjust(UnreadCounter.SOURCE_NOTIFICATION, {(self.recipient_id, self.type, ''): 1})
+
+    def mark_read(self, at=None):
+        """
+        标记为已读（幂等），并同步扣减未读计数
+        """
+        if self.is_read:
+            return
+        self.is_read = True
+        self.read_at = at or timezone.now()
+        with transaction.atomic():
+            self.save(update_fields=['is_read', 'read_at', 'updated_at'])
+            if not self.is_deleted:
+                UnreadCounter.adjust(UnreadCounter.SOURCE_NOTIFICATION, {(self.recipient_id, self.type, ''): -1})
+
+    @classmethod
+    def unread_buckets(cls, person_ids=None):
+        """
+        从明细表统计未读数，用于校准未读计数表
+        
+        Returns:
+            dict: {(recipient_id, type, ''): unread}
+        """
+        qs = cls.objects.filter(deleted_at__isnull=True, is_read=False)
+        if person_ids is not None:
+            qs = qs.filter(recipient_id__in=list(person_ids))
+        rows = qs.values('recipient_id', 'type').annotate(n=models.Count('id'))
+        return {(r['recipient_id'], r['type'], ''): r['n'] for r in rows}
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        软删除未读通知时同步扣减未读计数
+        """
+        was_unread = not self.is_read and not self.is_deleted
+        with transaction.atomic(using=using):
+            super().delete(using=using, keep_parents=keep_parents)
+            if was_unread:
+                UnreadCounter.adjust(UnreadCounter.SOURCE_NOTIFICATION, {(self.recipient_id, self.type, ''): -1})
+
+
+class UnreadCounter(BaseModel):
+    """
+    未读计数（提醒 / 通知）
+    
+    设计说明：
+    - 按 (人员, 来源, 分类, 紧急度) 一行，前端轮询红点时仅读取本人若干行，无需扫描明细表；
+    - 提醒：分类=ReminderCategory，紧急度=UrgencyLevel；通知：分类=NotificationType，紧急度为空；
+    - 由写路径（标记已读、批量已读、设置接收人、创建通知等）以 F 表达式增减，并发安全；
+    - 其余可能的漂移（如后台直接改数据）由 reconcile_unread_counters 命令定期修复。
+    """
+    SOURCE_REMINDER = 'reminder'
+    SOURCE_NOTIFICATION = 'notification'
+
+    person = models.ForeignKey(
+        'persons.Person',
+        on_delete=models.CASCADE,
+        related_name='unread_counters',
+        verbose_name=_('人员'),
+    )
+    source = models.CharField(max_length=20, verbose_name=_('来源'))
+    category = models.CharField(max_length=50, verbose_name=_('分类'))
+    urgency = models.CharField(max_length=16, blank=True, default='', verbose_name=_('紧急度'))
+    unread = models.IntegerField(default=0, verbose_name=_('未读数'))
+
+    class Meta:
+        db_table = 'notifications_unread_counter'
+        verbose_name = '未读计数'
+        verbose_name_plural = '未读计数'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['person', 'source', 'category', 'urgency'],
+                name='uq_unread_counter_bucket'
+            )
+        ]
+
+    def __str__(self):
+        return f'UnreadCounter<{self.person_id}:{self.source}:{self.category}:{self.urgency}>={self.unread}'
+
+    @classmethod
+    def adjust(cls, source, deltas):
+        """
+        批量增减未读计数
+        
+        Args:
+            source (str): 来源（SOURCE_REMINDER / SOURCE_NOTIFICATION）
+            deltas (dict): {(person_id, category, urgency): delta}
+        
+        说明：先以 ignore_conflicts 补齐缺失的计数行，再按 (分类, 紧急度, 增量) 分组各执行一条 UPDATE
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        cls.objects.bulk_create(
+            [cls(person_id=pid, source=source, category=cat, urgency=urg or '') for pid, cat, urg in deltas],
+            batch_size=ADJUST_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        groups = defaultdict(list)
+        for (pid, cat, urg), delta in deltas.items():
+            groups[(cat, urg or '', delta)].append(pid)
+        now = timezone.now()
+        for (cat, urg, delta), person_ids in groups.items():
+            for start in range(0, len(person_ids), ADJUST_BATCH_SIZE):
+                cls.objects.filter(
+                    source=source, category=cat, urgency=urg, person_id__in=person_ids[start:start + ADJUST_BATCH_SIZE]
+                ).update(unread=F('unread') + delta, updated_at=now)
+
+    @classmethod
+    def summary(cls, person_id, source):
+        """
+        读取某人某来源的未读汇总（一条按唯一索引前缀的查询）
+        
+        Returns:
+            dict: {'total': n, 'by_category': {...}, 'by_urgency': {...}}
+        """
+        total = 0
+        by_category = defaultdict(int)
+        by_urgency = defaultdict(int)
+        rows = cls.objects.filter(person_id=person_id, source=source).values_list('category', 'urgency', 'unread')
+        for category, urgency, unread in rows:
+            if unread <= 0:
+                continue
+            total += unread
+            by_category[category] += unread
+            if urgency:
+                by_urgency[urgency] += unread
+        return {'total': total, 'by_category': dict(by_category), 'by_urgency': dict(by_urgency)}
+
+    @classmethod
+    def reconcile(cls, source, actual, person_ids=None):
+        """
+        用明细表重新统计出的真实未读数覆盖计数表
+        
+        Args:
+            source (str): 来源
+            actual (dict): {(person_id, category, urgency): unread}
+            person_ids (Iterable|None): 仅修复这些人员；为空表示全量
+        
+        Returns:
+            int: 被修正的计数行数
+        """
+        existing_qs = cls.objects.filter(source=source)
+        if person_ids is not None:
+            existing_qs = existing_qs.filter(person_id__in=list(person_ids))
+        existing = {
+            (pid, cat, urg): unread
+            for pid, cat, urg, unread in existing_qs.values_list('person_id', 'category', 'urgency', 'unread')
+        }
+        fixes = {}
+        for key in set(existing) | set(actual):
+            want = actual.get(key, 0)
+            if existing.get(key, 0) != want:
+                fixes[key] = want
+        if not fixes:
+            return 0
+        cls.objects.bulk_create(
+            [cls(person_id=pid, source=source, category=cat, urgency=urg, unread=n) for (pid, cat, urg), n in fixes.items()],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['person', 'source', 'category', 'urgency'],
+            update_fields=['unread', 'updated_at'],
+        )
+        return len(fixes)
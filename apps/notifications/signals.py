@@ -0,0 +1,50 @@
+"""
+通知应用信号
+提醒 / 接收人 / 通知 / 公告保存后向实时事件通道发布事件
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.announcements.models import Announcement
+from apps.reminders.models import Reminder, ReminderRecipient
+from .events import EVENT_ANNOUNCEMENT, EVENT_NOTIFICATION, EVENT_REMINDER, publish_event
+from .models import Notification
+
+# set_recipients 等内部刷新只改这些字段，不视为内容更新
+INTERNAL_REMINDER_FIELDS = {'e2e_type', 'updated_at', 'updated_by'}
+
+
+@receiver(post_save, sender=Reminder)
+def reminder_saved(sender, instance, created, **kwargs):
+    """
+    新建提醒的接收人由 Reminder._add_recipients（批量写入）或 ReminderRecipient 的信号覆盖；
+    这里只推送已有提醒的内容更新
+    """
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= INTERNAL_REMINDER_FIELDS:
+        return
+    if created:
+        if instance.receiver_id:
+            publish_event(EVENT_REMINDER, instance.pk, [instance.receiver_id])
+        return
+    person_ids = list(instance.recipients.filter(deleted_at__isnull=True).values_list('person_id', flat=True))
+    if person_ids:
+        publish_event(EVENT_REMINDER, instance.pk, person_ids, action='updated')
+
+
+@receiver(post_save, sender=ReminderRecipient)
+def reminder_recipient_saved(sender, instance, created, **kwargs):
+    if created and instance.deleted_at is None:
+        publish_event(EVENT_REMINDER, instance.reminder_id, [instance.person_id])
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    if created:
+        publish_event(EVENT_NOTIFICATION, instance.pk, [instance.recipient_id])
+
+
+@receiver(post_save, sender=Announcement)
+def announcement_saved(sender, instance, created, **kwargs):
+    # 公告面向全体教师：广播
+    publish_event(EVENT_ANNOUNCEMENT, instance.pk, None, action='created' if created else 'updated')
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, SimpleTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.announcements.models import Announcement
+from apps.core.enums import AnnouncementType, NotificationType
+from apps.persons.models import Person
+from apps.reminders.models import Reminder
+from . import events
+from .models import Notification, UnreadCounter
+
+
+class NotificationUnreadSummaryTests(APITestCase):
+    """
+    通知未读汇总：创建 / 已读 / 删除同步维护计数表
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = Person.objects.create(name='李老师', user=get_user_model().objects.create_user(username='li_teacher'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.me.user)
+
+    def _notify(self, type_=NotificationType.TASK_ASSIGNED):
+        return Notification.objects.create(type=type_, message='您有新的点评任务', recipient=self.me)
+
+    def _summary(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get('/api/notifications/notifications/unread-summary/')
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    def test_counters_follow_lifecycle(self):
+        first = self._notify()
+        self._notify()
+        third = self._notify(NotificationType.ANNOUNCEMENT_PUBLISHED)
+        self.assertEqual(self._summary(), {'total': 3, 'by_type': {'task_assigned': 2, 'announcement_published': 1}})
+
+        resp = self.client.post(f'/api/notifications/notifications/{first.id}/mark_read/')
+        self.assertEqual(resp.status_code, 200)
+        first.refresh_from_db()
+        first.mark_read()  # 幂等
+        third.delete()
+        self.assertEqual(self._summary(), {'total': 1, 'by_type': {'task_assigned': 1}})
+
+    def test_reconcile(self):
+        self._notify()
+        Notification.objects.update(is_read=True)
+        self.assertEqual(UnreadCounter.reconcile(UnreadCounter.SOURCE_NOTIFICATION, Notification.unread_buckets()), 1)
+        self.assertEqual(self._summary()['total'], 0)
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    """
+    进程内 broker：按人员过滤、游标续读、超时与唤醒
+    """
+
+    def test_audience_and_cursor(self):
+        broker = events.InProcessBroker()
+        first = broker.publish(events.EVENT_REMINDER, 'r1', ['p1'])
+        broker.publish(events.EVENT_REMINDER, 'r2', ['p2'])
+        third = broker.publish(events.EVENT_ANNOUNCEMENT, 'a1')
+        self.assertEqual([e['object_id'] for e in broker.wait('p1', 0, timeout=0)], ['r1', 'a1'])
+        self.assertEqual(broker.wait('p1', first['id'], timeout=0), [third])
+        self.assertEqual(broker.wait('p1', third['id'], timeout=0.01), [])
+
+    def test_wait_wakes_on_publish(self):
+        broker = events.InProcessBroker()
+        timer = threading.Timer(0.05, broker.publish, args=(events.EVENT_NOTIFICATION, 'n1', ['p1']))
+        timer.start()
+        got = broker.wait('p1', 0, timeout=5)
+        timer.join()
+        self.assertEqual(got[0]['type'], 'notification.created')
+
+    def test_wait_async_wakes_without_threads(self):
+        broker = events.InProcessBroker()
+
+        async def scenario():
+            self.assertEqual(await broker.wait_async('p1', 0, timeout=0.01), [])
+            timer = threading.Timer(0.05, broker.publish, args=(events.EVENT_REMINDER, 'r1', ['p2']))
+            timer.start()
+            # 发给他人的事件不唤醒返回，等到自己的事件为止
+            waiting = asyncio.ensure_future(broker.wait_async('p1', 0, timeout=5))
+            await asyncio.sleep(0.1)
+            self.assertFalse(waiting.done())
+            broker.publish(events.EVENT_ANNOUNCEMENT, 'a1')
+            got = await waiting
+            timer.join()
+            return got
+
+        got = asyncio.run(scenario())
+        self.assertEqual([e['object_id'] for e in got], ['a1'])
+        self.assertEqual(broker._async_waiters, set())
+
+
+class EventChannelTests(APITestCase):
+    """
+    保存钩子 → broker → 长轮询 / SSE 鉴权
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = Person.objects.create(name='李老师', user=get_user_model().objects.create_user(username='li_teacher'))
+        cls.other = Person.objects.create(name='黄老师')
+
+    def setUp(self):
+        events._broker = None
+        self.client.force_authenticate(self.me.user)
+
+    def _poll(self, after):
+        resp = self.client.get('/api/notifications/events/poll/', {'after': after, 'timeout': 0})
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    def test_hooks_publish_after_commit(self):
+        cursor = self.client.get('/api/notifications/events/poll/').data['last_id']
+        with self.captureOnCommitCallbacks(execute=True):
+            reminder = Reminder.objects.create(sender=self.other, content='请关注该学员')
+            reminder.set_recipients([self.me, self.other])
+            Notification.objects.create(type=NotificationType.TASK_ASSIGNED, message='新任务', recipient=self.other)
+            Announcement.objects.create(publisher=self.other, type=AnnouncementType.choices[0][0], content='本周教研会')
+        data = self._poll(cursor)
+        self.assertEqual(
+            [(e['type'], e['object_id']) for e in data['events']],
+            [('reminder.created', str(reminder.id)), ('announcement.created', data['events'][1]['object_id'])],
+        )
+        self.assertEqual(self._poll(data['last_id'])['events'], [])
+
+    def test_rolled_back_writes_not_published(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            Notification.objects.create(type=NotificationType.TASK_ASSIGNED, message='新任务', recipient=self.me)
+        self.assertEqual(self._poll(0)['events'], [])
+
+    def test_stream_requires_asgi(self):
+        # WSGI 下不建立流式连接，客户端据此立即改用长轮询
+        token = Token.objects.create(user=self.me.user)
+        resp = self.client.get('/api/notifications/events/stream/', {'token': token.key})
+        self.assertEqual(resp.status_code, 501)
+
+    async def test_stream_requires_token(self):
+        client = AsyncClient()
+        self.assertEqual((await client.get('/api/notifications/events/stream/')).status_code, 401)
+        token = await Token.objects.acreate(user=self.me.user)
+        resp = await client.get('/api/notifications/events/stream/', {'token': token.key})
+        self.assertEqual(resp['Content-Type'], 'text/event-stream')
+        first = await anext(aiter(resp.streaming_content))
+        self.assertIn(b'event: ready', first)
@@ -1,7 +1,11 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, EventPollView, event_stream
 
 router = DefaultRouter()
 router.register(r'notifications', NotificationViewSet, basename='notification')
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = [
+    path('events/stream/', event_stream, name='event-stream'),
+    path('events/poll/', EventPollView.as_view(), name='event-poll'),
+] + router.urls
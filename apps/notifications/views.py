@@ -1,13 +1,27 @@
+import json
+
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from asgiref.sync import sync_to_async
 
-from .models import Notification
+from apps.persons.identity import authenticate_token, resolve_person_id
+from .events import get_broker
+from .models import Notification, UnreadCounter
 from .serializers import NotificationSerializer
 
+# 长轮询单次最长挂起秒数；SSE 心跳间隔与单条连接最长存活秒数（到期后由浏览器自动重连）
+LONG_POLL_MAX_TIMEOUT = 30
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_LIFETIME_SECONDS = 300
+
 class NotificationViewSet(viewsets.ModelViewSet):
     queryset = (Notification.objects
                 .select_related('recipient', 'sender')
@@ -22,8 +36,98 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         obj = self.get_object()
-        if not obj.is_read:
-            obj.is_read = True
-            obj.read_at = timezone.now()
-            obj.save(update_fields=['is_read', 'read_at', 'updated_at'])
-        return Response(self.get_serializer(obj).data)
\ No newline at end of file
+        obj.mark_read()
+        return Response(self.get_serializer(obj).data)
+
+    @action(detail=False, methods=['get'], url_path='unread-summary')
+    def unread_summary(self, request):
+        """
+        当前人员的未读通知汇总（按类型），读取计数表，供前端红点轮询
+        """
+        me_person_id = resolve_person_id(request.user)
+        if not me_person_id:
+            return Response({'detail': 'person_id not found on user.'}, status=status.HTTP_400_BAD_REQUEST)
+        summary = UnreadCounter.summary(me_person_id, UnreadCounter.SOURCE_NOTIFICATION)
+        return Response({'total': summary['total'], 'by_type': summary['by_category']})
+
+
+def _parse_event_id(value):
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class EventPollView(APIView):
+    """
+    实时事件长轮询（WSGI 兼容的降级通道）
+    GET /api/notifications/events/poll/?after=<last_id>&timeout=25
+    - 不传 after：立即返回当前游标 last_id，客户端以此开始轮询
+    - 有新事件立即返回，否则挂起至 timeout 秒后返回空列表
+    """
+
+    def get(self, request):
+        me_person_id = resolve_person_id(request.user)
+        if not me_person_id:
+            return Response({'detail': 'person_id not found on user.'}, status=status.HTTP_400_BAD_REQUEST)
+        broker = get_broker()
+        after = _parse_event_id(request.query_params.get('after'))
+        if after is None:
+            return Response({'events': [], 'last_id': broker.latest_id()})
+        try:
+            timeout = min(float(request.query_params.get('timeout', 25)), LONG_POLL_MAX_TIMEOUT)
+        except ValueError:
+            timeout = 25
+        events = broker.wait(me_person_id, after_id=after, timeout=max(0.0, timeout))
+        last_id = events[-1]['id'] if events else max(after, 0)
+        return Response({'events': events, 'last_id': last_id})
+
+
+def _person_id_from_token(key):
+    user = authenticate_token(key)
+    return resolve_person_id(user) if user else None
+
+
+async def event_stream(request):
+    """
+    实时事件 SSE 推送（需 ASGI 部署，见 course_system/asgi.py）
+    GET /api/notifications/events/stream/?token=<auth token>
+    EventSource 无法设置请求头，因此 token 通过查询参数传递；
+    断线重连时浏览器自动携带 Last-Event-ID，补发 broker 缓冲区内遗漏的事件。
+    - WSGI 下流式响应会被整体收集后才下发，直接返回 501，客户端立即改用长轮询；
+    - 连接建立后先发 ready 事件，空闲时每 SSE_HEARTBEAT_SECONDS 秒发 ping 事件，供客户端判断连接是否真正可用。
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse('SSE requires ASGI; use /api/notifications/events/poll/', status=501,
+                            content_type='text/plain; charset=utf-8')
+    auth = request.headers.get('Authorization', '')
+    key = request.GET.get('token') or (auth.split(' ', 1)[1] if ' ' in auth else '')
+    me_person_id = await sync_to_async(_person_id_from_token)(key) if key else None
+    if not me_person_id:
+        return HttpResponse(status=401)
+
+    broker = get_broker()
+    after = _parse_event_id(request.headers.get('Last-Event-ID') or request.GET.get('after'))
+    if after is None:
+        after = broker.latest_id()
+
+    # 进程内 broker 在事件循环内等待；未实现 wait_async 的外部 broker 退回线程中阻塞等待
+    wait = getattr(broker, 'wait_async', None) or sync_to_async(broker.wait, thread_sensitive=False)
+
+    async def stream():
+        nonlocal after
+        yield 'retry: 3000\nevent: ready\ndata: {}\n\n'
+        started = timezone.now()
+        while (timezone.now() - started).total_seconds() < SSE_MAX_LIFETIME_SECONDS:
+            events = await wait(me_person_id, after_id=after, timeout=SSE_HEARTBEAT_SECONDS)
+            if not events:
+                yield 'event: ping\ndata: {}\n\n'
+                continue
+            for event in events:
+                after = event['id']
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
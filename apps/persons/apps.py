@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class PersonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.persons'
-    verbose_name = '人员管理'
\ No newline at end of file
+    verbose_name = '人员管理'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册身份缓存失效信号
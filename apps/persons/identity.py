@@ -0,0 +1,167 @@
+"""
+身份解析服务：token → user → person_id（及角色集合）
+
+设计说明：
+- CachedTokenAuthentication 替代 DRF 默认的 TokenAuthentication：
+  冷缓存时一条 SQL（用户 LEFT JOIN 人员、角色）同时取回用户、person_id 与角色，
+  结果按 token 缓存 IDENTITY_CACHE_TTL 秒，缓存命中时鉴权不访问数据库；
+- 认证通过后在 request.user 上挂 person_id 与 person_roles，
+  视图统一通过 resolve_person_id(request.user) 读取，不再各自查询；
+- 人员绑定、角色、账号状态变化或登出时由 signals 失效对应 token 的缓存。
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+CACHE_KEY_PREFIX = 'identity:token:'
+
+
+def _ttl():
+    return getattr(settings, 'IDENTITY_CACHE_TTL', 300)
+
+
+def _cache_key(token_key):
+    return f'{CACHE_KEY_PREFIX}{token_key}'
+
+
+def _attach(user, person_id, roles):
+    user.person_id = str(person_id) if person_id else None
+    user.person_roles = frozenset(roles)
+    return user
+
+
+def bind_person(user, create=True):
+    """
+    为未绑定人员的账号匹配（email → 姓名=用户名）并绑定 Person；
+    均不存在且 create=True 时创建并绑定
+
+    Returns:
+        Person|None
+    """
+    from apps.persons.models import Person
+
+    person = None
+    email = getattr(user, 'email', None) or None
+    if email:
+        person = Person.objects.filter(email=email).first()
+    if not person:
+        username = getattr(user, 'username', None) or None
+        if username:
+            person = Person.objects.filter(name=username).first()
+
+    # 找到就绑定
+    if person and not getattr(person, 'user_id', None):
+        person.user = user
+        try:
+            person.save(update_fields=['user'])
+        except Exception:
+            pass
+
+    # 还没有就创建并绑定（可按需要改为“不创建，只报错”）
+    if not person and create:
+        username = getattr(user, 'username', None) or '未命名用户'
+        person = Person.objects.create(name=username, email=email, user=user)
+    return person
+
+
+def load_identity(token_key=None, user_id=None):
+    """
+    一条查询取回用户及其人员、角色
+
+    Returns:
+        tuple(User, person_id|None, list[str]) | None: 用户不存在时返回 None
+    """
+    User = get_user_model()
+    qs = User.objects.annotate(
+        _person_pk=F('person_profile__id'), _role=F('person_profile__roles__role')
+    )
+    if token_key is not None:
+        qs = qs.filter(auth_token__key=token_key)
+    else:
+        qs = qs.filter(pk=user_id)
+    rows = list(qs)
+    if not rows:
+        return None
+    user = rows[0]
+    roles = sorted({row._role for row in rows if row._role})
+    return user, user._person_pk, roles
+
+
+def resolve_person_id(user, create=True):
+    """
+    解析当前登录用户的 person_id：
+    - 已由 CachedTokenAuthentication 挂载时直接返回（不查询）；
+    - 否则依次尝试显式绑定（person_profile）、email/用户名匹配，必要时创建并绑定；
+    - 结果挂到 user 上，同一请求内后续调用不再查询。
+    """
+    pid = getattr(user, 'person_id', None)
+    if pid:
+        return str(pid)
+    if not getattr(user, 'is_authenticated', False):
+        return None
+
+    try:
+        linked = getattr(user, 'person_profile', None)
+    except Exception:
+        linked = None
+    person = linked or bind_person(user, create=create)
+    if not person:
+        return None
+    user.person_id = str(person.id)
+    return user.person_id
+
+
+def authenticate_token(token_key):
+    """
+    按 token 取回带 person_id/person_roles 的用户；缓存命中时不查询数据库
+
+    Returns:
+        User|None: token 无效或账号停用时返回 None
+    """
+    key = _cache_key(token_key)
+    cached = cache.get(key)
+    if cached is not None:
+        user, person_id, roles = cached
+        return _attach(user, person_id, roles)
+
+    loaded = load_identity(token_key=token_key)
+    if loaded is None:
+        return None
+    user, person_id, roles = loaded
+    if not user.is_active:
+        return None
+    if not person_id:
+        person = bind_person(user)
+        person_id = person.id if person else None
+    cache.set(key, (user, person_id, roles), _ttl())
+    return _attach(user, person_id, roles)
+
+
+def forget_token(token_key):
+    cache.delete(_cache_key(token_key))
+
+
+def forget_user(user_id):
+    """
+    失效某账号全部 token 的身份缓存（人员绑定/角色/账号状态变更时调用）
+    """
+    from rest_framework.authtoken.models import Token
+    keys = [_cache_key(k) for k in Token.objects.filter(user_id=user_id).values_list('key', flat=True)]
+    if keys:
+        cache.delete_many(keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    带身份缓存的 Token 认证：请求头格式与 DRF TokenAuthentication 相同（Token <key>）
+    """
+
+    def authenticate_credentials(self, key):
+        user = authenticate_token(key)
+        if user is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return (user, key)
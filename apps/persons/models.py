@@ -2,11 +2,11 @@
 人员核心模型（最小化）
 """
 from django.db import models
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, SearchIndexedModel
 from apps.core.enums import EnableStatus
 from django.conf import settings  # 新增
 
-class Person(BaseModel):
+class Person(SearchIndexedModel, BaseModel):
     """
     人员（最小化字段）
     - 人员ID: UUID（继承 BaseModel.id）
@@ -15,6 +15,8 @@ class Person(BaseModel):
     - 邮箱: email（可选）
     - 电话: phone（可选）
     """
+    search_index_fields = ('name',)
+
     name = models.CharField(max_length=100, verbose_name='姓名')
     status = models.CharField(
         max_length=20,
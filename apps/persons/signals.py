@@ -0,0 +1,36 @@
+"""
+人员应用信号
+账号、人员绑定、角色或 token 变化时失效身份缓存
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .identity import forget_token, forget_user
+from .models import Person, PersonRole
+
+
+@receiver(post_save, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def person_changed(sender, instance, **kwargs):
+    if instance.user_id:
+        forget_user(instance.user_id)
+
+
+@receiver(post_save, sender=PersonRole)
+@receiver(post_delete, sender=PersonRole)
+def person_role_changed(sender, instance, **kwargs):
+    user_id = Person.objects.filter(pk=instance.person_id).values_list('user_id', flat=True).first()
+    if user_id:
+        forget_user(user_id)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    forget_token(instance.key)
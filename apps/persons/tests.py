@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.core.enums import RoleType
+from .identity import authenticate_token
+from .models import Person, PersonRole
+
+
+class IdentityCacheTests(APITestCase):
+    """
+    身份解析：冷缓存一条查询，热缓存零查询；绑定/角色/登出变化后失效
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='li_teacher', password='secret-pass')
+        cls.person = Person.objects.create(name='李老师', user=cls.user)
+        PersonRole.objects.create(person=cls.person, role=RoleType.TEACHER)
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cold_and_warm_identity_queries(self):
+        with self.assertNumQueries(1):
+            user = authenticate_token(self.token.key)
+        self.assertEqual(user.person_id, str(self.person.id))
+        self.assertEqual(user.person_roles, {RoleType.TEACHER})
+        with self.assertNumQueries(0):
+            self.assertEqual(authenticate_token(self.token.key).person_id, str(self.person.id))
+
+        # 未读汇总本身一条查询：热缓存下整个请求只有这一条
+        with self.assertNumQueries(1):
+            resp = self.client.get('/api/v1/reminders/unread-summary/')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_role_change_invalidates(self):
+        authenticate_token(self.token.key)
+        PersonRole.objects.create(person=self.person, role=RoleType.RESEARCHER)
+        self.assertEqual(authenticate_token(self.token.key).person_roles, {RoleType.TEACHER, RoleType.RESEARCHER})
+
+    def test_unbound_user_is_bound_once(self):
+        user = get_user_model().objects.create_user(username='王老师')
+        orphan = Person.objects.create(name='王老师')
+        token = Token.objects.create(user=user)
+        self.assertEqual(authenticate_token(token.key).person_id, str(orphan.id))
+        orphan.refresh_from_db()
+        self.assertEqual(orphan.user_id, user.id)
+        with self.assertNumQueries(0):
+            authenticate_token(token.key)
+
+    def test_login_warms_and_logout_invalidates(self):
+        self.client.credentials()
+        resp = self.client.post('/auth/login/', {'username': 'li_teacher', 'password': 'secret-pass'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['user']['person_id'], str(self.person.id))
+        key = resp.data['token']
+        with self.assertNumQueries(0):
+            authenticate_token(key)
+
+        self.client.post('/auth/logout/', HTTP_AUTHORIZATION=f'Token {key}')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.assertEqual(self.client.get('/api/v1/reminders/unread-summary/').status_code, 401)
@@ -8,6 +8,7 @@ from django.contrib.auth import authenticate
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
+from .identity import authenticate_token, resolve_person_id
 
 class PersonViewSet(viewsets.ModelViewSet):
     queryset = Person.objects.all().order_by('-created_at')
@@ -27,28 +28,15 @@ def login_view(request):
         # 获取或创建token
         token, created = Token.objects.get_or_create(user=user)
         
-        # 映射或创建 Person（根据 email 优先，其次 username）
-        from .models import Person
-        person = None
-        user_email = getattr(user, 'email', None) or None
-        if user_email:
-            person = Person.objects.filter(email=user_email).first()
-        if not person:
-            person = Person.objects.filter(name=user.username).first()
-        if not person:
-            person = Person.objects.create(name=user.username, email=user_email)
-
-        # 新增：若未绑定，则把该 Person 绑定到当前登录账号
-        if not getattr(person, 'user_id', None):
-            person.user = user
-            person.save(update_fields=['user'])
+        # 映射或创建 Person（根据 email 优先，其次 username），并预热该 token 的身份缓存
+        person_id = resolve_person_id(authenticate_token(token.key) or user)
 
         return Response({
             'token': token.key,
             'user': {
                 'id': user.id,
                 'username': user.username,
-                'person_id': str(person.id),
+                'person_id': str(person_id),
                 'role': role  # 或从Person模型获取实际角色
             }
         })
@@ -62,8 +50,9 @@ from .models import PersonRole
 from .serializers import PersonRoleSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination  # 新增：分页
+from apps.core.pagination import ApproximateCountMixin, KeysetPaginationMixin
 
-class LargeResultsSetPagination(PageNumberPagination):  # 新增：支持 size 参数
+class LargeResultsSetPagination(KeysetPaginationMixin, ApproximateCountMixin, PageNumberPagination):  # 新增：支持 size 参数
     page_size = 100
     page_size_query_param = 'size'
     max_page_size = 1000
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0008_evaluationtask_idx_task_created_id_and_more'),
+        ('persons', '0003_person_user'),
+        ('reminders', '0004_auto_20250916_0224'),
+        ('students', '0003_importbatch_importrowerror_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reminder',
+            name='idx_rmd_reminder_created',
+        ),
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['created_at', 'id'], name='idx_rmd_reminder_created_id'),
+        ),
+    ]
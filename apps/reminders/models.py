@@ -1,8 +1,14 @@
 from datetime import timedelta
 from django.db import models, transaction
 from django.utils import timezone
-from apps.core.models import AuditModel
+from apps.core.models import AuditModel, SearchIndexedModel
 from apps.core.enums import UrgencyLevel, ReminderCategory, EndToEndType, RoleType
+from apps.notifications.events import EVENT_REMINDER, publish_event
+from apps.notifications.models import UnreadCounter
+
+# 接收人子表分批插入的批大小；群发单次允许的最大接收人数
+RECIPIENT_BATCH_SIZE = 1000
+BROADCAST_MAX_RECIPIENTS = 10000
 
 def default_one_week_later():
     """
@@ -11,7 +17,7 @@ def default_one_week_later():
     """
     return timezone.now() + timedelta(days=7)
 
-class Reminder(AuditModel):
+class Reminder(SearchIndexedModel, AuditModel):
     """
     提醒事项
     设计说明（严格依据需求文档）：
@@ -21,6 +27,8 @@ class Reminder(AuditModel):
     - 可关联学员与点评记录，用于上下文回溯；
     - 高频筛选字段建立索引，便于后台管理与查询。
     """
+    search_index_fields = ('content',)
+
     sender = models.ForeignKey(
         'persons.Person',
         on_delete=models.PROTECT,
@@ -101,7 +109,8 @@ class Reminder(AuditModel):
             models.Index(fields=['student'], name='idx_rmd_reminder_student'),
             models.Index(fields=['start_at'], name='idx_rmd_reminder_start'),
             models.Index(fields=['end_at'], name='idx_rmd_reminder_end'),
-            models.Index(fields=['created_at'], name='idx_rmd_reminder_created'),
+            # 兼作键集分页索引：(created_at, id) 倒序翻页
+            models.Index(fields=['created_at', 'id'], name='idx_rmd_reminder_created_id'),
         ]
 
     def __str__(self):
@@ -139,26 +148,49 @@ class Reminder(AuditModel):
             return False
         return True
 
-    def _pick_role_letter(self, person):
+    @classmethod
+    def inbox_ids(cls, person_id):
+        """
+        某人收件箱内的提醒ID子查询：子表接收人 ∪ 单接收人字段。
+        
+        两路分别命中 idx_rmd_person_read 与 idx_rmd_reminder_receiver，
+        以 UNION 合并去重后作为 pk IN (...) 条件，避免 OR 跨表 JOIN 后再整行 DISTINCT。
         """
-        内部工具：取人员的“首选角色字母”（T/R/O），用于推断 e2e_type。
+        via_recipients = ReminderRecipient.objects.filter(
+            person_id=person_id, deleted_at__isnull=True
+        ).values('reminder_id')
+        via_receiver = cls.objects.filter(receiver_id=person_id).values('id')
+        return via_recipients.union(via_receiver)
+
+    @staticmethod
+    def _letter_for_roles(roles):
+        """
+        内部工具：由角色集合取“首选角色字母”（T/R/O），用于推断 e2e_type。
         若人员具备多角色，按优先级 Teacher > Researcher > Operator 选取。
         """
-        if not person:
-            return 'O'
-        try:
-            roles = set(person.roles.values_list('role', flat=True))
-        except Exception:
-            # 避免因 person 结构异常或关联未就绪导致的 AttributeError
-            return 'O'
         if RoleType.TEACHER in roles:
             return 'T'
         if RoleType.RESEARCHER in roles:
             return 'R'
-        if RoleType.OPERATOR in roles:
-            return 'O'
         return 'O'
 
+    @classmethod
+    def role_letters(cls, person_ids):
+        """
+        一次查询取一组人员的首选角色字母
+
+        Returns:
+            dict: {str(person_id): 'T'|'R'|'O'}（无角色的人员不在字典中，按 'O' 处理）
+        """
+        from apps.persons.models import PersonRole
+        person_ids = [pid for pid in person_ids if pid]
+        if not person_ids:
+            return {}
+        roles = {}
+        for pid, role in PersonRole.objects.filter(person_id__in=person_ids).values_list('person_id', 'role'):
+            roles.setdefault(str(pid), set()).add(role)
+        return {pid: cls._letter_for_roles(r) for pid, r in roles.items()}
+
     def save(self, *args, **kwargs):
         """
         重写保存：
@@ -169,22 +201,23 @@ class Reminder(AuditModel):
             self.e2e_type = self.compute_e2e_type()
         super().save(*args, **kwargs)
 
-    def compute_e2e_type(self):
+    def compute_e2e_type(self, recipient_id=None, role_map=None):
         """
         根据发送人与接收人角色计算端到端类别并返回（不保存）。
-        多接收人场景：优先取 primary receiver，如为空则取第一个子表接收人。
-        """
-        sender_letter = self._pick_role_letter(self.sender)
-        # 选择接收人来源
-        recv_person = self.receiver
-        if recv_person is None and getattr(self, 'pk', None):
-            # 仅在对象已保存（有主键）时再尝试读取子表，否则跳过以避免异常
-            try:
-                rr = self.recipients.first()
-                recv_person = rr.person if rr else None
-            except Exception:
-                recv_person = None
-        recv_letter = self._pick_role_letter(recv_person) if recv_person else 'O'
+        多接收人场景：优先取 primary receiver，其次取 recipient_id，再次取第一个子表接收人。
+
+        Args:
+            recipient_id: 调用方已知的首个接收人（避免回查子表）
+            role_map (dict|None): 预取的 role_letters 结果；为空时按需查询一次
+        """
+        recv_id = self.receiver_id or recipient_id
+        if recv_id is None and not self._state.adding:
+            # 仅在对象已保存时再尝试读取子表
+            recv_id = self.recipients.values_list('person_id', flat=True).first()
+        if role_map is None:
+            role_map = self.role_letters([self.sender_id, recv_id])
+        sender_letter = role_map.get(str(self.sender_id), 'O') if self.sender_id else 'O'
+        recv_letter = role_map.get(str(recv_id), 'O') if recv_id else 'O'
         pair = f"{sender_letter}2{recv_letter}"
         mapping = {
             'T2R': EndToEndType.T2R,
@@ -197,32 +230,108 @@ class Reminder(AuditModel):
         }
         return mapping.get(pair, EndToEndType.O2R)
 
+    def _add_recipients(self, person_ids):
+        """
+        批量写入接收人子表（分批 bulk_create），同步累加未读计数并推送一次实时事件
+        """
+        rows = [
+            ReminderRecipient(reminder=self, person_id=pid, created_by=self.created_by, updated_by=self.updated_by)
+            for pid in person_ids
+        ]
+        ReminderRecipient.objects.bulk_create(rows, batch_size=RECIPIENT_BATCH_SIZE)
+        UnreadCounter.adjust(
+            UnreadCounter.SOURCE_REMINDER,
+            {(pid, self.category, self.urgency): 1 for pid in person_ids}
+        )
+        if person_ids:
+            publish_event(EVENT_REMINDER, self.pk, person_ids)
+
+    @staticmethod
+    def _unique_person_ids(persons):
+        seen = set()
+        person_ids = []
+        for p in persons or []:
+            pid = getattr(p, 'id', p)
+            if pid and str(pid) not in seen:
+                seen.add(str(pid))
+                person_ids.append(pid)
+        return person_ids
+
     @transaction.atomic
     def set_recipients(self, persons, clear_existing=True):
         """
         便捷方法：设置多接收人子表。
         
         Args:
-            persons (Iterable[Person]): 接收人集合
+            persons (Iterable[Person|UUID]): 接收人集合（人员对象或人员ID）
             clear_existing (bool): 是否清空已有接收人（默认 True）
         """
+        person_ids = self._unique_person_ids(persons)
         if clear_existing:
+            removed_unread = self.recipients.filter(deleted_at__isnull=True, is_read=False).values_list('person_id', flat=True)
+            UnreadCounter.adjust(
+                UnreadCounter.SOURCE_REMINDER,
+                {(pid, self.category, self.urgency): -1 for pid in removed_unread}
+            )
             self.recipients.all().delete()
-        seen = set()
-        for p in persons or []:
-            if p and p.id not in seen:
-                ReminderRecipient.objects.create(reminder=self, person=p, created_by=self.created_by, updated_by=self.updated_by)
-                seen.add(p.id)
+        self._add_recipients(person_ids)
         # 接收人变化可能导致 e2e_type 变化，刷新一次
-        self.e2e_type = self.compute_e2e_type()
+        self.e2e_type = self.compute_e2e_type(recipient_id=person_ids[0] if person_ids else None)
         self.save(update_fields=['e2e_type', 'updated_at', 'updated_by'])
 
+    @classmethod
+    @transaction.atomic
+    def broadcast(cls, persons, **fields):
+        """
+        群发：创建一条提醒并批量写入接收人
+
+        - 角色只查询一次（发送人 + 首个接收人），不再逐人查询；
+        - 接收人按 RECIPIENT_BATCH_SIZE 分批插入，未读计数与实时事件各一次批量处理。
+
+        Args:
+            persons (Iterable[Person|UUID]): 接收人集合
+            **fields: Reminder 字段（sender、content、category、urgency 等）
+
+        Returns:
+            Reminder: 已创建的提醒
+        """
+        reminder = cls(**fields)
+        person_ids = cls._unique_person_ids(persons)
+        reminder.e2e_type = reminder.compute_e2e_type(recipient_id=person_ids[0] if person_ids else None)
+        reminder.save()
+        reminder._add_recipients(person_ids)
+        return reminder
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        软删除提醒：同时软删接收人子表，并扣减仍未读接收人的未读计数
+        """
+        with transaction.atomic(using=using):
+            was_deleted = self.is_deleted
+            super().delete(using=using, keep_parents=keep_parents)
+            if was_deleted:
+                return
+            live = self.recipients.filter(deleted_at__isnull=True)
+            unread = list(live.filter(is_read=False).values_list('person_id', flat=True))
+            live.update(deleted_at=self.deleted_at, updated_at=self.deleted_at)
+            UnreadCounter.adjust(
+                UnreadCounter.SOURCE_REMINDER,
+                {(pid, self.category, self.urgency): -1 for pid in unread}
+            )
+
+    @transaction.atomic
     def mark_all_read(self, at=None):
         """
         便捷方法：将本条提醒的所有接收人标记为已读（幂等）。
         """
         at = at or timezone.now()
+        unread = self.recipients.select_for_update().filter(is_read=False, deleted_at__isnull=True)
+        person_ids = list(unread.values_list('person_id', flat=True))
         self.recipients.filter(is_read=False).update(is_read=True, read_at=at, updated_at=at, updated_by=self.updated_by)
+        UnreadCounter.adjust(
+            UnreadCounter.SOURCE_REMINDER,
+            {(pid, self.category, self.urgency): -1 for pid in person_ids}
+        )
 
 
 class ReminderRecipient(AuditModel):
@@ -282,4 +391,59 @@ class ReminderRecipient(AuditModel):
         self.is_read = True
         self.read_at = at or timezone.now()
         if save:
-            self.save(update_fields=['is_read', 'read_at', 'updated_at', 'updated_by'])
\ No newline at end of file
+            with transaction.atomic():
+                # 条件更新保证并发重复标记只扣减一次未读计数
+                updated = ReminderRecipient.objects.filter(pk=self.pk, is_read=False).update(
+                    is_read=True, read_at=self.read_at, updated_at=timezone.now(), updated_by=self.updated_by
+                )
+                if updated and self.deleted_at is None:
+                    reminder = self.reminder
+                    UnreadCounter.adjust(
+                        UnreadCounter.SOURCE_REMINDER,
+                        {(self.person_id, reminder.category, reminder.urgency): -1}
+                    )
+
+    @classmethod
+    def unread_buckets(cls, person_ids=None):
+        """
+        从明细表统计未读数，用于校准未读计数表
+        
+        Returns:
+            dict: {(person_id, category, urgency): unread}
+        """
+        qs = cls.objects.filter(deleted_at__isnull=True, is_read=False, reminder__deleted_at__isnull=True)
+        if person_ids is not None:
+            qs = qs.filter(person_id__in=list(person_ids))
+        rows = qs.values('person_id', 'reminder__category', 'reminder__urgency').annotate(n=models.Count('id'))
+        return {(r['person_id'], r['reminder__category'], r['reminder__urgency']): r['n'] for r in rows}
+
+    @classmethod
+    def mark_read_bulk(cls, queryset, at=None):
+        """
+        批量标记已读并同步扣减未读计数（幂等）
+        
+        Args:
+            queryset (QuerySet[ReminderRecipient]): 待标记的接收记录
+            at (datetime|None): 读取时间
+        
+        Returns:
+            int: 实际由未读变为已读的条数
+        """
+        at = at or timezone.now()
+        with transaction.atomic():
+            rows = list(
+                queryset.filter(is_read=False).select_for_update(of=('self',))
+                .values_list('pk', 'person_id', 'deleted_at', 'reminder__category', 'reminder__urgency')
+            )
+            if not rows:
+                return 0
+            updated = cls.objects.filter(pk__in=[r[0] for r in rows], is_read=False).update(
+                is_read=True, read_at=at, updated_at=at
+            )
+            deltas = {}
+            for _, person_id, deleted_at, category, urgency in rows:
+                if deleted_at is None:
+                    key = (person_id, category, urgency)
+                    deltas[key] = deltas.get(key, 0) - 1
+            UnreadCounter.adjust(UnreadCounter.SOURCE_REMINDER, deltas)
+            return updated
\ No newline at end of file
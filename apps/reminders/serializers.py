@@ -1,6 +1,8 @@
 from rest_framework import serializers
-from .models import Reminder, ReminderRecipient
-from apps.persons.models import Person
+from .models import Reminder, ReminderRecipient, BROADCAST_MAX_RECIPIENTS
+from apps.core.enums import RoleType
+from apps.persons.models import Person, PersonRole
+from apps.notifications.models import UnreadCounter
 from apps.evaluations.serializers import FeedbackPieceDetailSerializer
 
 
@@ -43,11 +45,11 @@ class ReminderSerializer(serializers.ModelSerializer):
 
         persons = []
         if recipient_ids:
-            persons = list(Person.objects.filter(id__in=recipient_ids))
+            persons = list(Person.objects.filter(id__in=recipient_ids).values_list('id', flat=True))
 
         # 若传了 primary receiver，则并入集合，保持与子表一致
-        if reminder.receiver and all(str(p.id) != str(reminder.receiver_id) for p in persons):
-            persons = [reminder.receiver] + persons
+        if reminder.receiver_id and reminder.receiver_id not in persons:
+            persons = [reminder.receiver_id] + persons
 
         if persons:
             # 统一通过子表维护接收人并自动刷新 e2e_type
@@ -56,9 +58,70 @@ class ReminderSerializer(serializers.ModelSerializer):
             # 兼容：如果没有 recipients 但提供了 receiver，维持旧行为
             receiver = reminder.receiver
             if receiver:
-                ReminderRecipient.objects.get_or_create(
+                _, created = ReminderRecipient.objects.get_or_create(
                     reminder=reminder,
                     person=receiver,
                     defaults={'created_by': reminder.created_by, 'updated_by': reminder.updated_by}
                 )
-        return reminder
\ No newline at end of file
+                if created:
+                    UnreadCounter.adjust(
+                        UnreadCounter.SOURCE_REMINDER, {(receiver.id, reminder.category, reminder.urgency): 1}
+                    )
+        return reminder
+
+
+class ReminderBroadcastSerializer(serializers.ModelSerializer):
+    """
+    群发提醒：按角色和/或显式人员列表确定接收人，一条提醒 + 批量接收人子表
+    """
+    role = serializers.ChoiceField(choices=RoleType.choices, required=False, write_only=True)
+    recipients = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        write_only=True
+    )
+    recipient_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Reminder
+        fields = [
+            'id', 'sender', 'student', 'content', 'category', 'urgency', 'start_at', 'end_at',
+            'feedback', 'e2e_type', 'role', 'recipients', 'recipient_count', 'created_at',
+        ]
+        read_only_fields = ['id', 'e2e_type', 'created_at']
+        extra_kwargs = {
+            'sender': {'required': False},
+        }
+
+    def get_recipient_count(self, obj):
+        return getattr(obj, 'recipient_count', None)
+
+    def validate(self, attrs):
+        content = (attrs.get('content') or '').strip()
+        if not content:
+            raise serializers.ValidationError({'content': '内容不能为空'})
+        if not attrs.get('role') and not attrs.get('recipients'):
+            raise serializers.ValidationError({'recipients': '请指定接收角色或接收人'})
+        return attrs
+
+    def create(self, validated_data):
+        role = validated_data.pop('role', None)
+        recipient_ids = validated_data.pop('recipients', None) or []
+        person_ids = list(Person.objects.filter(id__in=recipient_ids).values_list('id', flat=True)) if recipient_ids else []
+        if role:
+            role_qs = PersonRole.objects.filter(role=role).order_by('person_id').values_list('person_id', flat=True)
+            sender_id = validated_data.get('sender_id') or getattr(validated_data.get('sender'), 'id', None)
+            if sender_id:
+                # 按角色群发时不给发送人自己发
+                role_qs = role_qs.exclude(person_id=sender_id)
+            person_ids.extend(role_qs)
+        person_ids = list(dict.fromkeys(person_ids))
+        if not person_ids:
+            raise serializers.ValidationError({'recipients': '没有匹配的接收人'})
+        if len(person_ids) > BROADCAST_MAX_RECIPIENTS:
+            raise serializers.ValidationError(
+                {'recipients': f'单次群发最多 {BROADCAST_MAX_RECIPIENTS} 人，当前 {len(person_ids)} 人'}
+            )
+        reminder = Reminder.broadcast(person_ids, **validated_data)
+        reminder.recipient_count = len(person_ids)
+        return reminder
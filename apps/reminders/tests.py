@@ -0,0 +1,265 @@
+import os
+import re
+import io
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.core.enums import EndToEndType, ReminderCategory, RoleType, UrgencyLevel
+from apps.courses.models import Course, CourseVersion
+from apps.notifications.models import UnreadCounter
+from apps.persons.models import Person, PersonRole
+from apps.students.models import CourseRecord, Student
+from .models import Reminder, ReminderRecipient
+
+
+class ReminderFixtureMixin:
+    """
+    提醒相关测试的公共数据构造
+    """
+
+    @classmethod
+    def make_person(cls, name, username=None):
+        user = get_user_model().objects.create_user(username=username) if username else None
+        return Person.objects.create(name=name, user=user)
+
+    @classmethod
+    def make_reminder(cls, sender, recipients=(), receiver=None, student=None, **kwargs):
+        reminder = Reminder.objects.create(
+            sender=sender, receiver=receiver, student=student, content=kwargs.pop('content', '请关注该学员'), **kwargs
+        )
+        for person in recipients:
+            ReminderRecipient.objects.create(reminder=reminder, person=person)
+        return reminder
+
+
+class ReminderInboxQueryTests(ReminderFixtureMixin, APITestCase):
+    """
+    收件箱：子表接收人 ∪ 单接收人，结果不重复且 SQL 中无 DISTINCT
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sender = cls.make_person('王老师')
+        cls.me = cls.make_person('李老师', username='li_teacher')
+        cls.other = cls.make_person('黄老师')
+        cls.student = Student.objects.create(xiaoetong_id='x-1', nickname='小明')
+        course = Course.objects.create(name='基础班')
+        cls.course = course
+        CourseRecord.objects.create(
+            student=cls.student, course=course, start_at=timezone.now(),
+            course_version=CourseVersion.objects.create(course=course, version_label='2025版'),
+        )
+        cls.via_recipient = cls.make_reminder(cls.sender, recipients=[cls.me])
+        cls.via_receiver = cls.make_reminder(cls.sender, receiver=cls.me)
+        cls.via_both = cls.make_reminder(cls.sender, recipients=[cls.me, cls.other], receiver=cls.me, student=cls.student)
+        cls.not_mine = cls.make_reminder(cls.sender, recipients=[cls.other])
+
+    def setUp(self):
+        self.client.force_authenticate(self.me.user)
+
+    def _ids(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/v1/reminders/', params)
+        self.assertEqual(resp.status_code, 200)
+        for q in ctx.captured_queries:
+            self.assertNotIn('DISTINCT', q['sql'].upper())
+        return [row['id'] for row in resp.data['results']]
+
+    def test_inbox_union_without_duplicates(self):
+        ids = self._ids(recipient_me=1)
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(
+            set(ids), {str(r.id) for r in (self.via_recipient, self.via_receiver, self.via_both)}
+        )
+
+    def test_deleted_recipient_excluded(self):
+        ReminderRecipient.objects.filter(reminder=self.via_recipient, person=self.me).update(deleted_at=timezone.now())
+        self.assertNotIn(str(self.via_recipient.id), self._ids(recipient_me=1))
+
+    def test_course_filter(self):
+        ids = self._ids(recipient_me=1, course_id=str(self.course.id))
+        self.assertEqual(ids, [str(self.via_both.id)])
+
+
+
+class ReminderUnreadSummaryTests(ReminderFixtureMixin, APITestCase):
+    """
+    未读汇总：写路径维护计数表，读取只查计数表
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sender = cls.make_person('王老师', username='wang_teacher')
+        cls.me = cls.make_person('李老师', username='li_teacher')
+        cls.other = cls.make_person('黄老师')
+
+    def setUp(self):
+        self.client.force_authenticate(self.me.user)
+
+    def _reminder(self, category=ReminderCategory.INJURY, urgency=UrgencyLevel.URGENT):
+        reminder = self.make_reminder(self.sender, category=category, urgency=urgency)
+        reminder.set_recipients([self.me, self.other])
+        return reminder
+
+    def _summary(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get('/api/v1/reminders/unread-summary/')
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    def test_counters_follow_write_paths(self):
+        first = self._reminder()
+        second = self._reminder(category=ReminderCategory.ATTITUDE, urgency=UrgencyLevel.NORMAL)
+        third = self._reminder(category=ReminderCategory.ATTITUDE, urgency=UrgencyLevel.NORMAL)
+        data = self._summary()
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['by_category'], {'injury': 1, 'attitude': 2})
+        self.assertEqual(data['by_urgency'], {'urgent': 1, 'normal': 2})
+
+        resp = self.client.post(f'/api/v1/reminders/{first.id}/read/')
+        self.assertEqual(resp.status_code, 200)
+        self.client.post(f'/api/v1/reminders/{first.id}/read/')  # 幂等，不重复扣减
+        resp = self.client.post(
+            '/api/v1/reminders/read-bulk/', {'ids': [str(second.id), str(third.id)]}, format='json'
+        )
+        self.assertEqual(resp.data['updated'], 2)
+        self.assertEqual(self._summary()['total'], 0)
+        self.assertEqual(UnreadCounter.summary(self.other.id, UnreadCounter.SOURCE_REMINDER)['total'], 3)
+
+        third.set_recipients([self.me])  # 重设接收人：移除的未读项扣减，新增项累加
+        self.assertEqual(self._summary()['total'], 1)
+        self.assertEqual(UnreadCounter.summary(self.other.id, UnreadCounter.SOURCE_REMINDER)['total'], 2)
+
+    def test_counters_follow_lifecycle(self):
+        read = self._reminder()
+        unread = self._reminder(category=ReminderCategory.ATTITUDE, urgency=UrgencyLevel.NORMAL)
+        self.client.post(f'/api/v1/reminders/{read.id}/read/')
+        self.assertEqual(UnreadCounter.summary(self.other.id, UnreadCounter.SOURCE_REMINDER)['total'], 2)
+
+        self.client.force_authenticate(self.sender.user)
+        for reminder in (read, unread):
+            self.assertEqual(self.client.delete(f'/api/v1/reminders/{reminder.id}/').status_code, 204)
+        self.client.force_authenticate(self.me.user)
+        self.assertEqual(self._summary()['total'], 0)
+        self.assertEqual(UnreadCounter.summary(self.other.id, UnreadCounter.SOURCE_REMINDER)['total'], 0)
+        # 重复删除不再扣减；明细统计与计数表一致
+        unread.delete()
+        self.assertEqual(UnreadCounter.summary(self.other.id, UnreadCounter.SOURCE_REMINDER)['total'], 0)
+        self.assertEqual(ReminderRecipient.unread_buckets(), {})
+
+    def test_reconcile_repairs_drift(self):
+        self._reminder()
+        ReminderRecipient.objects.filter(person=self.me).update(is_read=True)  # 绕过写路径
+        self.assertEqual(self._summary()['total'], 1)
+        out = io.StringIO()
+        call_command('reconcile_unread_counters', '--person', str(self.me.id), stdout=out)
+        self.assertIn('提醒 1 行', out.getvalue())
+        self.assertEqual(self._summary()['total'], 0)
+        self.assertEqual(UnreadCounter.summary(self.other.id, UnreadCounter.SOURCE_REMINDER)['total'], 1)
+
+
+
+class ReminderBroadcastTests(ReminderFixtureMixin, APITestCase):
+    """
+    群发：按角色批量写入接收人，查询数随接收人数按批增长而非逐人增长
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = cls.make_person('教研张', username='zhang_research')
+        PersonRole.objects.create(person=cls.me, role=RoleType.RESEARCHER)
+        cls.teachers = Person.objects.bulk_create([Person(name=f'教师{i}') for i in range(2500)])
+        PersonRole.objects.bulk_create([PersonRole(person=p, role=RoleType.TEACHER) for p in cls.teachers])
+
+    def setUp(self):
+        self.client.force_authenticate(self.me.user)
+
+    def _broadcast(self, **body):
+        payload = {'content': '本周五教研会', 'category': ReminderCategory.ATTITUDE, 'urgency': UrgencyLevel.NORMAL}
+        payload.update(body)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post('/api/v1/reminders/broadcast/', payload, format='json')
+        self.assertEqual(resp.status_code, 201, resp.data)
+        return resp.data, len(ctx.captured_queries)
+
+    def test_broadcast_by_role(self):
+        data, queries = self._broadcast(role=RoleType.TEACHER)
+        self.assertEqual(data['recipient_count'], 2500)
+        reminder = Reminder.objects.get(pk=data['id'])
+        self.assertEqual(reminder.sender_id, self.me.id)
+        self.assertEqual(reminder.e2e_type, EndToEndType.R2T)
+        self.assertEqual(reminder.recipients.count(), 2500)
+        self.assertEqual(UnreadCounter.summary(self.teachers[0].id, UnreadCounter.SOURCE_REMINDER)['total'], 1)
+
+        # 批量插入：查询数只与批次数相关（SQLite 受参数个数限制批次更小），远小于接收人数
+        self.assertLess(queries, 100)
+        _, few = self._broadcast(recipients=[str(p.id) for p in self.teachers[:3]])
+        self.assertLess(few, 15)
+
+    def test_broadcast_validation(self):
+        resp = self.client.post('/api/v1/reminders/broadcast/', {'content': '无接收人'}, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('recipients', resp.data)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'EXPLAIN 计划断言依赖 PostgreSQL')
+class ReminderInboxPlanTests(ReminderFixtureMixin, APITestCase):
+    """
+    大表（默认 100 万条提醒，可用 REMINDER_EXPLAIN_ROWS 调整）下收件箱查询不出现对提醒表的顺序扫描
+    """
+    rows = int(os.environ.get('REMINDER_EXPLAIN_ROWS', 1_000_000))
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sender = cls.make_person('王老师')
+        cls.me = cls.make_person('李老师', username='li_teacher')
+        crowd = [cls.make_person(f'教师{i}') for i in range(50)]
+        crowd_ids = '{%s}' % ','.join(str(p.id) for p in crowd)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO reminders_reminder
+                    (id, created_at, updated_at, sender_id, receiver_id, e2e_type, urgency, category,
+                     start_at, end_at, content)
+                SELECT md5(g::text || random()::text)::uuid,
+                       now() - g * interval '1 second', now(), %s,
+                       CASE WHEN g %% 20000 = 0 THEN %s::uuid END,
+                       'R2T', 'normal', 'other', now(), NULL, 'bulk'
+                FROM generate_series(1, %s) AS g
+                """,
+                [str(cls.sender.id), str(cls.me.id), cls.rows],
+            )
+            cursor.execute(
+                """
+                INSERT INTO reminders_reminder_recipient
+                    (id, created_at, updated_at, reminder_id, person_id, is_read)
+                SELECT md5(r.id::text || 'rr')::uuid, r.created_at, now(), r.id,
+                       CASE WHEN random() < 0.0001 THEN %s::uuid
+                            ELSE (%s::uuid[])[1 + floor(random() * 50)::int] END,
+                       false
+                FROM reminders_reminder r
+                """,
+                [str(cls.me.id), crowd_ids],
+            )
+            cursor.execute('ANALYZE reminders_reminder')
+            cursor.execute('ANALYZE reminders_reminder_recipient')
+
+    def test_inbox_plan_has_no_seq_scan(self):
+        self.client.force_authenticate(self.me.user)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get('/api/v1/reminders/', {'recipient_me': 1})
+        self.assertEqual(resp.status_code, 200)
+        selects = [q['sql'] for q in ctx.captured_queries
+                   if q['sql'].startswith('SELECT') and 'reminders_reminder' in q['sql']]
+        self.assertTrue(selects)
+        with connection.cursor() as cursor:
+            for sql in selects:
+                cursor.execute('EXPLAIN ' + sql)
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+                self.assertIsNone(re.search(r'Seq Scan on reminders_reminder(_recipient)?\b', plan), msg=plan)
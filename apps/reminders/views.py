@@ -1,8 +1,8 @@
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, Exists, OuterRef
 from apps.core.enums import EndToEndType
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -12,35 +12,26 @@ from datetime import datetime, time
 from django.core.exceptions import ObjectDoesNotExist  # 新增：避免关联对象不存在导致 500
 from rest_framework.exceptions import ValidationError  # 新增：用于在创建时返回 400
 
-from apps.persons.models import Person
+from apps.core.search import KeywordSearchFilter
+from apps.notifications.models import UnreadCounter
+from apps.persons.identity import resolve_person_id
+from apps.students.models import CourseRecord
 from .models import Reminder, ReminderRecipient
-from .serializers import ReminderSerializer
+from .serializers import ReminderSerializer, ReminderBroadcastSerializer
 
 class ReminderViewSet(viewsets.ModelViewSet):
     queryset = Reminder.objects.all().order_by('-created_at')
     serializer_class = ReminderSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, KeywordSearchFilter]
     filterset_fields = ['category', 'urgency', 'sender', 'receiver', 'student', 'e2e_type']
-    search_fields = ['content', 'student__nickname', 'student__xiaoetong_id', 'sender__name']
+    # 关键字搜索（search / q）：内容 + 学员昵称/备注名/小鹅通ID + 发送人姓名
+    search_relations = ('student', 'sender')
     ordering_fields = ['created_at', 'start_at', 'end_at', 'urgency']
 
-    # 新增：安全获取当前登录用户的 person_id，避免 RelatedObjectDoesNotExist
+    # 安全获取当前登录用户的 person_id（身份由认证阶段缓存解析，不存在时返回 None 而非 500）
     def _safe_me_person_id(self):
         try:
-            user = self.request.user
-            pid = getattr(user, 'person_id', None)
-            if pid:
-                return str(pid)
-            # 尝试通过 OneToOne 反向关系获取
-            person_profile = getattr(user, 'person_profile', None)
-            if person_profile:
-                return str(person_profile.id)
-            # 兜底查询
-            try:
-                p = Person.objects.filter(user=user).only('id').first()
-                return str(p.id) if p else None
-            except Exception:
-                return None
+            return resolve_person_id(self.request.user, create=False)
         except Exception:
             return None
 
@@ -59,10 +50,8 @@ class ReminderViewSet(viewsets.ModelViewSet):
             target_pid = recipient_id
         if target_pid:
             # 兼容：既匹配多接收人子表，也匹配单接收人字段（Admin 只填 receiver 的场景）
-            qs = qs.filter(
-                Q(recipients__person_id=target_pid, recipients__deleted_at__isnull=True) |
-                Q(receiver_id=target_pid)
-            ).distinct()
+            # 两路索引扫描 UNION 后作为 IN 子查询，无需对提醒整行 DISTINCT
+            qs = qs.filter(pk__in=Reminder.inbox_ids(target_pid))
 
         # 仅生效提醒（支持 active/include_only_active 两种参数名）
         active = params.get('active')
@@ -86,19 +75,11 @@ class ReminderViewSet(viewsets.ModelViewSet):
         # 课程过滤（通过学员课程记录关联）
         course_id = params.get('course_id')
         if course_id:
-            qs = qs.filter(
-                student__course_records__course_id=course_id,
-                student__course_records__deleted_at__isnull=True
-            ).distinct()
-
-        # 关键字搜索别名（q）：支持内容/学员昵称/小鹅通ID
-        q = params.get('q')
-        if q:
-            qs = qs.filter(
-                Q(content__icontains=q) |
-                Q(student__nickname__icontains=q) |
-                Q(student__xiaoetong_id__icontains=q)
-            )
+            qs = qs.filter(Exists(CourseRecord.objects.filter(
+                student_id=OuterRef('student_id'),
+                course_id=course_id,
+                deleted_at__isnull=True
+            )))
 
         # 教研视图：来源=教师/运营，推送给教研
         to_research = params.get('to_research')
@@ -117,7 +98,7 @@ class ReminderViewSet(viewsets.ModelViewSet):
         me_person_id = self._safe_me_person_id()  # 修改：使用安全方法
         allowed = False
         if me_person_id:
-            if instance.sender_id == me_person_id:
+            if str(instance.sender_id) == me_person_id:
                 allowed = True
             elif instance.recipients.filter(person_id=me_person_id, deleted_at__isnull=True).exists():
                 allowed = True
@@ -129,7 +110,8 @@ class ReminderViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         me_person_id = self._safe_me_person_id()  # 修改：使用安全方法
-        if not me_person_id or instance.sender_id != me_person_id:
+        # resolve_person_id 返回字符串，与 UUID 外键按字符串比较
+        if not me_person_id or str(instance.sender_id) != me_person_id:
             return Response({'detail': 'Forbidden: only sender can delete this reminder.'}, status=status.HTTP_403_FORBIDDEN)
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -164,7 +146,14 @@ class ReminderViewSet(viewsets.ModelViewSet):
         extra = {}
         if me_person_id:
             extra['updated_by_id'] = me_person_id
-        serializer.save(**extra)
+        before = (serializer.instance.category, serializer.instance.urgency)
+        instance = serializer.save(**extra)
+        if (instance.category, instance.urgency) != before:
+            # 分类/紧急度变化会使接收人的未读计数落到新的桶，按接收人重算
+            person_ids = list(instance.recipients.values_list('person_id', flat=True))
+            UnreadCounter.reconcile(
+                UnreadCounter.SOURCE_REMINDER, ReminderRecipient.unread_buckets(person_ids), person_ids=person_ids
+            )
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -215,16 +204,40 @@ class ReminderViewSet(viewsets.ModelViewSet):
         if not isinstance(ids, list) or not ids:
             return Response({'detail': 'ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
 
-        now = timezone.now()
         qs = ReminderRecipient.objects.filter(
             person_id=me_person_id,
             deleted_at__isnull=True,
             reminder_id__in=ids,
             is_read=False
         )
-        updated = qs.update(is_read=True, read_at=now)
+        updated = ReminderRecipient.mark_read_bulk(qs)
         return Response({'updated': updated})
 
+    @action(detail=False, methods=['post'], url_path='broadcast', serializer_class=ReminderBroadcastSerializer)
+    def broadcast(self, request):
+        """
+        群发提醒
+        Body: { content, category, urgency, start_at?, end_at?, student?, role?: "teacher", recipients?: [<person_id>, ...] }
+        - role 与 recipients 可同时给出，取并集（按角色时排除发送人本人）
+        - 接收人子表分批批量插入，角色一次查询，单次最多 BROADCAST_MAX_RECIPIENTS 人
+        返回：提醒基本信息 + recipient_count
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='unread-summary')
+    def unread_summary(self, request):
+        """
+        当前用户的未读提醒汇总（总数 / 按分类 / 按紧急度）
+        直接读取未读计数表，供前端红点轮询，不扫描提醒明细
+        """
+        me_person_id = self._safe_me_person_id()
+        if not me_person_id:
+            return Response({'detail': 'person_id not found on user.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(UnreadCounter.summary(me_person_id, UnreadCounter.SOURCE_REMINDER))
+
     @action(detail=True, methods=['post'], url_path='snooze')
     def snooze(self, request, pk=None):
         """
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import Student, StudentTag
-from .models import CourseRecord
+from .models import CourseRecord, ImportBatch
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
@@ -28,4 +28,12 @@ class CourseRecordAdmin(admin.ModelAdmin):
     list_display = ('id', 'student', 'course', 'course_version', 'course_status', 'record_status', 'start_at', 'end_at', 'created_at')
     list_filter = ('course_status', 'record_status', 'course')
     search_fields = ('student__nickname', 'student__xiaoetong_id', 'course__name')
-    ordering = ('-start_at',)
\ No newline at end of file
+    ordering = ('-start_at',)
+
+@admin.register(ImportBatch)
+class ImportBatchAdmin(admin.ModelAdmin):
+    list_display = ('file_name', 'status', 'total_rows', 'new_count', 'changed_count', 'error_count', 'created_by', 'created_at', 'committed_at')
+    list_filter = ('status', 'file_format')
+    search_fields = ('file_name',)
+    raw_id_fields = ('created_by',)
+    ordering = ('-created_at',)
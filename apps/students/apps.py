@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.students'
-    verbose_name = '学员'
\ No newline at end of file
+    verbose_name = '学员'
+
+    def ready(self):
+        from . import signals  # noqa: F401  注册标签名冗余列维护信号
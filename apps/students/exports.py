@@ -0,0 +1,55 @@
+"""
+学员导出：列定义与逐行生成（服务端游标分块读取）
+"""
+from apps.core.search import search_queryset
+
+from .models import Student
+from .tags import filter_tag_params
+
+EXPORT_CHUNK_SIZE = 2000
+
+STUDENT_COLUMNS = [
+    ('小鹅通ID', lambda s: s.xiaoetong_id),
+    ('昵称', lambda s: s.nickname),
+    ('备注名', lambda s: s.remark_name),
+    ('状态', lambda s: s.get_status_display()),
+    ('标签', lambda s: '、'.join(s.tag_names)),
+    ('教师印象（当前）', lambda s: s.teacher_impression_current),
+    ('运营备注', lambda s: s.op_note),
+    ('创建时间', lambda s: s.created_at),
+]
+
+
+def filter_students(qs, params):
+    """
+    学员导出过滤：status、tags（可多值，逗号分隔）、tag_any / tag_all（标签名，与列表一致）、q（昵称/小鹅通ID/备注名）
+    """
+    if params.get('status'):
+        qs = qs.filter(status=params['status'])
+    tags = params.get('tags')
+    if tags:
+        tag_ids = tags if isinstance(tags, list) else [t for t in str(tags).split(',') if t]
+        qs = qs.filter(tags__in=tag_ids).distinct()
+    qs = filter_tag_params(qs, params)
+    q = params.get('q')
+    if q:
+        qs = search_queryset(qs, q, rank=False)
+    return qs
+
+
+def student_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Returns:
+        tuple(list[str], Iterator[list]): 表头与惰性数据行
+    """
+    qs = queryset.order_by('-created_at', 'id')
+
+    def rows():
+        for student in qs.iterator(chunk_size=chunk_size):
+            yield [getter(student) for _, getter in STUDENT_COLUMNS]
+
+    return [title for title, _ in STUDENT_COLUMNS], rows()
+
+
+def students_queryset(params):
+    return filter_students(Student.objects.all(), params)
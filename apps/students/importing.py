@@ -0,0 +1,277 @@
+"""
+学员批量导入：流式解析 → 分块比对 → 批量落库
+
+流程：
+1) 预览：上传文件暂存到 MEDIA_ROOT/imports/<batch_id>.<ext>，逐行解析；
+   每 IMPORT_CHUNK_SIZE 行按 xiaoetong_id 一次批量查询已有学员，分为 新增 / 变更 / 未变化 / 错误，
+   行级错误批量写入 ImportRowError，返回计数与部分差异样例；
+2) 提交：重新读取暂存文件并按当前数据再比对一次（预览后可能有人修改），
+   新增与变更行用 bulk_create(update_conflicts=True, unique_fields=['xiaoetong_id']) 一条语句落库。
+
+列映射（表头，大小写不敏感）：小鹅通ID（必填）、昵称（新增时必填）、备注名、运营备注；
+单元格为空表示“不修改该字段”。
+"""
+import os
+import zipfile
+from xml.etree.ElementTree import ParseError
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.enums import ImportBatchStatus
+from apps.core.tabular import iter_table_rows
+from .models import ImportBatch, ImportRowError, Student
+
+IMPORT_CHUNK_SIZE = 2000
+# 预览返回的差异/错误样例条数
+PREVIEW_SAMPLE_SIZE = 50
+
+COLUMN_ALIASES = {
+    'xiaoetong_id': ('小鹅通id', '用户id', 'xiaoetong_id', 'user_id'),
+    'nickname': ('昵称', '用户昵称', 'nickname'),
+    'remark_name': ('备注名', '备注', 'remark_name'),
+    'op_note': ('运营备注', 'op_note'),
+}
+# 可由导入写入的学员字段（不含唯一键）
+IMPORT_FIELDS = ('nickname', 'remark_name', 'op_note')
+FIELD_MAX_LENGTH = {'xiaoetong_id': 64, 'nickname': 100, 'remark_name': 100}
+
+ACTION_NEW = 'new'
+ACTION_CHANGED = 'changed'
+ACTION_UNCHANGED = 'unchanged'
+
+
+class ImportFormatError(ValueError):
+    """
+    文件整体不可导入（格式错误、缺少必需列）
+    """
+
+
+def import_dir():
+    return os.path.join(str(settings.MEDIA_ROOT), 'imports')
+
+
+def save_upload(upload, batch_id, file_format):
+    """
+    分块写出上传文件，返回暂存路径
+    """
+    os.makedirs(import_dir(), exist_ok=True)
+    path = os.path.join(import_dir(), f'{batch_id}.{file_format}')
+    with open(path, 'wb') as fh:
+        for chunk in upload.chunks():
+            fh.write(chunk)
+    return path
+
+
+def map_header(header):
+    """
+    Returns:
+        dict: 字段名 → 列下标（只含文件中出现的字段）
+    """
+    normalized = [str(title).strip().lower() for title in header]
+    mapping = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for index, title in enumerate(normalized):
+            if title in aliases:
+                mapping[field] = index
+                break
+    if 'xiaoetong_id' not in mapping:
+        raise ImportFormatError('缺少必需列：小鹅通ID')
+    return mapping
+
+
+def iter_chunks(path, file_format, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    逐块产出 [(行号, {字段: 值}), ...]；行号按表格习惯从表头=1 计
+    """
+    try:
+        rows = iter_table_rows(path, file_format)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFormatError('文件为空')
+        mapping = map_header(header)
+        chunk = []
+        for row_number, row in enumerate(rows, start=2):
+            if not any(row):
+                continue
+            chunk.append((row_number, {
+                field: row[index] if index < len(row) else '' for field, index in mapping.items()
+            }))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    except ImportFormatError:
+        raise
+    except (OSError, UnicodeDecodeError, ValueError, ParseError, zipfile.BadZipFile, KeyError) as exc:
+        raise ImportFormatError(f'文件无法解析：{exc}') from exc
+
+
+def _validate(values, existing):
+    xiaoetong_id = values.get('xiaoetong_id', '')
+    if not xiaoetong_id:
+        return '小鹅通ID为空'
+    for field, limit in FIELD_MAX_LENGTH.items():
+        if len(values.get(field) or '') > limit:
+            return f'{field} 超过 {limit} 个字符'
+    if existing is None and not values.get('nickname'):
+        return '新学员缺少昵称'
+    return None
+
+
+def diff_chunk(chunk, seen_ids):
+    """
+    对一块数据做一次批量查询并分类
+
+    Args:
+        chunk (list): iter_chunks 产出的一块
+        seen_ids (set): 文件中已出现过的 xiaoetong_id（跨块检测重复，会被更新）
+
+    Returns:
+        list[tuple]: (行号, 动作或 None, 合并后的字段值, 变更明细 或 错误信息)
+    """
+    ids = {values['xiaoetong_id'] for _, values in chunk if values.get('xiaoetong_id')}
+    existing = {
+        row['xiaoetong_id']: row
+        for row in Student.objects.filter(xiaoetong_id__in=ids).values('xiaoetong_id', *IMPORT_FIELDS)
+    }
+    results = []
+    for row_number, values in chunk:
+        xiaoetong_id = values.get('xiaoetong_id', '')
+        current = existing.get(xiaoetong_id)
+        message = _validate(values, current)
+        if message is None and xiaoetong_id in seen_ids:
+            message = '文件内小鹅通ID重复'
+        if message:
+            results.append((row_number, None, values, message))
+            continue
+        seen_ids.add(xiaoetong_id)
+
+        if current is None:
+            merged = {field: values.get(field) or None for field in IMPORT_FIELDS}
+            results.append((row_number, ACTION_NEW, dict(merged, xiaoetong_id=xiaoetong_id), {}))
+            continue
+        changes = {
+            field: [current[field], values[field]]
+            for field in IMPORT_FIELDS
+            if values.get(field) and values[field] != current[field]
+        }
+        merged = {field: current[field] for field in IMPORT_FIELDS}
+        merged.update({field: new for field, (_, new) in changes.items()})
+        merged['xiaoetong_id'] = xiaoetong_id
+        results.append((row_number, ACTION_CHANGED if changes else ACTION_UNCHANGED, merged, changes))
+    return results
+
+
+def _upsert(rows, person_id):
+    now = timezone.now()
+    students = [Student(**values, created_by_id=person_id, updated_by_id=person_id, created_at=now, updated_at=now)
+                for values in rows]
+    for student in students:
+        # bulk_create 不经过 save()，搜索分词在此生成
+        student.refresh_search_tokens()
+    Student.objects.bulk_create(
+        students,
+        update_conflicts=True,
+        unique_fields=['xiaoetong_id'],
+        update_fields=[*IMPORT_FIELDS, 'search_tokens', 'updated_by', 'updated_at'],
+    )
+
+
+def run_import(batch, apply=False, person_id=None):
+    """
+    预览（apply=False）或提交（apply=True）一个导入批次
+
+    Returns:
+        dict: counts（new/changed/unchanged/error/total）、samples（差异样例）
+    """
+    counts = {ACTION_NEW: 0, ACTION_CHANGED: 0, ACTION_UNCHANGED: 0, 'error': 0, 'total': 0}
+    samples = []
+    seen_ids = set()
+    for chunk in iter_chunks(batch.file_path, batch.file_format):
+        errors = []
+        to_write = []
+        for row_number, action, values, detail in diff_chunk(chunk, seen_ids):
+            counts['total'] += 1
+            if action is None:
+                counts['error'] += 1
+                errors.append(ImportRowError(
+                    batch=batch, row_number=row_number,
+                    xiaoetong_id=(values.get('xiaoetong_id') or '')[:255], message=detail[:255],
+                ))
+                continue
+            counts[action] += 1
+            if action != ACTION_UNCHANGED:
+                to_write.append(values)
+                if len(samples) < PREVIEW_SAMPLE_SIZE:
+                    samples.append({
+                        'row': row_number, 'xiaoetong_id': values['xiaoetong_id'],
+                        'action': action, 'changes': detail,
+                    })
+        if apply:
+            if to_write:
+                _upsert(to_write, person_id)
+        elif errors:
+            ImportRowError.objects.bulk_create(errors)
+    return {'counts': counts, 'samples': samples}
+
+
+def detect_format(file_name):
+    ext = os.path.splitext(file_name or '')[1].lower().lstrip('.')
+    return ext if ext in ('csv', 'xlsx') else None
+
+
+def preview_import(upload, person_id=None):
+    """
+    登记批次、暂存文件并生成预览；整体不可导入时删除暂存文件并抛出 ImportFormatError
+
+    Returns:
+        tuple(ImportBatch, dict): 批次与 run_import 结果
+    """
+    file_format = detect_format(upload.name)
+    if file_format is None:
+        raise ImportFormatError('仅支持 .csv / .xlsx 文件')
+    batch = ImportBatch(file_name=upload.name[:255], file_format=file_format, created_by_id=person_id)
+    batch.file_path = save_upload(upload, batch.id, file_format)
+    try:
+        with transaction.atomic():
+            batch.save()
+            result = run_import(batch)
+            counts = result['counts']
+            batch.total_rows = counts['total']
+            batch.new_count = counts[ACTION_NEW]
+            batch.changed_count = counts[ACTION_CHANGED]
+            batch.unchanged_count = counts[ACTION_UNCHANGED]
+            batch.error_count = counts['error']
+            batch.save(update_fields=[
+                'total_rows', 'new_count', 'changed_count', 'unchanged_count', 'error_count', 'updated_at',
+            ])
+    except ImportFormatError:
+        os.remove(batch.file_path)
+        raise
+    return batch, result
+
+
+def commit_import(batch_id, person_id=None):
+    """
+    提交批次：锁定批次行后在单个事务内完成全部写入，随后删除暂存文件
+
+    Returns:
+        tuple(ImportBatch, dict|None): 批次与 run_import 结果；批次不处于“已预览”状态时结果为 None
+    """
+    with transaction.atomic():
+        batch = ImportBatch.objects.select_for_update().get(pk=batch_id)
+        if batch.status != ImportBatchStatus.PREVIEWED:
+            return batch, None
+        result = run_import(batch, apply=True, person_id=person_id)
+        counts = result['counts']
+        batch.status = ImportBatchStatus.COMMITTED
+        batch.created_count = counts[ACTION_NEW]
+        batch.updated_count = counts[ACTION_CHANGED]
+        batch.committed_at = timezone.now()
+        batch.save(update_fields=['status', 'created_count', 'updated_count', 'committed_at', 'updated_at'])
+    if batch.file_path and os.path.exists(batch.file_path):
+        os.remove(batch.file_path)
+    return batch, result
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:42
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persons', '0003_person_user'),
+        ('students', '0002_courserecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('file_name', models.CharField(max_length=255, verbose_name='原始文件名')),
+                ('file_format', models.CharField(max_length=10, verbose_name='文件格式')),
+                ('file_path', models.CharField(blank=True, default='', max_length=500, verbose_name='暂存文件路径')),
+                ('status', models.CharField(choices=[('previewed', '已预览'), ('committed', '已导入'), ('failed', '失败')], default='previewed', max_length=20, verbose_name='状态')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='数据行数')),
+                ('new_count', models.PositiveIntegerField(default=0, verbose_name='新增数')),
+                ('changed_count', models.PositiveIntegerField(default=0, verbose_name='变更数')),
+                ('unchanged_count', models.PositiveIntegerField(default=0, verbose_name='未变化数')),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='错误行数')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='实际新增数')),
+                ('updated_count', models.PositiveIntegerField(default=0, verbose_name='实际更新数')),
+                ('error', models.TextField(blank=True, default='', verbose_name='失败原因')),
+                ('committed_at', models.DateTimeField(blank=True, null=True, verbose_name='导入时间')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_import_batches', to='persons.person', verbose_name='发起人')),
+            ],
+            options={
+                'verbose_name': '学员导入批次',
+                'verbose_name_plural': '学员导入批次',
+                'db_table': 'students_import_batch',
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportRowError',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='系统自动生成的唯一标识符', primary_key=True, serialize=False, verbose_name='主键ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='记录创建的UTC时间', verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='记录最后更新的UTC时间', verbose_name='更新时间')),
+                ('row_number', models.PositiveIntegerField(verbose_name='行号')),
+                ('xiaoetong_id', models.CharField(blank=True, default='', max_length=255, verbose_name='小鹅通ID')),
+                ('message', models.CharField(max_length=255, verbose_name='错误信息')),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='row_errors', to='students.importbatch', verbose_name='批次')),
+            ],
+            options={
+                'verbose_name': '导入行错误',
+                'verbose_name_plural': '导入行错误',
+                'db_table': 'students_import_row_error',
+                'ordering': ['row_number'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='importbatch',
+            index=models.Index(fields=['status', 'created_at'], name='idx_import_batch_status'),
+        ),
+        migrations.AddIndex(
+            model_name='importrowerror',
+            index=models.Index(fields=['batch', 'row_number'], name='idx_import_err_batch_row'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:09
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_tag_names(apps, schema_editor):
+    Student = apps.get_model('students', 'Student')
+    names = {}
+    for student_id, name in Student.tags.through.objects.values_list('student_id', 'studenttag__name').iterator():
+        names.setdefault(student_id, []).append(name)
+    Student.objects.bulk_update(
+        [Student(pk=pk, tag_names=sorted(tag_names)) for pk, tag_names in names.items()],
+        ['tag_names'], batch_size=BATCH_SIZE,
+    )
+
+
+def create_gin_index(apps, schema_editor):
+    # 仅 PostgreSQL：jsonb_ops GIN 索引支持 ?|（任一标签）与 @>（全部标签）；SQLite 无法建该索引，故不声明在 Meta 中
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from django.contrib.postgres.indexes import GinIndex
+    schema_editor.add_index(apps.get_model('students', 'Student'),
+                            GinIndex(fields=['tag_names'], name='idx_student_tag_names'))
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS idx_student_tag_names')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_search_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='tag_names',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='标签名'),
+        ),
+        migrations.RunPython(backfill_tag_names, migrations.RunPython.noop),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
@@ -3,10 +3,10 @@
 """
 from django.db import models
 from django.core.exceptions import ValidationError
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, SearchIndexedModel
 from apps.core.enums import EnableStatus
 from apps.core.models import AuditModel
-from apps.core.enums import CourseLearnStatus, RecordStatus
+from apps.core.enums import CourseLearnStatus, RecordStatus, ImportBatchStatus
 
 class StudentTag(BaseModel):
     """
@@ -26,10 +26,13 @@ class StudentTag(BaseModel):
     def __str__(self):
         return self.name
 
-class Student(BaseModel):
+class Student(SearchIndexedModel, BaseModel):
     """
     学员（独立实体，禁止删除，可停用）
     """
+    search_index_fields = ('nickname', 'remark_name', 'xiaoetong_id')
+    search_ngram_fields = ('xiaoetong_id',)
+
     xiaoetong_id = models.CharField(max_length=64, unique=True, verbose_name='小鹅通ID')
     nickname = models.CharField(max_length=100, verbose_name='昵称')
     remark_name = models.CharField(max_length=100, null=True, blank=True, verbose_name='备注名')
@@ -42,6 +45,8 @@ class Student(BaseModel):
     teacher_impression_current = models.TextField(null=True, blank=True, verbose_name='教师印象（当前）')
     op_note = models.TextField(null=True, blank=True, verbose_name='运营备注')
     tags = models.ManyToManyField(StudentTag, blank=True, related_name='students', verbose_name='标签')
+    # 标签名冗余（排序后的数组），由 apps.students.signals 维护，见 apps.students.tags
+    tag_names = models.JSONField(default=list, blank=True, editable=False, verbose_name='标签名')
 
     # 审计（不软删）：指向人员
     created_by = models.ForeignKey(
@@ -98,4 +103,62 @@ class CourseRecord(AuditModel):
         ]
 
     def __str__(self):
-        return f"{self.student.nickname} - {self.course.name} ({self.start_at:%Y-%m-%d})"
\ No newline at end of file
+        return f"{self.student.nickname} - {self.course.name} ({self.start_at:%Y-%m-%d})"
+
+
+class ImportBatch(BaseModel):
+    """
+    学员批量导入批次：预览时登记并保存上传文件，提交时按同一文件落库
+    """
+    file_name = models.CharField(max_length=255, verbose_name='原始文件名')
+    file_format = models.CharField(max_length=10, verbose_name='文件格式')
+    file_path = models.CharField(max_length=500, blank=True, default='', verbose_name='暂存文件路径')
+    status = models.CharField(
+        max_length=20, choices=ImportBatchStatus.choices, default=ImportBatchStatus.PREVIEWED, verbose_name='状态'
+    )
+    total_rows = models.PositiveIntegerField(default=0, verbose_name='数据行数')
+    new_count = models.PositiveIntegerField(default=0, verbose_name='新增数')
+    changed_count = models.PositiveIntegerField(default=0, verbose_name='变更数')
+    unchanged_count = models.PositiveIntegerField(default=0, verbose_name='未变化数')
+    error_count = models.PositiveIntegerField(default=0, verbose_name='错误行数')
+    created_count = models.PositiveIntegerField(default=0, verbose_name='实际新增数')
+    updated_count = models.PositiveIntegerField(default=0, verbose_name='实际更新数')
+    error = models.TextField(blank=True, default='', verbose_name='失败原因')
+    created_by = models.ForeignKey(
+        'persons.Person', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='student_import_batches', verbose_name='发起人'
+    )
+    committed_at = models.DateTimeField(null=True, blank=True, verbose_name='导入时间')
+
+    class Meta:
+        db_table = 'students_import_batch'
+        verbose_name = '学员导入批次'
+        verbose_name_plural = '学员导入批次'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_import_batch_status'),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+
+class ImportRowError(BaseModel):
+    """
+    导入批次的行级错误（预览时写入，提交时跳过这些行）
+    """
+    batch = models.ForeignKey(ImportBatch, on_delete=models.CASCADE, related_name='row_errors', verbose_name='批次')
+    row_number = models.PositiveIntegerField(verbose_name='行号')
+    xiaoetong_id = models.CharField(max_length=255, blank=True, default='', verbose_name='小鹅通ID')
+    message = models.CharField(max_length=255, verbose_name='错误信息')
+
+    class Meta:
+        db_table = 'students_import_row_error'
+        verbose_name = '导入行错误'
+        verbose_name_plural = '导入行错误'
+        ordering = ['row_number']
+        indexes = [
+            models.Index(fields=['batch', 'row_number'], name='idx_import_err_batch_row'),
+        ]
+
+    def __str__(self):
+        return f"第{self.row_number}行: {self.message}"
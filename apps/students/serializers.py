@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Student, StudentTag, CourseRecord
+from .models import Student, StudentTag, CourseRecord, ImportBatch, ImportRowError
 
 class StudentTagSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,7 +10,8 @@ class StudentSerializer(serializers.ModelSerializer):
     tags = serializers.PrimaryKeyRelatedField(
         queryset=StudentTag.objects.all(), many=True, required=False
     )
-    tag_names = serializers.SerializerMethodField()
+    # 读取冗余列 Student.tag_names，不逐行查询标签
+    tag_names = serializers.ListField(child=serializers.CharField(), read_only=True)
 
     class Meta:
         model = Student
@@ -21,9 +22,6 @@ class StudentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
 
-    def get_tag_names(self, obj):
-        return list(obj.tags.values_list('name', flat=True))
-
 class CourseRecordSerializer(serializers.ModelSerializer):
     student_nickname = serializers.ReadOnlyField(source='student.nickname')
     course_name = serializers.ReadOnlyField(source='course.name')
@@ -52,4 +50,22 @@ class CourseRecordSerializer(serializers.ModelSerializer):
         if start_at and end_at and end_at < start_at:
             raise serializers.ValidationError('end_at 不能早于 start_at')
 
-        return attrs
\ No newline at end of file
+        return attrs
+
+class ImportRowErrorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportRowError
+        fields = ['row_number', 'xiaoetong_id', 'message']
+
+class ImportBatchSerializer(serializers.ModelSerializer):
+    created_by_name = serializers.ReadOnlyField(source='created_by.name')
+
+    class Meta:
+        model = ImportBatch
+        fields = [
+            'id', 'file_name', 'file_format', 'status',
+            'total_rows', 'new_count', 'changed_count', 'unchanged_count', 'error_count',
+            'created_count', 'updated_count', 'error',
+            'created_by', 'created_by_name', 'created_at', 'committed_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,50 @@
+"""
+学员应用信号
+标签关系或标签名变化时重算学员的 tag_names 冗余列
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Student, StudentTag
+from .tags import refresh_tag_names
+
+
+@receiver(m2m_changed, sender=Student.tags.through)
+def student_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # tag.students.clear() 的 post_clear 不带 pk_set，先记下受影响学员
+        instance._cleared_student_ids = list(instance.students.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        # 同步内存中的实例，序列化器在 tags.set() 之后返回的数据即为最新
+        instance.tag_names = refresh_tag_names([instance.pk])[instance.pk]
+    elif action == 'post_clear':
+        refresh_tag_names(instance.__dict__.pop('_cleared_student_ids', []))
+    else:
+        refresh_tag_names(pk_set or [])
+
+
+@receiver(pre_save, sender=StudentTag)
+def student_tag_renaming(sender, instance, **kwargs):
+    if instance._state.adding:
+        return
+    previous = StudentTag.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    instance._renamed = previous is not None and previous != instance.name
+
+
+@receiver(post_save, sender=StudentTag)
+def student_tag_renamed(sender, instance, created, **kwargs):
+    if not created and instance.__dict__.pop('_renamed', False):
+        refresh_tag_names(instance.students.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=StudentTag)
+def student_tag_deleting(sender, instance, **kwargs):
+    instance._deleted_student_ids = list(instance.students.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=StudentTag)
+def student_tag_deleted(sender, instance, **kwargs):
+    refresh_tag_names(instance.__dict__.pop('_deleted_student_ids', []))
@@ -0,0 +1,75 @@
+"""
+学员标签名冗余列 Student.tag_names
+
+- 内容为学员当前标签名（排序后的 JSON 数组），列表/导出直接读取，不再逐行查询 M2M；
+- 由 signals 维护：Student.tags 增删改（正反两个方向）、StudentTag 改名与删除时重算受影响学员；
+- 绕过信号的批量写入（直接写中间表）需自行调用 refresh_tag_names；
+- 过滤（filter_tag_names）：PostgreSQL 下走 jsonb 运算符（任一 ?|、全部 @>），命中迁移中创建的 GIN 索引；
+  其他数据库退回中间表 EXISTS 子查询。
+"""
+from django.db import connection
+from django.db.models import Exists, OuterRef
+
+from .models import Student
+
+REFRESH_BATCH_SIZE = 1000
+
+
+def refresh_tag_names(student_ids):
+    """
+    按中间表重算指定学员的 tag_names
+
+    Returns:
+        dict: 学员ID → 标签名列表
+    """
+    student_ids = list(dict.fromkeys(student_ids))
+    names = {pk: [] for pk in student_ids}
+    through = Student.tags.through
+    for start in range(0, len(student_ids), REFRESH_BATCH_SIZE):
+        chunk = student_ids[start:start + REFRESH_BATCH_SIZE]
+        for student_id, name in through.objects.filter(student_id__in=chunk) \
+                .values_list('student_id', 'studenttag__name'):
+            names[student_id].append(name)
+    for tag_names in names.values():
+        tag_names.sort()
+    Student.objects.bulk_update(
+        [Student(pk=pk, tag_names=tag_names) for pk, tag_names in names.items()],
+        ['tag_names'], batch_size=REFRESH_BATCH_SIZE,
+    )
+    return names
+
+
+def filter_tag_names(queryset, names, match_all=False):
+    """
+    Args:
+        names (Iterable[str]): 标签名
+        match_all (bool): True 需包含全部标签，False 包含任一即可
+    """
+    names = sorted({name for name in names if name})
+    if not names:
+        return queryset
+    if connection.vendor == 'postgresql':
+        if match_all:
+            return queryset.filter(tag_names__contains=names)
+        return queryset.filter(tag_names__has_any_keys=names)
+
+    def has(tag_filter):
+        return Exists(Student.tags.through.objects.filter(student_id=OuterRef('pk'), **tag_filter))
+
+    if match_all:
+        for name in names:
+            queryset = queryset.filter(has({'studenttag__name': name}))
+        return queryset
+    return queryset.filter(has({'studenttag__name__in': names}))
+
+
+def filter_tag_params(queryset, params):
+    """
+    按请求参数过滤标签名（列表与导出共用）：tag_any 含任一标签，tag_all 含全部标签；
+    值为逗号分隔的字符串或列表（导出任务的 JSON 参数）
+    """
+    for param, match_all in (('tag_any', False), ('tag_all', True)):
+        value = params.get(param) or ''
+        names = value if isinstance(value, list) else str(value).split(',')
+        queryset = filter_tag_names(queryset, [str(name).strip() for name in names], match_all=match_all)
+    return queryset
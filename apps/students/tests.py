@@ -0,0 +1,185 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.core.enums import ImportBatchStatus
+from apps.core.export import iter_csv, iter_xlsx
+from apps.persons.models import Person
+from .models import ImportBatch, Student, StudentTag
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix='imports-test-'))
+class StudentImportTests(APITestCase):
+    """
+    学员批量导入：预览差异、行错误、提交 upsert、批次详情
+    """
+
+    HEADER = ['小鹅通ID', '昵称', '备注名']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = Person.objects.create(name='周运营', user=get_user_model().objects.create_user(username='zhou_ops'))
+        Student.objects.create(xiaoetong_id='xe-0001', nickname='老学员', remark_name='A')
+        Student.objects.create(xiaoetong_id='xe-0002', nickname='不变', remark_name='B')
+
+    def setUp(self):
+        self.client.force_authenticate(self.me.user)
+
+    def _rows(self):
+        return [
+            ['xe-0001', '老学员改名', ''],   # 变更昵称，备注为空保持不变
+            ['xe-0002', '不变', 'B'],        # 未变化
+            ['xe-0003', '新学员', '新'],      # 新增
+            ['', '缺ID', ''],                # 错误
+            ['xe-0004', '', ''],             # 新学员缺昵称
+            ['xe-0003', '重复', ''],          # 文件内重复
+        ]
+
+    def _upload(self, file_format='csv'):
+        if file_format == 'xlsx':
+            content = b''.join(iter_xlsx(self.HEADER, self._rows()))
+        else:
+            content = ''.join(iter_csv(self.HEADER, self._rows())).encode('utf-8')
+        upload = SimpleUploadedFile(f'students.{file_format}', content)
+        return self.client.post('/api/v1/students/import/preview', {'file': upload}, format='multipart')
+
+    def _assert_preview(self, resp):
+        self.assertEqual(resp.status_code, 201)
+        batch = resp.data['batch']
+        self.assertEqual(
+            (batch['total_rows'], batch['new_count'], batch['changed_count'],
+             batch['unchanged_count'], batch['error_count']),
+            (6, 1, 1, 1, 3),
+        )
+        self.assertEqual([e['row_number'] for e in resp.data['errors']], [5, 6, 7])
+        changed = next(s for s in resp.data['samples'] if s['action'] == 'changed')
+        self.assertEqual(changed['changes'], {'nickname': ['老学员', '老学员改名']})
+        return batch['id']
+
+    def test_preview_does_not_write(self):
+        self._assert_preview(self._upload())
+        self.assertEqual(Student.objects.count(), 2)
+        self.assertEqual(Student.objects.get(xiaoetong_id='xe-0001').nickname, '老学员')
+
+    def test_commit_upserts_once(self):
+        batch_id = self._assert_preview(self._upload('xlsx'))
+        resp = self.client.post('/api/v1/students/import/commit', {'batch_id': batch_id}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual((resp.data['batch']['created_count'], resp.data['batch']['updated_count']), (1, 1))
+
+        self.assertEqual(Student.objects.count(), 3)
+        updated = Student.objects.get(xiaoetong_id='xe-0001')
+        self.assertEqual((updated.nickname, updated.remark_name), ('老学员改名', 'A'))
+        self.assertEqual(Student.objects.get(xiaoetong_id='xe-0003').created_by_id, self.me.id)
+
+        again = self.client.post('/api/v1/students/import/commit', {'batch_id': batch_id}, format='json')
+        self.assertEqual(again.status_code, 409)
+        for bad in ('abc', None, 123):
+            resp = self.client.post('/api/v1/students/import/commit', {'batch_id': bad}, format='json')
+            self.assertEqual(resp.status_code, 404)
+
+        detail = self.client.get(f'/api/v1/students/import/batches/{batch_id}')
+        self.assertEqual(detail.data['batch']['status'], ImportBatchStatus.COMMITTED)
+        self.assertEqual(len(detail.data['errors']), 3)
+
+    def test_missing_required_column(self):
+        upload = SimpleUploadedFile('students.csv', '昵称\n张三\n'.encode('utf-8'))
+        resp = self.client.post('/api/v1/students/import/preview', {'file': upload}, format='multipart')
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(ImportBatch.objects.exists())
+
+    def test_gbk_csv(self):
+        content = '小鹅通ID,昵称\nxe-0009,王小明\n'.encode('gbk')
+        upload = SimpleUploadedFile('students.csv', content)
+        resp = self.client.post('/api/v1/students/import/preview', {'file': upload}, format='multipart')
+        self.assertEqual(resp.data['samples'][0]['xiaoetong_id'], 'xe-0009')
+
+    def test_query_count_is_per_chunk(self):
+        rows = [[f'xe-{i:05d}', f'学员{i}', ''] for i in range(3000)]
+        content = ''.join(iter_csv(self.HEADER, rows)).encode('utf-8')
+        upload = SimpleUploadedFile('big.csv', content)
+        resp = self.client.post('/api/v1/students/import/preview', {'file': upload}, format='multipart')
+        batch_id = resp.data['batch']['id']
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post('/api/v1/students/import/commit', {'batch_id': batch_id}, format='json')
+        # 每块一次查询 + 一次 upsert（SQLite 参数上限会把 upsert 再拆几条），与行数无关
+        self.assertLess(len(ctx.captured_queries), 60)
+        self.assertEqual(Student.objects.count(), 3002)
+
+
+class StudentTagNamesTests(APITestCase):
+    """
+    标签名冗余列：M2M 正反向变更、标签改名/删除时维护；列表不逐行查询标签；按标签名任一/全部过滤
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vip = StudentTag.objects.create(name='VIP')
+        cls.new = StudentTag.objects.create(name='新生')
+        cls.both = Student.objects.create(xiaoetong_id='tag-1', nickname='甲')
+        cls.only_vip = Student.objects.create(xiaoetong_id='tag-2', nickname='乙')
+        cls.plain = Student.objects.create(xiaoetong_id='tag-3', nickname='丙')
+        cls.both.tags.set([cls.vip, cls.new])
+        cls.vip.students.add(cls.only_vip)
+
+    def _names(self, student):
+        return Student.objects.values_list('tag_names', flat=True).get(pk=student.pk)
+
+    def test_maintained_by_signals(self):
+        self.assertEqual(self._names(self.both), ['VIP', '新生'])
+        self.assertEqual(self._names(self.only_vip), ['VIP'])
+
+        self.vip.name = '会员'
+        self.vip.save()
+        self.assertEqual(self._names(self.both), ['会员', '新生'])
+        self.assertEqual(self._names(self.only_vip), ['会员'])
+
+        self.new.students.clear()
+        self.assertEqual(self._names(self.both), ['会员'])
+        self.vip.delete()
+        self.assertEqual(self._names(self.both), [])
+
+    def test_api_update_returns_fresh_names(self):
+        resp = self.client.patch(f'/api/v1/students/{self.plain.id}/', {'tags': [str(self.new.id)]}, format='json')
+        self.assertEqual(resp.json()['tag_names'], ['新生'])
+
+    def test_list_and_filters(self):
+        def ids(**params):
+            with CaptureQueriesContext(connection) as ctx:
+                rows = self.client.get('/api/v1/students/', params).json()['results']
+            return {row['xiaoetong_id'] for row in rows}, len(ctx.captured_queries)
+
+        everyone, queries = ids()
+        self.assertEqual(everyone, {'tag-1', 'tag-2', 'tag-3'})
+        # 计数 + 列表 + 标签ID预取，与学员数无关
+        self.assertEqual(queries, 3)
+        self.assertEqual(ids(tag_any='VIP,新生')[0], {'tag-1', 'tag-2'})
+        self.assertEqual(ids(tag_all='VIP,新生')[0], {'tag-1'})
+        self.assertEqual(ids(tag_all='VIP')[0], {'tag-1', 'tag-2'})
+
+    @override_settings(EXPORT_JOB_WORKER='command', MEDIA_ROOT=tempfile.mkdtemp(prefix='exports-test-'))
+    def test_ops_export_matches_list_filters(self):
+        from apps.exports.models import ExportJob
+        from apps.exports.worker import drain_export_jobs
+
+        def export(**params):
+            resp = self.client.post('/api/v1/ops/students/export', dict(params, file_format='csv'), format='json')
+            self.assertEqual(resp.status_code, 202)
+            return resp.data['id']
+
+        any_job, all_job = export(tag_any='VIP,新生'), export(tag_all='VIP,新生')
+        # 不同标签过滤条件不共享任务
+        self.assertNotEqual(any_job, all_job)
+        drain_export_jobs()
+
+        def exported_ids(job_id):
+            with open(ExportJob.objects.get(pk=job_id).file_path, encoding='utf-8-sig') as fh:
+                return {line.split(',')[0] for line in fh.read().splitlines()[1:]}
+
+        self.assertEqual(exported_ids(any_job), {'tag-1', 'tag-2'})
+        self.assertEqual(exported_ids(all_job), {'tag-1'})
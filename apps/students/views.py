@@ -1,31 +1,46 @@
+import uuid
+
+from django.db.models import Prefetch
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import Student, StudentTag
 from .serializers import StudentSerializer, StudentTagSerializer
-from .models import CourseRecord
-from .serializers import CourseRecordSerializer
+from .models import CourseRecord, ImportBatch
+from .serializers import CourseRecordSerializer, ImportBatchSerializer, ImportRowErrorSerializer
+from .importing import ImportFormatError, PREVIEW_SAMPLE_SIZE, commit_import, preview_import
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import action
+from apps.persons.identity import resolve_person_id
+from apps.core.enums import ImportBatchStatus
+from apps.core.search import KeywordSearchFilter
+from .tags import filter_tag_params
 
 class StudentViewSet(viewsets.ModelViewSet):
     queryset = Student.objects.all().order_by('-created_at')
     serializer_class = StudentSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, KeywordSearchFilter]
     filterset_fields = ['status', 'tags']
-    search_fields = ['nickname', 'xiaoetong_id', 'remark_name']
+    # ?search= 匹配昵称/备注名/小鹅通ID（Student.search_index_fields）
+    search_query_params = ('search',)
     ordering_fields = ['created_at', 'nickname']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        # tags 字段只需标签ID：整页一条查询预取；标签名直接读冗余列 tag_names
+        qs = super().get_queryset().prefetch_related(Prefetch('tags', queryset=StudentTag.objects.only('id')))
+        # 按标签名过滤（逗号分隔）：tag_any 含任一标签，tag_all 含全部标签
+        return filter_tag_params(qs, self.request.query_params)
+
     @action(detail=True, methods=['get'])
     def recent_feedbacks(self, request, pk=None):
         """
         最近历史点评记录（默认10条，可通过 ?limit= 调整，最大50）
         """
         from apps.evaluations.models import FeedbackRecord
-        from apps.evaluations.serializers import FeedbackRecordSerializer
+        from apps.evaluations.serializers import FeedbackRecordSerializer, feedback_serializer_queryset
 
         try:
             limit = int(request.query_params.get('limit', 10))
@@ -33,13 +48,23 @@ class StudentViewSet(viewsets.ModelViewSet):
             limit = 10
         limit = max(1, min(limit, 50))
 
-        qs = FeedbackRecord.objects.filter(
-            deleted_at__isnull=True,
-            student_id=pk
-        ).select_related('student', 'teacher', 'task').order_by('-created_at')[:limit]
+        qs = feedback_serializer_queryset(
+            FeedbackRecord.objects.filter(deleted_at__isnull=True, student_id=pk)
+        ).order_by('-created_at')[:limit]
         data = FeedbackRecordSerializer(qs, many=True).data
         return Response(data)
 
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """
+        学员各课程的点评进度（读取预计算表，单次查询）
+        """
+        from apps.evaluations.models import StudentCourseProgress
+        from apps.evaluations.serializers import StudentCourseProgressSerializer
+
+        qs = StudentCourseProgress.objects.filter(student_id=pk).select_related('course').order_by('course__name')
+        return Response(StudentCourseProgressSerializer(qs, many=True).data)
+
     @action(detail=True, methods=['post'], url_path='create-reminder')
     def create_reminder(self, request, pk=None):
         """
@@ -64,28 +89,80 @@ class CourseRecordViewSet(viewsets.ModelViewSet):
 
 class ImportPreviewView(APIView):
     """
-    批量导入（预览）占位：最低映射（xiaoetong_id, nickname）后续实现
+    批量导入（预览）：multipart 上传 file（.csv / .xlsx）
+    返回 batch_id、新增/变更/未变化/错误计数、差异样例与前若干条行错误；不写入学员数据
     """
     def post(self, request):
-        return Response({'detail': 'Not implemented: import preview pending confirmation.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'detail': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch, result = preview_import(upload, person_id=resolve_person_id(request.user, create=False))
+        except ImportFormatError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        errors = batch.row_errors.all()[:PREVIEW_SAMPLE_SIZE]
+        return Response({
+            'batch': ImportBatchSerializer(batch).data,
+            'samples': result['samples'],
+            'errors': ImportRowErrorSerializer(errors, many=True).data,
+        }, status=status.HTTP_201_CREATED)
 
 class ImportCommitView(APIView):
     """
-    批量导入（提交）占位：后续按最低映射落地
+    批量导入（提交）：Body { batch_id }
+    重新比对后新增与变更行批量 upsert，错误行跳过；同一批次只能提交一次
     """
     def post(self, request):
-        return Response({'detail': 'Not implemented: import commit pending confirmation.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        try:
+            batch_id = uuid.UUID(str(request.data.get('batch_id')))
+        except (ValueError, TypeError):
+            batch_id = None
+        if batch_id is None or not ImportBatch.objects.filter(pk=batch_id).exists():
+            return Response({'detail': 'batch not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            batch, result = commit_import(batch_id, person_id=resolve_person_id(request.user, create=False))
+        except ImportFormatError as exc:
+            ImportBatch.objects.filter(pk=batch_id).update(status=ImportBatchStatus.FAILED, error=str(exc))
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if result is None:
+            return Response(
+                {'detail': 'batch is not in previewed status', 'status': batch.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({'batch': ImportBatchSerializer(batch).data, 'counts': result['counts']})
 
 class ImportBatchDetailView(APIView):
     """
-    导入批次详情占位
+    导入批次详情：批次计数与行错误（?limit= 默认200，最大1000；?offset= 分页）
     """
     def get(self, request, batch_id):
-        return Response({'detail': 'Not implemented: import batch detail pending confirmation.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        batch = ImportBatch.objects.select_related('created_by').filter(pk=batch_id).first()
+        if batch is None:
+            return Response({'detail': 'batch not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 200)), 1000))
+            offset = max(0, int(request.query_params.get('offset', 0)))
+        except ValueError:
+            limit, offset = 200, 0
+        errors = batch.row_errors.all()[offset:offset + limit]
+        return Response({
+            'batch': ImportBatchSerializer(batch).data,
+            'errors': ImportRowErrorSerializer(errors, many=True).data,
+        })
 
 class OpsStudentsExportView(APIView):
     """
-    学员导出占位：XLSX，后续实现字段白名单与命名规则
+    学员导出（后台任务）：POST { file_format?: "xlsx"|"csv", status?, tags?, tag_any?, tag_all?, q? }
+    创建（或共享同参数的）导出任务并返回任务状态，完成后经 /api/v1/exports/<id>/download/ 下载
     """
     def post(self, request):
-        return Response({'detail': 'Not implemented: students export pending confirmation.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
\ No newline at end of file
+        from apps.exports.serializers import ExportJobSerializer
+        from apps.exports.worker import create_or_share_job
+
+        file_format = request.data.get('file_format') or 'xlsx'
+        if file_format not in ('csv', 'xlsx'):
+            return Response({'detail': 'file_format must be csv or xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+        job, _ = create_or_share_job(
+            'students_ops', file_format, request.data, person_id=resolve_person_id(request.user, create=False)
+        )
+        return Response(ExportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+ASGI config for course_system project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+实时事件 SSE 接口（/api/notifications/events/stream/）需以 ASGI 方式部署，例如：
+    uvicorn course_system.asgi:application
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'course_system.settings')
+
+application = get_asgi_application()
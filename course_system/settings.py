@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     'apps.announcements',
     'apps.followups',
     'apps.notifications',
+    'apps.exports',
     'rest_framework',
     'rest_framework.authtoken',  # 添加这行
     'corsheaders',  # 添加这行
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # 必须在最前面
+    'apps.core.perf.QueryProfileMiddleware',  # 抽样 SQL 画像，见 PERF_SAMPLE_RATE
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,6 +87,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'course_system.wsgi.application'
+ASGI_APPLICATION = 'course_system.asgi.application'
 
 
 # Database
@@ -155,6 +158,31 @@ USE_UUID_PRIMARY_KEY = True
 USE_TZ = True
 TIME_ZONE = 'UTC'
 
+# 点评提交后的学员曲目状态维护方式：
+# 'thread'  事务提交后由进程内线程池消费队列
+# 'command' 仅入队，由 `python manage.py process_piece_status_queue` 消费
+PIECE_STATUS_WORKER = os.environ.get('PIECE_STATUS_WORKER', 'thread')
+
+# 后台导出任务的执行方式（同 PIECE_STATUS_WORKER）：'thread' 进程内线程池 / 'command' 由 process_export_jobs 消费
+EXPORT_JOB_WORKER = os.environ.get('EXPORT_JOB_WORKER', 'thread')
+# 已完成的同参数导出在该秒数内直接复用，不重新生成
+EXPORT_JOB_REUSE_SECONDS = int(os.environ.get('EXPORT_JOB_REUSE_SECONDS', 600))
+
+# 身份缓存（token → 用户 / person_id / 角色）有效期（秒），见 apps/persons/identity.py
+IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 300))
+
+# 分页计数：行数（估算或精确）达到阈值时返回近似值 / 缓存精确值（秒），见 apps/core/pagination.py
+PAGINATION_COUNT_THRESHOLD = int(os.environ.get('PAGINATION_COUNT_THRESHOLD', 10000))
+PAGINATION_COUNT_CACHE_TTL = int(os.environ.get('PAGINATION_COUNT_CACHE_TTL', 30))
+
+# 请求 SQL 画像的抽样比例（0 关闭，1 全部），结果见响应头 Server-Timing 与 /api/_perf/（仅管理员）
+PERF_SAMPLE_RATE = float(os.environ.get('PERF_SAMPLE_RATE', 1.0 if DEBUG else 0.05))
+# 每个端点保留的最近抽样数
+PERF_WINDOW_SIZE = int(os.environ.get('PERF_WINDOW_SIZE', 200))
+
+# 实时事件（SSE / 长轮询）使用的 broker 实现；默认进程内实现仅适用于单进程部署
+EVENT_BROKER = os.environ.get('EVENT_BROKER', 'apps.notifications.events.InProcessBroker')
+
 
 # 可选：REST_FRAMEWORK 默认配置（分页/权限等可按需调整）
 REST_FRAMEWORK = {
@@ -170,7 +198,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.StandardResultsSetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.persons.identity.CachedTokenAuthentication',  # TokenAuthentication + 身份缓存
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',  # 新增：全局启用过滤后端
@@ -24,6 +24,8 @@ from django.shortcuts import render
 import os
 import mimetypes
 
+from apps.core.views import PerfProfileView
+
 def serve_frontend_file(request, filename):
     """Serve frontend static files"""
     frontend_dir = os.path.join(settings.BASE_DIR, 'frontend')
@@ -62,6 +64,8 @@ urlpatterns = [
     path('api/v1/', include('apps.followups.urls_v1')),
     path('api/v1/', include('apps.students.urls_v1')),
     path('api/v1/', include('apps.announcements.urls_v1')),
+    path('api/v1/', include('apps.exports.urls')),
+    path('api/_perf/', PerfProfileView.as_view(), name='perf-profiles'),
     path('frontend/<path:filename>', lambda request, filename: serve_frontend_file(request, filename)),
 ]
 
@@ -10,7 +10,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'course_system.settings')
 django.setup()
 
 from apps.courses.models import Course, Lesson, Piece
-from apps.core.enums import EnableStatus, LessonCategory, PieceAttribute
+from apps.courses.catalog import apply_catalog, catalog_from_cleaned, plan_catalog
 
 class CourseDataProcessor:
     """
@@ -56,95 +56,7 @@ class CourseDataProcessor:
         转换为Django模型格式
         根据实际的Course-Lesson-Piece结构来组织数据
         """
-        # 创建课程数据结构
-        courses_data = {
-            '基础班': {
-                'course': {
-                    'name': '基础班',
-                    'status': EnableStatus.ENABLED.value,
-                    'description': '钢琴基础班课程'
-                },
-                'lessons': []
-            },
-            '中级班': {
-                'course': {
-                    'name': '中级班', 
-                    'status': EnableStatus.ENABLED.value,
-                    'description': '钢琴中级班课程'
-                },
-                'lessons': []
-            }
-        }
-        
-        # 处理基础班课程
-        for i, lesson_data in enumerate(self.data['basic_courses'], 1):
-            lesson = {
-                'name': lesson_data['course_number'],
-                'status': EnableStatus.ENABLED.value,
-                'sort_order': i,
-                'description': f"基础班{lesson_data['course_number']}",
-                'pieces': []
-            }
-            
-            # 添加曲目
-            for song_name in lesson_data['songs']:
-                piece = {
-                    'name': song_name,
-                    'status': EnableStatus.ENABLED.value,
-                    'attribute': PieceAttribute.MUSIC.value,  # 默认为乐曲
-                    'is_required': True,
-                    'description': f"基础班{lesson_data['course_number']}曲目"
-                }
-                lesson['pieces'].append(piece)
-            
-            courses_data['基础班']['lessons'].append(lesson)
-        
-        # 处理中级班课程
-        for i, lesson_data in enumerate(self.data['intermediate_courses'], 1):
-            lesson = {
-                'name': lesson_data['course_number'],
-                'status': EnableStatus.ENABLED.value,
-                'sort_order': i,
-                'description': f"中级班{lesson_data['course_number']}",
-                'pieces': []
-            }
-            
-            # 添加曲目
-            for song_name in lesson_data['songs']:
-                piece = {
-                    'name': song_name,
-                    'status': EnableStatus.ENABLED.value,
-                    'attribute': self._determine_piece_attribute(song_name),
-                    'is_required': True,
-                    'description': f"中级班{lesson_data['course_number']}曲目"
-                }
-                lesson['pieces'].append(piece)
-            
-            courses_data['中级班']['lessons'].append(lesson)
-        
-        return courses_data
-    
-    def _determine_piece_attribute(self, song_name):
-        """
-        根据曲目名称判断曲目属性
-        """
-        song_name_lower = song_name.lower()
-        
-        # 练习曲关键词
-        etude_keywords = ['练习曲', '车尔尼', '莱蒙', '哈农', 'czerny', 'lemoine', 'hanon']
-        # 技术练习关键词
-        technique_keywords = ['音阶', '琶音', '和弦', '八度', '训练', '支撑', '行走']
-        
-        for keyword in etude_keywords:
-            if keyword in song_name_lower:
-                return PieceAttribute.ETUDE.value
-        
-        for keyword in technique_keywords:
-            if keyword in song_name_lower:
-                return PieceAttribute.TECHNIQUE.value
-        
-        # 默认为乐曲
-        return PieceAttribute.MUSIC.value
+        return catalog_from_cleaned(self.data)
     
     def save_django_format(self, output_file):
         """
@@ -161,7 +73,7 @@ class CourseDataProcessor:
     def import_to_database(self, clear_existing=False):
         """
         导入数据到数据库
-        按照Course-Lesson-Piece的层次结构导入
+        内存比对后批量写入，逻辑与 `python manage.py import_catalog` 相同
         """
         if clear_existing:
             print("清除现有课程数据...")
@@ -170,99 +82,14 @@ class CourseDataProcessor:
             Lesson.objects.all().delete()
             Course.objects.all().delete()
         
-        courses_data = self.convert_to_django_format()
-        
-        course_created = 0
-        course_updated = 0
-        lesson_created = 0
-        lesson_updated = 0
-        piece_created = 0
-        piece_updated = 0
-        
-        for course_name, course_info in courses_data.items():
-            # 创建或更新课程
-            course, created = Course.objects.get_or_create(
-                name=course_info['course']['name'],
-                defaults={
-                    'status': course_info['course']['status'],
-                    'description': course_info['course']['description']
-                }
-            )
-            
-            if created:
-                course_created += 1
-                print(f"创建课程: {course.name}")
-            else:
-                course.status = course_info['course']['status']
-                course.description = course_info['course']['description']
-                course.save()
-                course_updated += 1
-                print(f"更新课程: {course.name}")
-            
-            # 处理课程下的课
-            for lesson_info in course_info['lessons']:
-                # 使用更精确的查询条件，包括课程名称
-                lesson, created = Lesson.objects.get_or_create(
-                    course=course,
-                    name=lesson_info['name'],
-                    defaults={
-                        'sort_order': lesson_info['sort_order'],
-                        'status': lesson_info['status'],
-                        'description': lesson_info['description']
-                    }
-                )
-                
-                if created:
-                    lesson_created += 1
-                    print(f"  创建课: {lesson.name}")
-                else:
-                    lesson.sort_order = lesson_info['sort_order']
-                    lesson.status = lesson_info['status']
-                    lesson.description = lesson_info['description']
-                    lesson.save()
-                    lesson_updated += 1
-                    print(f"  更新课: {lesson.name}")
-                
-                # 处理课下的曲目
-                for piece_info in lesson_info['pieces']:
-                    piece, created = Piece.objects.get_or_create(
-                        course=course,
-                        lesson=lesson,
-                        name=piece_info['name'],
-                        defaults={
-                            'status': piece_info['status'],
-                            'attribute': piece_info['attribute'],
-                            'is_required': piece_info['is_required'],
-                            'description': piece_info['description']
-                        }
-                    )
-                    
-                    if created:
-                        piece_created += 1
-                        print(f"    创建曲目: {piece.name}")
-                    else:
-                        piece.status = piece_info['status']
-                        piece.attribute = piece_info['attribute']
-                        piece.is_required = piece_info['is_required']
-                        piece.description = piece_info['description']
-                        piece.save()
-                        piece_updated += 1
-                        print(f"    更新曲目: {piece.name}")
+        result = apply_catalog(plan_catalog(self.convert_to_django_format()))
         
         print(f"\n数据导入完成:")
-        print(f"课程 - 创建: {course_created}, 更新: {course_updated}")
-        print(f"课 - 创建: {lesson_created}, 更新: {lesson_updated}")
-        print(f"曲目 - 创建: {piece_created}, 更新: {piece_updated}")
-        print(f"\n当前数据库统计:")
-        print(f"总课程数量: {Course.objects.count()}")
-        print(f"总课数量: {Lesson.objects.count()}")
-        print(f"总曲目数量: {Piece.objects.count()}")
+        print(f"课程 - 创建: {result['course']['created']}, 更新: {result['course']['updated']}")
+        print(f"课 - 创建: {result['lesson']['created']}, 更新: {result['lesson']['updated']}")
+        print(f"曲目 - 创建: {result['piece']['created']}, 更新: {result['piece']['updated']}")
         
-        return {
-            'course': {'created': course_created, 'updated': course_updated},
-            'lesson': {'created': lesson_created, 'updated': lesson_updated},
-            'piece': {'created': piece_created, 'updated': piece_updated}
-        }
+        return result
     
     def generate_summary_report(self):
         """
@@ -64,6 +64,15 @@ class OperatorApp {
     this.loadStudentTags().catch(console.error);
     // 初次加载
     this.loadReminders().catch(console.error);
+    this.subscribeRealtime();
+  }
+
+  // 实时事件：收到提醒事件时刷新提醒列表，替代重复拉取
+  subscribeRealtime() {
+    const refreshReminders = Utils.debounce(() => this.loadReminders().catch(console.error), 500);
+    this.unsubscribeRealtime = Utils.subscribeEvents((evt) => {
+      if (evt.type.startsWith("reminder.")) refreshReminders();
+    });
   }
 
   bindGlobalEvents() {
@@ -60,6 +60,20 @@ class ResearcherApp {
     this.checkAuth();
     this.bindEvents();
     this.loadAnnouncements();
+    this.subscribeRealtime();
+  }
+
+  // 实时事件：仅在当前所在模块收到相关事件时刷新，替代重复拉取
+  subscribeRealtime() {
+    const refresh = Utils.debounce((section) => {
+      if (section !== this.currentSection) return;
+      if (section === "announcements") this.loadAnnouncements();
+      else if (section === "reminders") this.loadReminders();
+    }, 500);
+    this.unsubscribeRealtime = Utils.subscribeEvents((evt) => {
+      if (evt.type.startsWith("announcement.")) refresh("announcements");
+      else if (evt.type.startsWith("reminder.")) refresh("reminders");
+    });
   }
 
   checkAuth() {
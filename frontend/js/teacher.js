@@ -49,6 +49,20 @@ class TeacherApp {
 
     this.loadInboxReminders().catch(console.error);
     this.loadTasks().catch(console.error);
+    this.subscribeRealtime();
+  }
+
+  // 实时事件：有新提醒/公告时才刷新对应列表，替代重复拉取
+  subscribeRealtime() {
+    const refreshReminders = Utils.debounce(() => {
+      this.loadReminders().catch(console.error);
+      this.loadInboxReminders().catch(console.error);
+    }, 500);
+    const refreshAnnouncements = Utils.debounce(() => this.loadAnnouncements().catch(console.error), 500);
+    this.unsubscribeRealtime = Utils.subscribeEvents((evt) => {
+      if (evt.type.startsWith("reminder.")) refreshReminders();
+      else if (evt.type.startsWith("announcement.")) refreshAnnouncements();
+    });
   }
 
   bindEvents() {
@@ -133,6 +133,104 @@ const Utils = {
     return this.request(url, { method: "DELETE", body: data, headers });
   },
 
+  // 实时事件订阅：优先 SSE（EventSource），不可用或连续失败时降级为长轮询
+  // onEvent({ id, type: "reminder.created" | "notification.created" | "announcement.updated" ..., object_id, at })
+  // 返回取消订阅函数
+  subscribeEvents(onEvent) {
+    const base = (this.API_BASE || "").replace(/\/+$/g, "");
+    const prefix = location.protocol === "file:" ? base : "";
+    let stopped = false;
+    let source = null;
+    let lastId = null;
+    let sseFailures = 0;
+
+    const emit = (evt) => {
+      lastId = evt.id;
+      try {
+        onEvent(evt);
+      } catch (e) {
+        console.error("处理实时事件失败:", e);
+      }
+    };
+
+    const longPoll = async () => {
+      while (!stopped) {
+        try {
+          const params = { timeout: 25 };
+          if (lastId !== null) params.after = lastId;
+          const resp = await this.get("/api/notifications/events/poll/", params);
+          (resp.events || []).forEach(emit);
+          lastId = resp.last_id ?? lastId;
+        } catch (e) {
+          if (e.status === 400) return; // 账号未绑定人员，无需订阅
+          await new Promise((r) => setTimeout(r, 5000));
+        }
+      }
+    };
+
+    const token = (this.getToken() || "").replace(/^(Bearer|Token)\s+/i, "");
+    // 连接建立后应很快收到 ready；之后每 15 秒至少有一次 ping。超时未收到数据视为不可用（如被代理缓冲）
+    const SSE_FIRST_DATA_MS = 10000;
+    const SSE_IDLE_MS = 40000;
+    let watchdog = null;
+
+    const fallback = () => {
+      clearTimeout(watchdog);
+      if (stopped || !source) return;
+      source.close();
+      source = null;
+      longPoll();
+    };
+    const arm = (ms) => {
+      clearTimeout(watchdog);
+      watchdog = setTimeout(fallback, ms);
+    };
+
+    if (typeof EventSource === "undefined" || !token) {
+      longPoll();
+    } else {
+      const url = `${prefix}/api/notifications/events/stream/?token=${encodeURIComponent(token)}`;
+      source = new EventSource(url);
+      arm(SSE_FIRST_DATA_MS);
+      const alive = () => {
+        sseFailures = 0;
+        arm(SSE_IDLE_MS);
+      };
+      const onMessage = (msg) => {
+        alive();
+        try {
+          emit(JSON.parse(msg.data));
+        } catch {}
+      };
+      ["reminder", "notification", "announcement", "export"].forEach((kind) => {
+        source.addEventListener(`${kind}.created`, onMessage);
+        source.addEventListener(`${kind}.updated`, onMessage);
+      });
+      source.addEventListener("ready", alive);
+      source.addEventListener("ping", alive);
+      source.onopen = () => {
+        // 仅建立连接不算可用，需等到 ready / ping
+        arm(SSE_FIRST_DATA_MS);
+      };
+      source.onerror = () => {
+        // 服务端拒绝（如 WSGI 部署返回 501）时浏览器不再重连：立即改用长轮询
+        if (source && source.readyState === EventSource.CLOSED) {
+          fallback();
+          return;
+        }
+        // 否则为断线重连：连续失败后改用长轮询
+        sseFailures += 1;
+        if (sseFailures >= 3) fallback();
+      };
+    }
+
+    return () => {
+      stopped = true;
+      clearTimeout(watchdog);
+      if (source) source.close();
+    };
+  },
+
   // Storage 工具（支持记忆折叠状态等）
   setStorage(key, value, persist = true) {
     const storage = persist ? localStorage : sessionStorage;